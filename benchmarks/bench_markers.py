@@ -0,0 +1,58 @@
+'''
+Per-tick cost of drawing sampling markers: the old per-sample dict spots
+with a fresh ScatterPlotItem against the array-backed SampleMarkers.
+
+    python benchmarks/bench_markers.py
+'''
+
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from pyqtgraph import PlotWidget, ScatterPlotItem
+from PyQt6.QtWidgets import QApplication
+
+from plotting import SampleMarkers
+
+
+def dict_spots_tick(plot_widget, state, x, y):
+    if state.get("item") is not None:
+        plot_widget.removeItem(state["item"])
+    item = ScatterPlotItem(symbol="o", pen=None, brush="r", size=6)
+    state["item"] = item
+    plot_widget.addItem(item)
+    item.setData([{"pos": (t, a)} for t, a in zip(x, y)])
+
+
+def time_ticks(tick, repeats):
+    tick()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        tick()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    plot_widget = PlotWidget()
+    plot_widget.resize(1200, 300)
+    markers = SampleMarkers(plot_widget, symbol="o", pen=None, brush="r", size=6)
+    state = {}
+
+    print(f"{'markers':>8} {'dict spots [ms]':>16} {'arrays [ms]':>12}")
+    for count in (100, 1_000, 10_000, 50_000):
+        x = np.linspace(0, 10, count)
+        y = np.sin(2 * np.pi * x)
+        repeats = max(3, 20_000 // count)
+        old = time_ticks(lambda: dict_spots_tick(plot_widget, state, x, y), repeats)
+        new = time_ticks(lambda: markers.set_data(x, y), repeats)
+        app.processEvents()
+        print(f"{count:>8} {old * 1000:>16.2f} {new * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
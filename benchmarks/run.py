@@ -0,0 +1,405 @@
+'''
+Benchmarks of the signal-processing hot paths over a grid of signal
+lengths and sampling factors, saved as JSON so runs can be compared.
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --output after.json --compare before.json
+
+GUI paths are timed on the offscreen Qt platform and skipped with --no-gui.
+With --precision float32 the signals are synthesized and loaded in single
+precision; comparing such a run with a float64 one gives the speed and
+peak memory gains of the float32 pipeline:
+
+    python benchmarks/run.py --output float64.json
+    python benchmarks/run.py --precision float32 --output float32.json --compare float64.json
+'''
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np
+
+import dsp
+from dsp.pipeline import run_reconstruction
+
+# Signals span the duration of a mixed signal in the app; the length is the
+# number of points it is synthesized on.
+DURATION = 10
+COMPONENTS = [(10, 5, 0), (15, 5, 0), (20, 10, 1.57)]
+F_MAX = max(frequency for frequency, _, _ in COMPONENTS)
+
+LENGTHS = (10_000, 100_000, 1_000_000)
+FACTORS = (2, 4, 8)
+QUICK_LENGTHS = (10_000, 100_000)
+QUICK_FACTORS = (2, 8)
+
+# Ratio of new to old time above which --compare reports a regression. Runs
+# are compared by their fastest round, which is the least noisy statistic.
+DEFAULT_THRESHOLD = 1.2
+
+# Scratch directory for generated CSV files, set while benchmarks run.
+WORK_DIR = None
+
+BENCHMARKS = []
+
+
+def benchmark(name, uses_factor=False, gui=False, max_length=None):
+    '''
+    Register a benchmark. The decorated function takes (length, factor) and
+    returns the zero-argument callable to time; work done before returning
+    is setup and is not timed. Lengths above `max_length` are skipped for
+    benchmarks that scale too badly to time at every length.
+    '''
+
+    def register(setup):
+        BENCHMARKS.append((name, setup, uses_factor, gui, max_length))
+        return setup
+
+    return register
+
+
+def signal_of_length(length):
+    return dsp.time_base(DURATION, length), dsp.mix(COMPONENTS, DURATION, length)
+
+
+def samples_of(length, factor):
+    t, signal = signal_of_length(length)
+    amplitudes, times = dsp.sample_uniform(t, signal, factor * F_MAX, DURATION)
+    return t, signal, amplitudes, times
+
+
+@benchmark("generate_wave")
+def bench_generate_wave(length, factor):
+    frequency, amplitude, phase = COMPONENTS[-1]
+    return lambda: dsp.generate_wave(frequency, amplitude, phase, DURATION, length)
+
+
+@benchmark("mix")
+def bench_mix(length, factor):
+    return lambda: dsp.mix(COMPONENTS, DURATION, length)
+
+
+@benchmark("composite.add")
+def bench_composite_add(length, factor):
+    composite = dsp.CompositeSignal(COMPONENTS, DURATION, length)
+
+    def add_and_remove():
+        composite.add(25, 1, 0)
+        composite.remove(len(composite) - 1)
+
+    return add_and_remove
+
+
+def _reconstruction_benchmark(method):
+    def setup(length, factor):
+        t, _, amplitudes, times = samples_of(length, factor)
+        return lambda: dsp.reconstruct(method, amplitudes, times, t)
+
+    return setup
+
+
+for _method in dsp.METHODS:
+    benchmark(
+        f"reconstruct[{_method}]",
+        uses_factor=True,
+        # The full sinc sum is O(samples x length).
+        max_length=100_000 if _method == "Whittaker-Shannon" else None,
+    )(_reconstruction_benchmark(_method))
+
+
+@benchmark("sample_polyphase", uses_factor=True)
+def bench_sample_polyphase(length, factor):
+    t, signal = signal_of_length(length)
+    return lambda: dsp.sample_polyphase(t, signal, factor * F_MAX, DURATION)
+
+
+@benchmark("spectrum")
+def bench_spectrum(length, factor):
+    _, signal = signal_of_length(length)
+    return lambda: dsp.magnitude_spectrum(signal, DURATION / length)
+
+
+@benchmark("pipeline", uses_factor=True, max_length=100_000)
+def bench_pipeline(length, factor):
+    t, signal, amplitudes, times = samples_of(length, factor)
+    return lambda: run_reconstruction(
+        "Whittaker-Shannon", amplitudes, times, t, signal, factor * F_MAX
+    )
+
+
+@benchmark("add_noise")
+def bench_add_noise(length, factor):
+    _, signal = signal_of_length(length)
+    rng = np.random.default_rng(0)
+    return lambda: dsp.add_noise(signal, 20, rng=rng)
+
+
+@benchmark("noise_bank.add")
+def bench_noise_bank_add(length, factor):
+    _, signal = signal_of_length(length)
+    bank = dsp.NoiseBank()
+    bank.add(signal, 20, "pink", seed=0)
+    return lambda: bank.add(signal, 20, "pink", seed=0)
+
+
+@benchmark("error_vs_snr", uses_factor=True, max_length=100_000)
+def bench_error_vs_snr(length, factor):
+    t, signal = signal_of_length(length)
+    bank = dsp.NoiseBank()
+    return lambda: dsp.error_vs_snr(
+        t, signal, range(5, 65, 5), range(4), "FFT", factor * F_MAX, bank=bank
+    )
+
+
+def _write_csv(length, directory):
+    t, signal = signal_of_length(length)
+    path = os.path.join(directory, f"signal_{length}.csv")
+    if not os.path.exists(path):
+        np.savetxt(path, np.column_stack((t, signal)), delimiter=",", fmt="%.9g")
+    return path
+
+
+@benchmark("load_signal_csv")
+def bench_load_signal_csv(length, factor):
+    path = _write_csv(length, WORK_DIR)
+    return lambda: dsp.load_signal_csv(path)
+
+
+@benchmark("recording.convert")
+def bench_recording_convert(length, factor):
+    path = _write_csv(length, WORK_DIR)
+    cache_path = os.path.join(WORK_DIR, f"signal_{length}.npy")
+    return lambda: dsp.io.convert_to_npy(path, cache_path)
+
+
+@benchmark("gui.plot_reconstructed_signal", uses_factor=True, gui=True, max_length=100_000)
+def bench_plot_reconstructed_signal(length, factor):
+    window = gui_window()
+    t, signal, amplitudes, times = samples_of(length, factor)
+    # With the samples, as the GUI's worker returns them.
+    result = run_reconstruction(
+        "Whittaker-Shannon", amplitudes, times, t, signal, factor * F_MAX
+    )._replace(sampling_amplitudes=amplitudes, sampling_times=times)
+    window.current_signal_t = t
+    window.f_max = F_MAX
+
+    def plot():
+        window.plot_reconstructed_signal(result)
+        window.error_values.clear()
+
+    return plot
+
+
+@benchmark("gui.sample_markers", uses_factor=True, gui=True)
+def bench_sample_markers(length, factor):
+    window = gui_window()
+    _, _, amplitudes, times = samples_of(length, factor)
+    return lambda: window.plot_sampling_markers(amplitudes, times)
+
+
+_gui = {}
+
+
+def gui_window():
+    if "window" not in _gui:
+        from PyQt6.QtWidgets import QApplication
+
+        os.chdir(REPO_ROOT)
+        _gui["app"] = QApplication.instance() or QApplication(sys.argv)
+        import main
+
+        _gui["window"] = main.SignalMixerApp()
+        # Never shown, so the plots are not built on the first paint.
+        _gui["window"].create_plots()
+        _gui["window"].resize(1500, 600)
+    return _gui["window"]
+
+
+def measure(fn, min_time=0.2, repeats=5):
+    '''
+    Time `fn` in `repeats` rounds of enough calls to take at least
+    `min_time` seconds together.
+    Returns:
+        list: Seconds per call in each round.
+    '''
+    fn()
+    start = time.perf_counter()
+    fn()
+    single = max(time.perf_counter() - start, 1e-9)
+    number = max(1, int(min_time / repeats / single))
+    rounds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number)
+    return rounds
+
+
+def peak_memory(fn):
+    '''
+    Peak bytes allocated during one call of `fn`, as traced by tracemalloc
+    (NumPy reports its array buffers to it).
+    '''
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def result_key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def run(lengths, factors, pattern=None, gui=True, min_time=0.2, repeats=5):
+    results = []
+    for name, setup, uses_factor, needs_gui, max_length in BENCHMARKS:
+        if pattern and pattern not in name:
+            continue
+        if needs_gui and not gui:
+            continue
+        for length in lengths:
+            if max_length is not None and length > max_length:
+                continue
+            for factor in factors if uses_factor else (None,):
+                params = {"length": length}
+                if uses_factor:
+                    params["factor"] = factor
+                try:
+                    fn = setup(length, factor)
+                    rounds = measure(fn, min_time, repeats)
+                    peak = peak_memory(fn)
+                except ImportError as e:
+                    print(f"{name} {params}: skipped ({e})")
+                    continue
+                result = {
+                    "name": name,
+                    "params": params,
+                    "min": min(rounds),
+                    "median": statistics.median(rounds),
+                    "rounds": rounds,
+                    "peak_bytes": peak,
+                }
+                results.append(result)
+                print(
+                    f"{name:<38} {json.dumps(params):<32} min {result['min'] * 1000:>10.3f} ms"
+                    f" {peak / 1e6:>9.2f} MB"
+                )
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "precision": dsp.get_precision(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    '''
+    Print the change in minimum time, the least noisy of the statistics,
+    and in peak memory where both runs measured it, against a previous run.
+    Returns:
+        list: Results whose minimum time grew by more than `threshold`.
+    '''
+    previous = {result_key(result): result for result in baseline["results"]}
+    regressions = []
+    print(
+        f"\nCompared with {baseline['environment'].get('commit')} "
+        f"({baseline['environment'].get('precision', 'float64')}):"
+    )
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+        ratio = result["min"] / old["min"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSION"
+            regressions.append(result)
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        memory = ""
+        if result.get("peak_bytes") and old.get("peak_bytes"):
+            memory = f" {result['peak_bytes'] / old['peak_bytes']:>7.2f}x memory"
+        print(
+            f"{result['name']:<38} {json.dumps(result['params']):<32} {ratio:>7.2f}x min"
+            f"{memory}{flag}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the DSP hot paths.")
+    parser.add_argument("--output", default="benchmarks.json", help="JSON file to write")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--lengths", type=int, nargs="+", help="signal lengths in samples")
+    parser.add_argument("--factors", type=float, nargs="+", help="sampling factors x f_max")
+    parser.add_argument("--quick", action="store_true", help="use a smaller grid")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--no-gui", action="store_true", help="skip the Qt benchmarks")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per benchmark")
+    parser.add_argument(
+        "--precision",
+        choices=list(dsp.PRECISIONS),
+        default=dsp.get_precision(),
+        help="precision signals are synthesized and loaded in",
+    )
+    args = parser.parse_args(argv)
+    dsp.set_precision(args.precision)
+
+    lengths = args.lengths or (QUICK_LENGTHS if args.quick else LENGTHS)
+    factors = args.factors or (QUICK_FACTORS if args.quick else FACTORS)
+
+    global WORK_DIR
+    with tempfile.TemporaryDirectory() as WORK_DIR:
+        results = run(lengths, factors, args.filter, not args.no_gui, args.min_time)
+
+    report = {"environment": environment(), "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slowed down by more than {args.threshold}x")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
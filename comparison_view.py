@@ -0,0 +1,127 @@
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QGridLayout, QLabel, QVBoxLayout, QWidget
+from pyqtgraph import PlotWidget
+
+from dsp.parallel import ParallelReconstructor
+from plotting import LodCurve, SampleMarkers
+
+
+class ComparisonWindow(QWidget):
+    '''
+    Reconstructs several signals side by side. Each signal gets its own
+    plot showing the signal and its samples at once; sampling and
+    reconstruction run on a process pool and are drawn as they finish.
+    '''
+
+    # (generation, row, future), emitted from the pool's thread.
+    result_ready = pyqtSignal(int, int, object)
+
+    def __init__(self, columns=2, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Compare")
+        self.setGeometry(120, 120, 1200, 700)
+        self.columns = columns
+        self.reconstructor = None
+        self.generation = 0
+        self.futures = []
+        self.rows = []
+        self.result_ready.connect(self.show_result)
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel("")
+        self.status_label.setObjectName("comparison_status_label")
+        layout.addWidget(self.status_label)
+        self.plot_grid = QGridLayout()
+        layout.addLayout(self.plot_grid)
+
+    def compare(self, jobs):
+        '''
+        Args:
+            jobs (list): One dict per signal with its `name` and the
+                arguments of ParallelReconstructor.submit.
+        '''
+        self.cancel_pending()
+        self.clear_plots()
+        if self.reconstructor is None:
+            self.reconstructor = ParallelReconstructor()
+        self.generation += 1
+
+        for row, job in enumerate(jobs):
+            job = dict(job)
+            name = job.pop("name")
+            plot_widget = PlotWidget()
+            plot_widget.setTitle(f"{name}: reconstructing...")
+            plot_widget.setLabel("bottom", "Time [s]")
+            plot_widget.addLegend()
+            if self.rows:
+                plot_widget.setXLink(self.rows[0]["plot"])
+            self.plot_grid.addWidget(plot_widget, row // self.columns, row % self.columns)
+
+            signal_curve = LodCurve(plot_widget, pen="y", name="Signal")
+            signal_curve.set_data(job["t"], job["reference"])
+            markers = SampleMarkers(plot_widget, size=6, brush="r", pen=None)
+            self.rows.append(
+                {
+                    "name": name,
+                    "plot": plot_widget,
+                    "t": job["t"],
+                    "curves": [signal_curve],
+                    "markers": markers,
+                }
+            )
+
+            future = self.reconstructor.submit(**job)
+            future.add_done_callback(
+                lambda future, generation=self.generation, row=row: self.result_ready.emit(
+                    generation, row, future
+                )
+            )
+            self.futures.append(future)
+        self.update_status()
+
+    def show_result(self, generation, row, future):
+        if generation != self.generation:
+            return
+        entry = self.rows[row]
+        try:
+            result = future.result()
+        except Exception as e:
+            entry["plot"].setTitle(f"{entry['name']}: failed ({e})")
+        else:
+            if result is not None:
+                entry["markers"].set_data(result.sampling_times, result.sampling_amplitudes)
+                curve = LodCurve(entry["plot"], pen="r", name="Reconstructed")
+                curve.set_data(entry["t"], result.reconstructed)
+                entry["curves"].append(curve)
+                entry["plot"].setTitle(
+                    f"{entry['name']}: fs = {result.sampling_frequency:.1f} Hz, "
+                    f"MAE = {result.error:.4f}"
+                )
+        self.update_status()
+
+    def update_status(self):
+        finished = sum(future.done() for future in self.futures)
+        self.status_label.setText(f"Reconstructed {finished} of {len(self.futures)} signals")
+
+    def cancel_pending(self):
+        for future in self.futures:
+            future.cancel()
+        self.futures = []
+
+    def clear_plots(self):
+        for entry in self.rows:
+            self.plot_grid.removeWidget(entry["plot"])
+            entry["plot"].deleteLater()
+        self.rows = []
+
+    def shutdown(self):
+        self.cancel_pending()
+        if self.reconstructor is not None:
+            self.reconstructor.shutdown()
+            self.reconstructor = None
+
+    def closeEvent(self, event):
+        self.cancel_pending()
+        super().closeEvent(event)
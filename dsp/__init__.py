@@ -0,0 +1,94 @@
+'''
+Signal processing core of Sampling-Studio: synthesis, sampling,
+reconstruction, noise and spectra. Depends only on NumPy (and SciPy for
+the spline methods, imported on first use) so it can run headless.
+'''
+
+from dsp.cache import ReconstructionCache, content_hash
+from dsp.composite import COMPONENT_DTYPE, CompositeSignal
+from dsp.error_curve import error_curve, error_vs_snr
+from dsp.io import Recording, load_signal_csv
+from dsp.metrics import mean_absolute_error, root_mean_square_error, snr_db
+from dsp.noise import NOISE_MODELS, NoiseBank, add_noise
+from dsp.precision import PRECISIONS, get_precision, set_precision, using_precision
+from dsp.project import Project, load_project, save_project
+from dsp.reconstruction import (
+    DEFAULT_MEMORY_BUDGET,
+    METHODS,
+    cubic_interpolation,
+    fft_reconstruction,
+    least_squares_reconstruction,
+    linear_interpolation,
+    reconstruct,
+    whittaker_shannon,
+)
+from dsp.registry import SignalRegistry
+from dsp.resample import (
+    StreamingResampler,
+    design_filter,
+    polyphase_reconstruction,
+    rational_ratio,
+    resample_poly,
+    sample_polyphase,
+)
+from dsp.sampling import sample_jittered, sample_random, sample_uniform
+from dsp.spectrum import (
+    BandwidthEstimator,
+    SpectrumEngine,
+    dominant_frequency,
+    magnitude_spectrum,
+    occupied_bandwidth,
+    welch_power,
+)
+from dsp.synthesis import generate_wave, mix, time_base
+
+__all__ = [
+    "COMPONENT_DTYPE",
+    "BandwidthEstimator",
+    "CompositeSignal",
+    "DEFAULT_MEMORY_BUDGET",
+    "METHODS",
+    "NOISE_MODELS",
+    "NoiseBank",
+    "PRECISIONS",
+    "Project",
+    "ReconstructionCache",
+    "SpectrumEngine",
+    "StreamingResampler",
+    "Recording",
+    "SignalRegistry",
+    "add_noise",
+    "content_hash",
+    "cubic_interpolation",
+    "design_filter",
+    "dominant_frequency",
+    "error_curve",
+    "error_vs_snr",
+    "fft_reconstruction",
+    "generate_wave",
+    "get_precision",
+    "least_squares_reconstruction",
+    "linear_interpolation",
+    "load_project",
+    "load_signal_csv",
+    "magnitude_spectrum",
+    "mean_absolute_error",
+    "mix",
+    "occupied_bandwidth",
+    "polyphase_reconstruction",
+    "rational_ratio",
+    "reconstruct",
+    "resample_poly",
+    "root_mean_square_error",
+    "sample_jittered",
+    "sample_polyphase",
+    "sample_random",
+    "sample_uniform",
+    "save_project",
+    "set_precision",
+    "snr_db",
+    "time_base",
+    "using_precision",
+    "welch_power",
+    "whittaker_shannon",
+]
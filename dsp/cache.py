@@ -0,0 +1,113 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+def content_hash(array):
+    '''
+    Stable digest of an array's dtype, shape and contents.
+    '''
+    array = np.ascontiguousarray(array)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{array.dtype.str}{array.shape}".encode())
+    digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+def _arrays(value):
+    # Every distinct array in a (nested) result, once each.
+    if isinstance(value, np.ndarray):
+        return {id(value): value}
+    arrays = {}
+    if isinstance(value, (tuple, list)):
+        for item in value:
+            arrays.update(_arrays(item))
+    return arrays
+
+
+class ReconstructionCache:
+    '''
+    LRU cache of reconstruction results bounded by the total size of the
+    arrays they hold. An array shared by several results, such as a cached
+    frequency axis, is counted once.
+
+    Keys are tuples that start with (signal_hash, noise_key), followed by the
+    method, sampling frequency and other settings; noise_key is None for
+    the clean signal.
+    '''
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.held = {}
+        self.arrays = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        arrays = _arrays(value)
+        if sum(array.nbytes for array in arrays.values()) > self.max_bytes:
+            return
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = value
+        self.held[key] = list(arrays)
+        for array_id, array in arrays.items():
+            held = self.arrays.setdefault(array_id, [array, 0])
+            if not held[1]:
+                self.current_bytes += array.nbytes
+            held[1] += 1
+        while self.current_bytes > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def invalidate(self, signal_hash):
+        '''
+        Drop every entry for a signal, clean and noisy.
+        '''
+        stale = [key for key in self.entries if key[0] == signal_hash]
+        for key in stale:
+            self._remove(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.held.clear()
+        self.arrays.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+        }
+
+    def _remove(self, key):
+        del self.entries[key]
+        for array_id in self.held.pop(key):
+            held = self.arrays[array_id]
+            held[1] -= 1
+            if not held[1]:
+                self.current_bytes -= held[0].nbytes
+                del self.arrays[array_id]
@@ -0,0 +1,90 @@
+import numpy as np
+
+from dsp.synthesis import generate_wave, synthesize
+
+COMPONENT_DTYPE = np.dtype(
+    [("frequency", np.float64), ("amplitude", np.float64), ("phase", np.float64)]
+)
+
+
+class CompositeSignal:
+    '''
+    A mixed signal that stays editable. The sum of its components is kept
+    up to date, so adding or removing a component costs one O(N) delta
+    instead of re-synthesizing every component.
+
+    Every update replaces `data` with a new array rather than writing into
+    it, so arrays handed out earlier (e.g. to a worker thread) never change.
+    '''
+
+    # Deltas applied before the sum is rebuilt from scratch, bounding the
+    # floating-point drift of repeated add/subtract.
+    RESYNTHESIS_INTERVAL = 256
+
+    def __init__(self, components=(), duration=1, fs=10000, data=None):
+        '''
+        Args:
+            components: (frequency, amplitude, phase) triples, or an array
+                of COMPONENT_DTYPE.
+            duration (float): Duration of the signal in seconds.
+            fs (int): Number of points the signal is synthesized on.
+            data (np.ndarray): Previously computed sum of the components,
+                used as is instead of synthesizing it again.
+        '''
+        self.duration = duration
+        self.fs = fs
+        self.components = np.array(
+            [tuple(component) for component in components], dtype=COMPONENT_DTYPE
+        )
+        self.data = data
+        if data is None:
+            self.resynthesize()
+        else:
+            self.updates_since_synthesis = 0
+
+    def __len__(self):
+        return len(self.components)
+
+    @property
+    def f_max(self):
+        return float(self.components["frequency"].max()) if len(self.components) else 0.0
+
+    def resynthesize(self, dtype=None):
+        '''
+        Rebuild the sum from the components, in `dtype` if given, else in
+        the precision of the current sum (or the one set in dsp.precision
+        when there is none yet).
+        '''
+        if dtype is None and self.data is not None:
+            dtype = self.data.dtype
+        self.data = synthesize(
+            self.components["frequency"],
+            self.components["amplitude"],
+            self.components["phase"],
+            self.duration,
+            self.fs,
+            dtype=dtype,
+        )
+        self.updates_since_synthesis = 0
+
+    def add(self, frequency, amplitude, phase):
+        self.components = np.append(
+            self.components, np.array([(frequency, amplitude, phase)], dtype=COMPONENT_DTYPE)
+        )
+        self._apply(
+            generate_wave(frequency, amplitude, phase, self.duration, self.fs, self.data.dtype)
+        )
+
+    def remove(self, index):
+        frequency, amplitude, phase = self.components[index]
+        self.components = np.delete(self.components, index)
+        self._apply(
+            -generate_wave(frequency, amplitude, phase, self.duration, self.fs, self.data.dtype)
+        )
+
+    def _apply(self, delta):
+        self.updates_since_synthesis += 1
+        if self.updates_since_synthesis >= self.RESYNTHESIS_INTERVAL or not len(self):
+            self.resynthesize()
+        else:
+            self.data = self.data + delta
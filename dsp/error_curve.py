@@ -0,0 +1,164 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from dsp.metrics import mean_absolute_error, root_mean_square_error, snr_db
+from dsp.noise import default_bank, noise_rms, quantize
+from dsp.precision import compute_dtype
+from dsp.reconstruction import DEFAULT_MEMORY_BUDGET, reconstruct
+from dsp.sampling import sample_uniform
+
+
+def _evaluate(method, t, signal, reference, duration, sampling_frequency, sampler):
+    amplitudes, times = sampler(t, signal, sampling_frequency, duration)
+    if len(times) < 2:
+        return np.nan, np.nan, np.nan
+    reconstructed = reconstruct(method, amplitudes, times, t)
+    return (
+        mean_absolute_error(reference, reconstructed),
+        root_mean_square_error(reference, reconstructed),
+        snr_db(reference, reconstructed),
+    )
+
+
+def error_curve(
+    t,
+    signal,
+    sampling_frequencies,
+    method,
+    reference=None,
+    duration=None,
+    workers=None,
+    sampler=sample_uniform,
+):
+    '''
+    Reconstruction error over a grid of sampling frequencies. The grid is
+    evaluated in parallel on a thread pool; the reconstruction kernels spend
+    their time in NumPy routines that release the GIL.
+    Args:
+        t (np.ndarray): Time axis of the signal.
+        signal (np.ndarray): Signal that gets sampled.
+        sampling_frequencies (array_like): Grid of sampling rates in Hz.
+        method (str): Reconstruction method, see dsp.reconstruction.METHODS.
+        reference (np.ndarray): Signal the reconstruction is compared to,
+            defaults to `signal` (pass the clean signal when `signal` is noisy).
+        duration (float): Sampled span, defaults to t[-1].
+        workers (int): Thread count, defaults to the CPU count.
+        sampler (callable): Takes (t, signal, sampling_frequency, duration)
+            and returns (amplitudes, times); uniform sampling by default.
+            Random samplers should be seeded so that every point of the
+            curve uses the same realization.
+    Returns:
+        dict: Arrays "sampling_frequency", "mae", "rmse" and "snr_db".
+    '''
+    sampling_frequencies = np.asarray(sampling_frequencies, dtype=float)
+    reference = signal if reference is None else reference
+    duration = t[-1] if duration is None else duration
+    workers = workers or os.cpu_count() or 1
+
+    def evaluate(sampling_frequency):
+        return _evaluate(
+            method, t, signal, reference, duration, sampling_frequency, sampler
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        metrics = np.array(list(pool.map(evaluate, sampling_frequencies)), dtype=float)
+    metrics = metrics.reshape(len(sampling_frequencies), 3)
+    return {
+        "sampling_frequency": sampling_frequencies,
+        "mae": metrics[:, 0],
+        "rmse": metrics[:, 1],
+        "snr_db": metrics[:, 2],
+    }
+
+
+def error_vs_snr(
+    t,
+    signal,
+    snr_levels,
+    seeds,
+    method,
+    sampling_frequency,
+    model="white",
+    duration=None,
+    sampler=sample_uniform,
+    bank=None,
+    memory_budget=DEFAULT_MEMORY_BUDGET,
+):
+    '''
+    Reconstruction error of `signal` with noise added at every SNR level
+    and seed, measured against the clean signal. Sampling and every
+    reconstruction method are linear in the signal values, so the clean
+    signal and each seed's unit noise realization are reconstructed once
+    and every SNR level only rescales the reconstructed noise.
+    Quantization is not additive: it is evaluated level by level and is
+    the same for every seed.
+    Args:
+        t (np.ndarray): Time axis of the signal.
+        signal (np.ndarray): Clean signal.
+        snr_levels (array_like): SNR levels in dB; levels <= 0 add no noise.
+        seeds (array_like): Seeds of the noise realizations.
+        method (str): Reconstruction method, see dsp.reconstruction.METHODS.
+        sampling_frequency (float): Sampling rate in Hz.
+        model (str): Noise model, see dsp.noise.NOISE_MODELS.
+        duration (float): Sampled span, defaults to t[-1].
+        sampler (callable): As for error_curve; random samplers must be
+            seeded so the signal and the noise are sampled at the same
+            instants.
+        bank (NoiseBank): Source of the realizations, dsp.noise.default_bank
+            by default.
+        memory_budget (int): Bytes allowed for the (levels x points) error
+            block evaluated at once.
+    Returns:
+        dict: "noise_snr_db" and "seed" (the grid axes) and arrays "mae",
+            "rmse" and "snr_db" of shape (len(seeds), len(snr_levels)).
+    '''
+    snr_levels = np.asarray(snr_levels, dtype=float)
+    seeds = list(seeds)
+    duration = t[-1] if duration is None else duration
+    bank = default_bank if bank is None else bank
+    signal = np.asarray(signal)
+    shape = (len(seeds), len(snr_levels))
+    metrics = {name: np.full(shape, np.nan) for name in ("mae", "rmse", "snr_db")}
+    result = {"noise_snr_db": snr_levels, "seed": np.asarray(seeds), **metrics}
+
+    def reconstruct_values(values):
+        amplitudes, times = sampler(t, values, sampling_frequency, duration)
+        if len(times) < 2:
+            return None
+        return reconstruct(method, amplitudes, times, t)
+
+    if model == "quantization":
+        for level_index, level in enumerate(snr_levels):
+            noisy = quantize(signal, level) if level > 0 else signal
+            reconstructed = reconstruct_values(noisy)
+            if reconstructed is None:
+                return result
+            metrics["mae"][:, level_index] = mean_absolute_error(signal, reconstructed)
+            metrics["rmse"][:, level_index] = root_mean_square_error(signal, reconstructed)
+            metrics["snr_db"][:, level_index] = snr_db(signal, reconstructed)
+        return result
+
+    reconstructed = reconstruct_values(signal)
+    if reconstructed is None:
+        return result
+    clean_error = signal - reconstructed
+    scales = np.where(snr_levels > 0, noise_rms(signal, snr_levels), 0)
+    signal_power = np.mean(np.square(signal), dtype=np.float64)
+    dtype = compute_dtype(signal)
+    block = max(1, int(memory_budget // (max(1, len(signal)) * dtype.itemsize * 2)))
+    for seed_index, seed in enumerate(seeds):
+        reconstructed_noise = reconstruct_values(bank.realization(model, len(signal), seed, dtype))
+        for start in range(0, len(snr_levels), block):
+            levels = slice(start, start + block)
+            # error = signal - R(signal + scale * noise) = clean_error - scale * R(noise)
+            errors = np.multiply.outer(scales[levels].astype(dtype), reconstructed_noise)
+            np.subtract(clean_error, errors, out=errors)
+            mae = np.mean(np.abs(errors), axis=1, dtype=np.float64)
+            mse = np.mean(np.square(errors, out=errors), axis=1, dtype=np.float64)
+            metrics["mae"][seed_index, levels] = mae
+            metrics["rmse"][seed_index, levels] = np.sqrt(mse)
+            with np.errstate(divide="ignore"):
+                metrics["snr_db"][seed_index, levels] = 10 * np.log10(signal_power / mse)
+    return result
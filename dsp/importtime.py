@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+
+def measure_import_time(module="dsp", python=sys.executable, cwd=None):
+    '''
+    Import `module` in a fresh interpreter under `-X importtime` and collect
+    the cumulative import cost of every module it pulled in.
+    Returns:
+        tuple: (total_seconds, {module_name: cumulative_seconds})
+    '''
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=cwd,
+    )
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            cumulative_us = int(fields[1])
+        except ValueError:
+            continue
+        cumulative[fields[2].strip()] = cumulative_us / 1e6
+    return cumulative.get(module, 0.0), cumulative
+
+
+def format_report(total, cumulative, top=15):
+    lines = [f"Total import time: {total * 1000:.1f} ms"]
+    for name, seconds in sorted(cumulative.items(), key=lambda kv: -kv[1])[:top]:
+        lines.append(f"  {seconds * 1000:8.1f} ms  {name}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    module = sys.argv[1] if len(sys.argv) > 1 else "dsp"
+    print(format_report(*measure_import_time(module)))
@@ -0,0 +1,173 @@
+import hashlib
+import itertools
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from dsp.precision import real_dtype
+
+
+def load_signal_csv(path, max_rows=None, duration=1):
+    '''
+    Load a signal file in the format the GUI uploads: comma separated, with
+    either a single amplitude column or (time, amplitude) columns.
+    Args:
+        path (str): Path to the .csv/.txt file.
+        max_rows (int): Read at most this many rows.
+        duration (float): Span assigned to single-column files, which carry
+            no time information.
+    Returns:
+        tuple: (t, signal) with t starting at 0; the signal is in the
+            precision set in dsp.precision.
+    '''
+    signal_data = np.loadtxt(path, delimiter=",", max_rows=max_rows, ndmin=2)
+    if signal_data.shape[1] > 1:
+        t = signal_data[:, 0] - signal_data[0, 0]
+        signal = signal_data[:, 1].astype(real_dtype())
+    else:
+        signal = signal_data[:, 0].astype(real_dtype())
+        t = np.linspace(0, duration, len(signal))
+    return t, signal
+
+
+# Rows parsed per chunk while converting a text recording to .npy.
+CHUNK_ROWS = 200_000
+
+# Sampling rate assumed for single-column files, which carry no time column.
+DEFAULT_SAMPLE_RATE = 1000
+
+
+def _count_rows(path):
+    rows = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            rows += block.count(b"\n")
+            last = block[-1:]
+    return rows + (last != b"\n")
+
+
+def _cache_path(path):
+    cache = Path(str(path) + ".npy")
+    if os.access(cache.parent, os.W_OK):
+        return cache
+    digest = hashlib.blake2b(str(Path(path).resolve()).encode(), digest_size=8).hexdigest()
+    return Path(tempfile.gettempdir()) / f"{Path(path).name}.{digest}.npy"
+
+
+def _read_chunk(f, chunk_rows):
+    # Returns None at end of file and an empty table for all-blank chunks.
+    lines = list(itertools.islice(f, chunk_rows))
+    if not lines:
+        return None
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return np.empty((0, 0))
+    return np.loadtxt(lines, delimiter=",", ndmin=2)
+
+
+def convert_to_npy(path, cache_path, chunk_rows=CHUNK_ROWS):
+    '''
+    Parse a comma separated recording in chunks of `chunk_rows` lines and
+    write it to a .npy file without holding the whole table in memory.
+    '''
+    rows = _count_rows(path)
+    with open(path, "r") as f:
+        first = _read_chunk(f, chunk_rows)
+        while first is not None and first.size == 0:
+            first = _read_chunk(f, chunk_rows)
+        if first is None:
+            raise ValueError(f"{path} contains no data")
+        columns = first.shape[1]
+        partial_path = Path(str(cache_path) + ".partial")
+        table = np.lib.format.open_memmap(
+            partial_path, mode="w+", dtype=np.float64, shape=(rows, columns)
+        )
+        filled = len(first)
+        table[:filled] = first
+        while True:
+            chunk = _read_chunk(f, chunk_rows)
+            if chunk is None:
+                break
+            if chunk.size == 0:
+                continue
+            table[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+        table.flush()
+
+    if filled < rows:
+        # Blank lines were counted but not parsed; shrink to the parsed rows.
+        np.save(cache_path, table[:filled])
+        del table
+        partial_path.unlink()
+    else:
+        del table
+        os.replace(partial_path, cache_path)
+
+
+class Recording:
+    '''
+    A recorded signal backed by a memory-mapped .npy copy of the source
+    file. The copy is written on first load and reused while it is newer
+    than the source, so reopening a long recording costs no parsing and
+    nothing is read until a window of it is requested.
+    '''
+
+    def __init__(self, path, sample_rate=DEFAULT_SAMPLE_RATE, chunk_rows=CHUNK_ROWS):
+        '''
+        Args:
+            path (str): Comma separated file with (time, amplitude) or
+                amplitude-only columns.
+            sample_rate (float): Rate assumed for amplitude-only files.
+            chunk_rows (int): Rows parsed at a time when building the cache.
+        '''
+        self.path = Path(path)
+        self.cache_path = _cache_path(path)
+        if (
+            not self.cache_path.exists()
+            or self.cache_path.stat().st_mtime < self.path.stat().st_mtime
+        ):
+            convert_to_npy(self.path, self.cache_path, chunk_rows)
+        self.table = np.load(self.cache_path, mmap_mode="r")
+
+        if self.table.shape[1] > 1 and len(self.table) > 1:
+            head = np.asarray(self.table[:10_000, 0])
+            step = np.median(np.diff(head))
+            if not (np.isfinite(step) and step > 0):
+                raise ValueError(f"{self.path}: the time column does not increase")
+            self.fs = 1 / step
+            self.start_time = float(self.table[0, 0])
+        else:
+            self.fs = float(sample_rate)
+            self.start_time = 0.0
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def duration(self):
+        return len(self) / self.fs
+
+    @property
+    def data(self):
+        return self.table[:, -1]
+
+    def window(self, start, length):
+        '''
+        A segment of the recording, read from disk on demand.
+        Args:
+            start (float): Start of the window in seconds from the beginning.
+            length (float): Window length in seconds.
+        Returns:
+            tuple: (t, signal) with t measured from the window start.
+        '''
+        first = int(np.clip(round(start * self.fs), 0, max(0, len(self) - 1)))
+        last = int(np.clip(first + round(length * self.fs), first + 1, len(self)))
+        signal = np.array(self.table[first:last, -1])
+        if self.table.shape[1] > 1:
+            t = np.array(self.table[first:last, 0]) - self.table[first, 0]
+        else:
+            t = np.arange(len(signal)) / self.fs
+        return t, signal
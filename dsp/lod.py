@@ -0,0 +1,61 @@
+import numpy as np
+
+
+class MinMaxPyramid:
+    '''
+    Multi-resolution min/max summary of a signal for drawing. Level k holds
+    the minimum and maximum of every block of 2**k samples, so any time
+    range can be drawn with about two points per horizontal pixel while
+    still showing every peak.
+    '''
+
+    def __init__(self, t, y):
+        self.t = np.asarray(t)
+        self.y = np.asarray(y)
+        self.levels = [(self.y, self.y)]
+        mins, maxs = self.y, self.y
+        while len(mins) > 2:
+            if len(mins) % 2:
+                mins = np.append(mins, mins[-1])
+                maxs = np.append(maxs, maxs[-1])
+            mins = mins.reshape(-1, 2).min(axis=1)
+            maxs = maxs.reshape(-1, 2).max(axis=1)
+            self.levels.append((mins, maxs))
+
+    def __len__(self):
+        return len(self.y)
+
+    def query(self, start, stop, max_points):
+        '''
+        Points to draw for the time range [start, stop].
+        Args:
+            start (float): Left edge of the view.
+            stop (float): Right edge of the view.
+            max_points (int): Budget of points; raw samples are returned when
+                the range holds fewer than this.
+        Returns:
+            tuple: (x, y) arrays, alternating block minima and maxima when
+                decimated.
+        '''
+        if len(self.y) == 0:
+            return self.t, self.y
+        first = max(0, int(np.searchsorted(self.t, start, side="right")) - 1)
+        last = min(len(self.y), int(np.searchsorted(self.t, stop, side="left")) + 1)
+        count = max(1, last - first)
+        if count <= max_points:
+            return self.t[first:last], self.y[first:last]
+
+        level = min(
+            len(self.levels) - 1, int(np.ceil(np.log2(2 * count / max(2, max_points))))
+        )
+        mins, maxs = self.levels[level]
+        block = 1 << level
+        first_block = first >> level
+        last_block = min(len(mins), -(-last // block))
+        block_times = self.t[np.arange(first_block, last_block) * block]
+
+        x = np.repeat(block_times, 2)
+        y = np.empty(len(x), dtype=self.y.dtype)
+        y[0::2] = mins[first_block:last_block]
+        y[1::2] = maxs[first_block:last_block]
+        return x, y
@@ -0,0 +1,19 @@
+import numpy as np
+
+
+def mean_absolute_error(reference, reconstructed):
+    return np.mean(np.abs(reference - reconstructed))
+
+
+def root_mean_square_error(reference, reconstructed):
+    return np.sqrt(np.mean(np.square(reference - reconstructed)))
+
+
+def snr_db(reference, reconstructed):
+    '''
+    Reconstruction SNR in dB: reference power over error power.
+    '''
+    error_power = np.mean(np.square(reference - reconstructed))
+    if error_power == 0:
+        return np.inf
+    return 10 * np.log10(np.mean(np.square(reference)) / error_power)
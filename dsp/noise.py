@@ -0,0 +1,175 @@
+'''
+Additive noise at a target signal-to-noise ratio.
+
+Noise is built from unit-power realizations scaled to the wanted SNR. A
+NoiseBank draws each realization once from a seeded generator and keeps
+it, so the same (model, seed) always gives the same noise and moving
+through SNR levels only rescales it.
+'''
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from dsp.precision import compute_dtype
+
+NOISE_MODELS = ("white", "pink", "impulsive", "quantization")
+
+# Fraction of samples hit by an impulse in the impulsive model.
+IMPULSE_DENSITY = 0.01
+
+
+def _white(rng, n, dtype):
+    return rng.standard_normal(n, dtype=dtype)
+
+
+def _pink(rng, n, dtype):
+    # White noise shaped in the frequency domain to a 1/f power spectrum,
+    # without a DC component.
+    bins = n // 2 + 1
+    spectrum = np.empty(bins, dtype=np.result_type(dtype, np.complex64))
+    spectrum.real = rng.standard_normal(bins, dtype=dtype)
+    spectrum.imag = rng.standard_normal(bins, dtype=dtype)
+    spectrum[0] = 0
+    spectrum[1:] /= np.sqrt(np.arange(1, bins, dtype=dtype))
+    return np.fft.irfft(spectrum, n)
+
+
+def _impulsive(rng, n, dtype):
+    # Bernoulli-Gaussian: sparse impulses of Gaussian height.
+    noise = np.zeros(n, dtype=dtype)
+    hits = np.flatnonzero(rng.random(n, dtype=dtype) < IMPULSE_DENSITY)
+    noise[hits] = rng.standard_normal(len(hits), dtype=dtype)
+    return noise
+
+
+_ADDITIVE_MODELS = {"white": _white, "pink": _pink, "impulsive": _impulsive}
+
+
+def unit_noise(model, n, rng=None, dtype=np.float64):
+    '''
+    One realization of additive noise scaled to a mean power of exactly 1.
+    Args:
+        model (str): "white", "pink" or "impulsive".
+        n (int): Number of samples.
+        rng (np.random.Generator | int): Random generator or seed.
+        dtype: Floating dtype of the realization.
+    '''
+    try:
+        generate = _ADDITIVE_MODELS[model]
+    except KeyError:
+        raise ValueError(f"Not an additive noise model: {model}") from None
+    noise = generate(np.random.default_rng(rng), int(n), np.dtype(dtype))
+    power = np.mean(np.square(noise), dtype=np.float64) if n else 0.0
+    if power > 0:
+        noise *= noise.dtype.type(1 / np.sqrt(power))
+    return noise
+
+
+def noise_rms(signal, snr_db):
+    '''
+    RMS amplitude of noise that sits `snr_db` below the power of `signal`;
+    `snr_db` may be an array of levels.
+    '''
+    signal_power = np.mean(np.square(signal), dtype=np.float64)
+    return np.sqrt(signal_power / 10 ** (np.asarray(snr_db, dtype=float) / 10))
+
+
+def quantize(signal, snr_db):
+    '''
+    Round the signal to a uniform grid whose quantization noise (step**2 /
+    12) sits `snr_db` below the signal power.
+    '''
+    signal = np.asarray(signal)
+    dtype = compute_dtype(signal)
+    step = dtype.type(np.sqrt(12) * noise_rms(signal, snr_db))
+    if step == 0:
+        return signal.astype(dtype)
+    quantized = np.divide(signal, step, dtype=dtype)
+    np.rint(quantized, out=quantized)
+    quantized *= step
+    return quantized
+
+
+def add_noise(signal, snr_db, rng=None, model="white"):
+    '''
+    Add noise at the given signal-to-noise ratio.
+    Args:
+        signal (np.ndarray): Clean signal.
+        snr_db (float): Target SNR in dB; values <= 0 leave the signal untouched.
+        rng (np.random.Generator | int): Source of randomness, defaults to a
+            fresh one.
+        model (str): One of NOISE_MODELS. Quantization rounds the signal
+            instead of drawing noise.
+    Returns:
+        np.ndarray: The noisy signal, drawn and summed in the precision of
+            `signal` (float32 noise for float32 signals).
+    '''
+    if snr_db <= 0:
+        return signal
+    signal = np.asarray(signal)
+    if model == "quantization":
+        return quantize(signal, snr_db)
+    dtype = compute_dtype(signal)
+    noise = unit_noise(model, len(signal), rng, dtype)
+    noise *= dtype.type(noise_rms(signal, snr_db))
+    noise += signal
+    return noise
+
+
+class NoiseBank:
+    '''
+    Unit-power noise realizations, generated once per (model, seed, length,
+    dtype) from np.random.default_rng(seed) and kept in an LRU bounded by
+    `max_bytes`. Realizations are read-only and do not depend on the signal,
+    so noise at any SNR costs a multiply and an add.
+    '''
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.realizations = OrderedDict()
+        self.current_bytes = 0
+        self.lock = threading.Lock()
+
+    def realization(self, model, n, seed=0, dtype=np.float64):
+        key = (model, int(n), seed, np.dtype(dtype).str)
+        with self.lock:
+            if key in self.realizations:
+                self.realizations.move_to_end(key)
+                return self.realizations[key]
+        noise = unit_noise(model, n, seed, dtype)
+        noise.flags.writeable = False
+        with self.lock:
+            if key not in self.realizations and noise.nbytes <= self.max_bytes:
+                self.realizations[key] = noise
+                self.current_bytes += noise.nbytes
+                while self.current_bytes > self.max_bytes:
+                    _, evicted = self.realizations.popitem(last=False)
+                    self.current_bytes -= evicted.nbytes
+        return noise
+
+    def add(self, signal, snr_db, model="white", seed=0):
+        '''
+        add_noise with the bank's realization for (model, seed). The result
+        is the same on every call with the same arguments.
+        '''
+        if snr_db <= 0:
+            return signal
+        signal = np.asarray(signal)
+        if model == "quantization":
+            return quantize(signal, snr_db)
+        dtype = compute_dtype(signal)
+        noisy = self.realization(model, len(signal), seed, dtype) * dtype.type(
+            noise_rms(signal, snr_db)
+        )
+        noisy += signal
+        return noisy
+
+    def clear(self):
+        with self.lock:
+            self.realizations.clear()
+            self.current_bytes = 0
+
+
+default_bank = NoiseBank()
@@ -0,0 +1,228 @@
+'''
+Reconstruction from non-uniformly spaced samples.
+
+The signal is modelled as a trigonometric polynomial of bandwidth K over a
+period P and its coefficients are found by weighted least squares (the ACT
+method: adaptive weights, conjugate gradients, Toeplitz). The normal
+equations are Toeplitz, so they are built with two non-uniform FFTs and
+solved by conjugate gradients with FFT-based products. The cost is
+O(n + K log K) per iteration and no n x K matrix is ever formed.
+'''
+
+import numpy as np
+
+# Half-width, in grid points, of the Gaussian spreading kernel; 12 gives
+# about 1e-12 relative accuracy at twice oversampling.
+_SPREAD = 12
+_OVERSAMPLING = 2
+_BLOCK_POINTS = 1 << 15
+
+
+def _fast_length(n):
+    '''
+    Smallest length >= n whose only prime factors are 2, 3 and 5.
+    '''
+    best = 1 << max(0, int(n - 1).bit_length())
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            length = power35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def nufft_type1(x, strengths, n_modes):
+    '''
+    Type-1 non-uniform FFT by Gaussian gridding:
+    F[k] = sum_j strengths[j] * exp(-1j * k * x[j]).
+    Args:
+        x (np.ndarray): Points in [0, 2 pi).
+        strengths (np.ndarray): Values at x, shape (n,) or (m, n) to
+            transform several sets of values at the same points at once.
+        n_modes (int): Number of output modes, k = -(n_modes // 2) ... up.
+    Returns:
+        np.ndarray: F with the last axis indexed by k + n_modes // 2.
+    '''
+    x = np.mod(np.asarray(x, dtype=float), 2 * np.pi)
+    strengths = np.asarray(strengths)
+    rows = np.atleast_2d(strengths)
+    grid_size = _fast_length(max(2 * _SPREAD, _OVERSAMPLING * n_modes))
+    ratio = grid_size / n_modes
+    tau = np.pi * _SPREAD / (n_modes**2 * ratio * (ratio - 0.5))
+    step = 2 * np.pi / grid_size
+
+    offsets = np.arange(-_SPREAD + 1, _SPREAD + 1)
+    grid = np.zeros((len(rows), grid_size), dtype=complex)
+    for start in range(0, len(x), _BLOCK_POINTS):
+        block = x[start:start + _BLOCK_POINTS]
+        indices = np.floor(block / step).astype(np.intp)[:, np.newaxis] + offsets
+        kernel = np.exp(-((block[:, np.newaxis] - indices * step) ** 2) / (4 * tau))
+        indices = (indices % grid_size).ravel()
+        for row, values in zip(grid, rows[:, start:start + _BLOCK_POINTS]):
+            weighted = (values[:, np.newaxis] * kernel).ravel()
+            row += np.bincount(indices, weights=weighted.real, minlength=grid_size)
+            if np.iscomplexobj(weighted):
+                row += 1j * np.bincount(indices, weights=weighted.imag, minlength=grid_size)
+
+    spectrum = np.fft.fft(grid, axis=-1) / grid_size
+    k = np.arange(n_modes) - n_modes // 2
+    transformed = np.sqrt(np.pi / tau) * np.exp(k**2 * tau) * spectrum[:, k % grid_size]
+    return transformed[0] if strengths.ndim == 1 else transformed
+
+
+def voronoi_weights(positions, period):
+    '''
+    Half the distance between each sample's neighbours, on a circle of
+    length `period`. Weighting by the local spacing keeps dense clusters of
+    samples from dominating the fit.
+    '''
+    order = np.argsort(positions)
+    sorted_positions = positions[order]
+    gaps = np.diff(sorted_positions, append=sorted_positions[0] + period)
+    weights = np.empty(len(positions))
+    weights[order] = (gaps + np.roll(gaps, 1)) / 2
+    return weights
+
+
+class _ToeplitzOperator:
+    '''
+    Hermitian Toeplitz matrix T[k, l] = column[k - l], applied by embedding
+    it in a circulant of at least twice the size.
+    '''
+
+    def __init__(self, column):
+        # column holds entries for k - l = -(size - 1) ... size - 1.
+        size = (len(column) + 1) // 2
+        length = _fast_length(2 * size)
+        circulant = np.zeros(length, dtype=complex)
+        circulant[:size] = column[size - 1:]
+        circulant[length - size + 1:] = column[: size - 1]
+        self.size = size
+        self.length = length
+        self.eigenvalues = np.fft.fft(circulant)
+
+    def __matmul__(self, vector):
+        padded = np.fft.fft(vector, n=self.length)
+        return np.fft.ifft(padded * self.eigenvalues)[: self.size]
+
+
+class _NyquistOperator:
+    '''
+    Normal equations restricted to coefficients with equal modes -K and K,
+    which then act as one cosine at the highest frequency. Vectors leave
+    out mode -K; see _tie_nyquist and _fold_nyquist.
+    '''
+
+    def __init__(self, operator):
+        self.operator = operator
+
+    def __matmul__(self, vector):
+        return _fold_nyquist(self.operator @ _tie_nyquist(vector))
+
+
+def _tie_nyquist(vector):
+    return np.concatenate((vector[-1:], vector))
+
+
+def _fold_nyquist(vector):
+    folded = vector[1:].copy()
+    folded[-1] += vector[0]
+    return folded
+
+
+def _conjugate_gradient(operator, rhs, tolerance, max_iterations):
+    solution = np.zeros_like(rhs)
+    residual = rhs.copy()
+    direction = residual.copy()
+    residual_norm = np.vdot(residual, residual).real
+    target = tolerance**2 * residual_norm
+    for _ in range(max_iterations):
+        if residual_norm <= target:
+            break
+        product = operator @ direction
+        step = residual_norm / np.vdot(direction, product).real
+        solution += step * direction
+        residual -= step * product
+        new_norm = np.vdot(residual, residual).real
+        direction = residual + (new_norm / residual_norm) * direction
+        residual_norm = new_norm
+    return solution
+
+
+def least_squares_reconstruction(
+    amplitude,
+    sampling_time,
+    current_time,
+    bandwidth=None,
+    tolerance=1e-8,
+    max_iterations=200,
+    oversample=4,
+):
+    '''
+    Band-limited least-squares reconstruction from samples at arbitrary
+    instants. The signal is treated as periodic over the span of the
+    output and sample times, like the FFT reconstruction.
+    Args:
+        amplitude (np.ndarray): Sample values.
+        sampling_time (np.ndarray): Sample instants, in any order.
+        current_time (np.ndarray): Instants at which to evaluate the signal.
+        bandwidth (float): Highest frequency of the model in Hz; defaults to
+            half the average sampling rate.
+        tolerance (float): Relative residual at which conjugate gradients
+            stop.
+        max_iterations (int): Iteration cap; stopping early also regularizes
+            fits with large gaps between samples.
+        oversample (int): Density of the grid the polynomial is evaluated on
+            relative to the output spacing; the output is linearly
+            interpolated from it.
+    Returns:
+        np.ndarray: The reconstructed signal at current_time.
+    '''
+    amplitude = np.asarray(amplitude, dtype=float)
+    sampling_time = np.asarray(sampling_time, dtype=float)
+    current_time = np.asarray(current_time, dtype=float)
+    if len(sampling_time) < 2:
+        raise ValueError("At least two samples are needed for reconstruction")
+
+    origin = min(current_time[0], sampling_time.min())
+    period = max(current_time[-1], sampling_time.max()) - origin
+    max_order = len(sampling_time) // 2
+    order = max_order if bandwidth is None else min(int(bandwidth * period), max_order)
+    # n samples determine n real coefficients. With n even that leaves room
+    # for the highest mode only as a cosine (uniform samples at exactly twice
+    # its frequency cannot see its sine), so modes -K and K are tied.
+    nyquist = 2 * order == len(sampling_time)
+
+    positions = sampling_time - origin
+    weights = voronoi_weights(positions, period)
+    angles = 2 * np.pi * positions / period
+    # Modes -2K..2K of the weights build the Toeplitz matrix, modes -K..K
+    # of the weighted samples the right-hand side.
+    transforms = nufft_type1(angles, np.stack((weights, weights * amplitude)), 4 * order + 2)
+    center = 2 * order + 1
+    column = transforms[0, center - 2 * order:center + 2 * order + 1]
+    rhs = transforms[1, center - order:center + order + 1]
+    operator = _ToeplitzOperator(column)
+    if nyquist:
+        coefficients = _tie_nyquist(
+            _conjugate_gradient(
+                _NyquistOperator(operator), _fold_nyquist(rhs), tolerance, max_iterations
+            )
+        )
+    else:
+        coefficients = _conjugate_gradient(operator, rhs, tolerance, max_iterations)
+
+    # Evaluate the real polynomial on a fine periodic grid.
+    grid_size = 2 * _fast_length(max(2 * order + 1, int(oversample) * len(current_time) // 2))
+    positive = coefficients[order:]
+    negative = coefficients[order::-1]
+    spectrum = np.zeros(grid_size // 2 + 1, dtype=complex)
+    spectrum[: order + 1] = (positive + negative.conj()) / 2 * grid_size
+    fine = np.fft.irfft(spectrum, n=grid_size)
+    fine_time = np.arange(grid_size) * (period / grid_size)
+    return np.interp(current_time - origin, fine_time, fine, period=period)
@@ -0,0 +1,287 @@
+'''
+Reconstruction of several signals at once on a process pool.
+
+Signal arrays are handed to the workers through shared memory and the
+workers write their results into shared output blocks, so only block names
+and the (small) sample arrays are pickled.
+'''
+
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from dsp.pipeline import ReconstructionResult, sample_and_reconstruct
+from dsp.precision import compute_dtype
+from dsp.spectrum import occupied_bandwidth
+
+
+class SharedArray:
+    '''
+    A NumPy array in a shared memory block. The creating process owns the
+    block and unlinks it on close; other processes attach with
+    SharedArray.attach(descriptor).
+    '''
+
+    def __init__(self, shape, dtype=np.float64, name=None):
+        dtype = np.dtype(dtype)
+        self.owner = name is None
+        if self.owner:
+            size = max(1, int(np.prod(shape)) * dtype.itemsize)
+            self.block = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.block = _open_block(name)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.block.buf)
+
+    @classmethod
+    def from_array(cls, array):
+        array = np.asarray(array)
+        shared = cls(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor):
+        name, shape, dtype = descriptor
+        return cls(shape, dtype, name=name)
+
+    @property
+    def descriptor(self):
+        return self.block.name, self.array.shape, self.array.dtype.str
+
+    def close(self):
+        self.array = None
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def _open_block(name):
+    # Pool workers share the parent's resource tracker, so registering the
+    # block again on attach is harmless; the owner unregisters it on unlink.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _sampling_frequency(t, signal, sampling_frequency, factor, f_max):
+    if sampling_frequency is not None:
+        return sampling_frequency
+    if f_max is None:
+        f_max = occupied_bandwidth(signal, 1 / (t[1] - t[0]))
+    if not f_max:
+        raise ValueError("no bandwidth to sample at")
+    return factor * f_max
+
+
+def _reconstruct_shared(
+    inputs,
+    outputs,
+    method,
+    sampler,
+    duration,
+    sampling_frequency,
+    factor,
+    f_max,
+    window,
+    segment,
+):
+    attached = [SharedArray.attach(descriptor) for descriptor in inputs + outputs]
+    try:
+        t, reference, signals_out, spectrum_out = (shared.array for shared in attached)
+        sampling_frequency = _sampling_frequency(
+            t, reference, sampling_frequency, factor, f_max
+        )
+        result = sample_and_reconstruct(
+            sampler,
+            reference,
+            duration,
+            method,
+            t,
+            reference,
+            sampling_frequency,
+            window=window,
+            segment=segment,
+        )
+        signals_out[0] = result.reconstructed
+        signals_out[1] = result.difference
+        n_bins = len(result.frequencies)
+        spectrum_out[0, :n_bins] = result.frequencies
+        spectrum_out[1, :n_bins] = result.magnitude
+        # The samples are small and their number is only known now, so they
+        # are returned rather than shared.
+        return (
+            float(result.error),
+            n_bins,
+            float(sampling_frequency),
+            result.sampling_amplitudes,
+            result.sampling_times,
+        )
+    finally:
+        for shared in attached:
+            shared.close()
+
+
+class ParallelReconstructor:
+    '''
+    Runs dsp.pipeline.sample_and_reconstruct for several signals on a pool of
+    worker processes. Workers are spawned rather than forked, which is safe
+    from a process that runs GUI and worker threads.
+    '''
+
+    def __init__(self, workers=None):
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def submit(
+        self,
+        t,
+        reference,
+        method,
+        sampler,
+        duration,
+        sampling_frequency=None,
+        factor=None,
+        f_max=None,
+        window="boxcar",
+        segment=None,
+    ):
+        '''
+        Schedule sampling `reference` and reconstructing it. Both run in the
+        worker, as does estimating the bandwidth, since sampling can need a
+        long filter and the estimate a pass over the whole signal.
+        Args:
+            t (np.ndarray): Time axis of the signal.
+            reference (np.ndarray): Signal to sample and compare against.
+            method (str): One of dsp.reconstruction.METHODS.
+            sampler (callable): As for dsp.pipeline.sample_and_reconstruct;
+                must be picklable (e.g. a functools.partial of a dsp
+                sampler).
+            duration (float): Length of the sampled span in seconds.
+            sampling_frequency (float): Sampling rate in Hz, or None to
+                sample at `factor` times the bandwidth.
+            factor (float): Multiple of the bandwidth to sample at.
+            f_max (float): Bandwidth of the signal, if known; otherwise its
+                occupied bandwidth is estimated.
+            window (str), segment (int): As for run_reconstruction.
+        Returns:
+            Future-like object resolving to a ReconstructionResult that
+                holds copies of the shared outputs and the samples.
+        '''
+        if sampling_frequency is None and factor is None:
+            raise ValueError("Give a sampling frequency or a factor of the bandwidth")
+        t = np.ascontiguousarray(t, dtype=float)
+        # Outputs are shared in the precision the worker computes in.
+        dtype = compute_dtype(reference)
+        reference = np.ascontiguousarray(reference, dtype=dtype)
+        blocks = [
+            SharedArray.from_array(t),
+            SharedArray.from_array(reference),
+            SharedArray((2, len(t)), dtype),
+            SharedArray((2, len(t) // 2 + 1), dtype),
+        ]
+        try:
+            future = self.pool.submit(
+                _reconstruct_shared,
+                [blocks[0].descriptor, blocks[1].descriptor],
+                [blocks[2].descriptor, blocks[3].descriptor],
+                method,
+                sampler,
+                duration,
+                sampling_frequency,
+                factor,
+                f_max,
+                window,
+                segment,
+            )
+        except BaseException:
+            for block in blocks:
+                block.close()
+            raise
+        return _ResultFuture(future, blocks)
+
+    def shutdown(self, wait=False):
+        self.pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class _ResultFuture:
+    '''
+    Future of a shared-memory reconstruction. The shared blocks are read
+    and released as soon as the worker finishes.
+    '''
+
+    def __init__(self, future, blocks):
+        self.future = future
+        self.blocks = blocks
+        self.result_value = None
+        self.collected = False
+        self.callbacks = []
+        self.lock = threading.Lock()
+        future.add_done_callback(self._collect)
+
+    def _collect(self, future):
+        try:
+            if not future.cancelled() and future.exception() is None:
+                error, n_bins, sampling_frequency, amplitudes, times = future.result()
+                signals_out = self.blocks[2].array
+                spectrum_out = self.blocks[3].array
+                self.result_value = ReconstructionResult(
+                    signals_out[0].copy(),
+                    signals_out[1].copy(),
+                    error,
+                    spectrum_out[0, :n_bins].copy(),
+                    spectrum_out[1, :n_bins].copy(),
+                    sampling_frequency,
+                    amplitudes,
+                    times,
+                )
+        finally:
+            for block in self.blocks:
+                block.close()
+        with self.lock:
+            self.collected = True
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def add_done_callback(self, callback):
+        '''
+        Call `callback(self)` once the result is available (from the pool's
+        thread), or right away if it already is.
+        '''
+        with self.lock:
+            if not self.collected:
+                self.callbacks.append(callback)
+                return
+        callback(self)
+
+    def done(self):
+        return self.future.done()
+
+    def cancel(self):
+        return self.future.cancel()
+
+    def exception(self):
+        return self.future.exception()
+
+    def result(self, timeout=None):
+        self.future.result(timeout)
+        # The pool's callback may still be copying the outputs.
+        with self.lock:
+            collected = self.collected
+        if not collected:
+            done = threading.Event()
+            self.add_done_callback(lambda _: done.set())
+            done.wait(timeout)
+        return self.result_value
@@ -0,0 +1,92 @@
+from collections import namedtuple
+
+import numpy as np
+
+from dsp.reconstruction import reconstruct
+from dsp.spectrum import magnitude_spectrum
+
+ReconstructionResult = namedtuple(
+    "ReconstructionResult",
+    [
+        "reconstructed",
+        "difference",
+        "error",
+        "frequencies",
+        "magnitude",
+        "sampling_frequency",
+        "sampling_amplitudes",
+        "sampling_times",
+    ],
+    # The samples are only kept by sample_and_reconstruct.
+    defaults=(None, None),
+)
+
+
+def run_reconstruction(
+    method,
+    amplitudes,
+    sampling_times,
+    t,
+    reference,
+    sampling_frequency,
+    window="boxcar",
+    segment=None,
+):
+    '''
+    Everything the GUI shows for one slider position: the reconstruction,
+    its difference from `reference`, the mean absolute error and the
+    magnitude spectrum of the reconstruction (optionally windowed or
+    Welch-averaged over segments of `segment` points).
+    '''
+    reconstructed = reconstruct(method, amplitudes, sampling_times, t)
+    difference = reference - reconstructed
+    frequencies, magnitude = magnitude_spectrum(
+        reconstructed, t[1] - t[0], window=window, segment=segment
+    )
+    return ReconstructionResult(
+        reconstructed,
+        difference,
+        # Accumulated in float64 whatever the signal precision.
+        np.mean(np.abs(difference), dtype=np.float64),
+        frequencies,
+        magnitude,
+        sampling_frequency,
+    )
+
+
+def sample_and_reconstruct(
+    sampler,
+    signal,
+    duration,
+    method,
+    t,
+    reference,
+    sampling_frequency,
+    window="boxcar",
+    segment=None,
+):
+    '''
+    Sample `signal`, given on the time axis `t`, and run_reconstruction on
+    the samples. Sampling can be costly too (polyphase sampling designs a
+    filter), so the GUI hands both steps to its worker thread.
+    Args:
+        sampler (callable): sampler(t, signal, sampling_frequency, duration)
+            returning (amplitudes, sampling_times), e.g. dsp.sample_uniform.
+        signal (np.ndarray): Signal to sample.
+        duration (float): Length of the sampled span in seconds.
+        Other arguments as for run_reconstruction.
+    Returns:
+        ReconstructionResult: Including the samples, for drawing them.
+    '''
+    amplitudes, sampling_times = sampler(t, signal, sampling_frequency, duration)
+    result = run_reconstruction(
+        method,
+        amplitudes,
+        sampling_times,
+        t,
+        reference,
+        sampling_frequency,
+        window=window,
+        segment=segment,
+    )
+    return result._replace(sampling_amplitudes=amplitudes, sampling_times=sampling_times)
@@ -0,0 +1,65 @@
+'''
+Floating-point precision of the signal pipeline.
+
+Signals are synthesized and loaded in the precision set here. Everything
+downstream follows the dtype of the signal values it is handed, so float32
+signals are sampled, noised, reconstructed and transformed in float32 (with
+complex64 spectra) without further switches, also in worker processes that
+never see this setting. Time axes stay float64.
+'''
+
+from contextlib import contextmanager
+
+import numpy as np
+
+PRECISIONS = {"float64": np.dtype(np.float64), "float32": np.dtype(np.float32)}
+DEFAULT_PRECISION = "float64"
+
+_precision = DEFAULT_PRECISION
+
+
+def get_precision():
+    return _precision
+
+
+def set_precision(name):
+    '''
+    Args:
+        name (str): One of PRECISIONS.
+    '''
+    global _precision
+    if name not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {name}")
+    _precision = name
+
+
+@contextmanager
+def using_precision(name):
+    '''
+    Run a block with another precision, restoring the previous one after.
+    '''
+    previous = get_precision()
+    set_precision(name)
+    try:
+        yield PRECISIONS[name]
+    finally:
+        set_precision(previous)
+
+
+def real_dtype():
+    '''
+    dtype new signals are created with.
+    '''
+    return PRECISIONS[_precision]
+
+
+def compute_dtype(*values):
+    '''
+    Floating dtype to process signal values in: float32 when they are all
+    single precision or narrower (e.g. 16-bit integers), float64 otherwise.
+    '''
+    return np.result_type(*(np.asarray(value).dtype for value in values), np.float32)
+
+
+def complex_dtype(dtype):
+    return np.result_type(dtype, np.complex64)
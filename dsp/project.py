@@ -0,0 +1,227 @@
+'''
+Saving and reopening a session's signals as one project file.
+
+A project is a zip archive in the .npz layout: a manifest.json describing
+the signals and the session state, and one .npy member per array. Members
+are stored uncompressed unless compression is requested. Opening a project
+reads only the manifest; stored members are later memory-mapped straight
+out of the archive and compressed ones are inflated, each when its signal
+is first used.
+'''
+
+import json
+import os
+import struct
+import sys
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from dsp.composite import CompositeSignal
+from dsp.io import Recording
+
+PROJECT_VERSION = 1
+MANIFEST = "manifest.json"
+
+# Arrays start on this boundary in the archive, as in a .npy file, so
+# memory-mapped members are aligned.
+_ALIGNMENT = 64
+_LOCAL_HEADER_SIZE = 30
+_ZIP64_EXTRA_SIZE = 20
+# Extra field ID used for the alignment padding; readers skip unknown IDs.
+_PADDING_ID = 0xA11A
+
+
+def _write_array(archive, name, array, compress_type):
+    array = np.ascontiguousarray(array)
+    zip64 = array.nbytes + 4096 > zipfile.ZIP64_LIMIT
+    info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = compress_type
+    header_end = (
+        archive.fp.tell()
+        + _LOCAL_HEADER_SIZE
+        + len(name.encode())
+        + 4
+        + (_ZIP64_EXTRA_SIZE if zip64 else 0)
+    )
+    padding = -header_end % _ALIGNMENT
+    info.extra = struct.pack("<HH", _PADDING_ID, padding) + bytes(padding)
+    with archive.open(info, "w", force_zip64=zip64) as f:
+        np.lib.format.write_array(f, array, allow_pickle=False)
+    return name
+
+
+def save_project(path, registry, state=None, compress=False):
+    '''
+    Write every signal of `registry` to a project file. The file is written
+    next to `path` and moved into place, so a failed save leaves an
+    existing project intact.
+    Args:
+        path (str): Destination, conventionally ending in .npz.
+        registry (SignalRegistry): Signals to save; entries not loaded yet
+            are loaded.
+        state (dict): JSON-serializable session state saved as is.
+        compress (bool): Deflate the array members. Compressed projects are
+            smaller but their arrays are decompressed into memory on load.
+    '''
+    path = Path(path)
+    compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    partial_path = path.with_name(path.name + ".partial")
+    signals = []
+    try:
+        with zipfile.ZipFile(partial_path, "w", allowZip64=True) as archive:
+            for index, signal_id in enumerate(list(registry.entries)):
+                entry = registry[signal_id]
+                prefix = f"signals/{index}"
+                record = {
+                    "name": entry.name,
+                    "duration": float(entry.duration),
+                    "fs": None if entry.fs is None else float(entry.fs),
+                    "data": _write_array(archive, f"{prefix}/data.npy", entry.data, compress_type),
+                }
+                if entry.composite is not None:
+                    record["components"] = _write_array(
+                        archive,
+                        f"{prefix}/components.npy",
+                        entry.composite.components,
+                        compress_type,
+                    )
+                    record["points"] = int(entry.composite.fs)
+                if entry.recording is not None:
+                    record["recording"] = {
+                        "path": str(Path(entry.recording.path).resolve()),
+                        "window": None if entry.window is None else list(entry.window),
+                    }
+                signals.append(record)
+
+            manifest = {
+                "version": PROJECT_VERSION,
+                "compressed": compress,
+                "signals": signals,
+                "state": state or {},
+            }
+            archive.writestr(MANIFEST, json.dumps(manifest, indent=1))
+        os.replace(partial_path, path)
+    finally:
+        if partial_path.exists():
+            partial_path.unlink()
+    return path
+
+
+class Project:
+    '''
+    An opened project file. Only the manifest is read on construction;
+    arrays are read by `array`.
+    '''
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with zipfile.ZipFile(self.path) as archive:
+            self.members = {info.filename: info for info in archive.infolist()}
+            if MANIFEST not in self.members:
+                raise ValueError(f"{path} is not a project file")
+            self.manifest = json.loads(archive.read(MANIFEST))
+        if self.manifest.get("version", 0) > PROJECT_VERSION:
+            raise ValueError(
+                f"{path} was saved by a newer version (format {self.manifest['version']})"
+            )
+
+    @property
+    def signals(self):
+        return self.manifest["signals"]
+
+    @property
+    def state(self):
+        return self.manifest.get("state", {})
+
+    def array(self, member):
+        '''
+        Read-only memory map of a stored member, or the decompressed array
+        of a compressed one.
+        '''
+        info = self.members[member]
+        if info.compress_type == zipfile.ZIP_STORED:
+            mapped = self._map(info)
+            if mapped is not None:
+                return mapped
+        with zipfile.ZipFile(self.path) as archive, archive.open(info) as f:
+            return np.lib.format.read_array(f, allow_pickle=False)
+
+    def _map(self, info):
+        with open(self.path, "rb") as f:
+            f.seek(info.header_offset)
+            header = f.read(_LOCAL_HEADER_SIZE)
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            elif version == (2, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            else:
+                return None
+            offset = f.tell()
+        if dtype.hasobject or not np.prod(shape):
+            return None
+        return np.memmap(
+            self.path,
+            dtype=dtype,
+            mode="r",
+            shape=shape,
+            order="F" if fortran_order else "C",
+            offset=offset,
+        )
+
+    def loader(self, record):
+        '''
+        Callable building the SignalEntry fields of a manifest record, for
+        SignalRegistry.add(loader=...).
+        '''
+
+        def load():
+            fields = {"data": self.array(record["data"])}
+            if "components" in record:
+                fields["composite"] = CompositeSignal(
+                    self.array(record["components"]),
+                    record["duration"],
+                    record["points"],
+                    data=fields["data"],
+                )
+            source = record.get("recording")
+            if source is not None:
+                try:
+                    fields["recording"] = Recording(source["path"])
+                except (OSError, ValueError) as e:
+                    # The source moved; keep the saved window as a plain signal.
+                    print(
+                        f"Recording {source['path']} unavailable ({e}), using the saved window",
+                        file=sys.stderr,
+                    )
+                else:
+                    window = source["window"]
+                    fields["window"] = None if window is None else tuple(window)
+            return fields
+
+        return load
+
+
+def load_project(path, registry):
+    '''
+    Add the signals of a project to `registry` without reading their
+    arrays; each is loaded when first looked up.
+    Returns:
+        tuple: (IDs of the new entries in saved order, saved state dict).
+    '''
+    project = Project(path)
+    ids = [
+        registry.add(
+            record["name"],
+            None,
+            record["duration"],
+            record["fs"],
+            loader=project.loader(record),
+        )
+        for record in project.signals
+    ]
+    return ids, project.state
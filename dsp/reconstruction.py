@@ -0,0 +1,297 @@
+import numpy as np
+
+from dsp.nonuniform import least_squares_reconstruction
+from dsp.precision import compute_dtype
+from dsp.resample import polyphase_reconstruction
+
+# Upper bound, in bytes, for the temporary matrices built while evaluating the
+# sinc sum for one block of output points.
+DEFAULT_MEMORY_BUDGET = 32 * 1024 * 1024
+
+# np.sinc keeps a handful of same-sized temporaries alive while it runs.
+_TEMPORARIES_PER_BLOCK = 4
+
+# Output points closer than this (in sample periods) to a sample take its value.
+_ON_SAMPLE_TOLERANCE = 1e-12
+
+# Up to this many samples the full sinc sum is evaluated directly; past it
+# the far field of the sum is interpolated from FFT convolutions.
+_DIRECT_SUM_SAMPLES = 64
+
+# Chebyshev nodes, in the fractional sample position, at which the far field
+# is convolved. 1 / (j + phi) with |j| >= 1 is resolved to about 1e-11 of
+# the sample magnitudes by 16 of them.
+_FAR_FIELD_NODES = 16
+
+
+def _block_size(n_rows, itemsize, memory_budget):
+    per_column = max(1, n_rows) * itemsize * _TEMPORARIES_PER_BLOCK
+    return max(1, int(memory_budget // per_column))
+
+
+def _sampling_period(sampling_time):
+    if len(sampling_time) < 2:
+        raise ValueError("At least two samples are needed for reconstruction")
+    # The mean spacing, so jittered samples are read as the uniform grid
+    # they were meant to be on.
+    return (sampling_time[-1] - sampling_time[0]) / (len(sampling_time) - 1)
+
+
+def _cauchy_sum(weights, position):
+    # sum_n weights[n] / (position - n) for every position, in float64. The
+    # two samples either side of each point are summed directly. The rest
+    # is smooth in the fractional part phi of the position, so it is
+    # convolved with the samples at a few Chebyshev nodes in phi (one FFT
+    # each) and interpolated barycentrically between them.
+    n_samples = len(weights)
+    base = np.floor(position)
+    phi = position - base
+    base = base.astype(np.intp)
+    first, last = base.min(), base.max()
+    # Kernel offsets j = base - n that any point reaches.
+    offsets = np.arange(first - (n_samples - 1), last + 1, dtype=np.float64)
+    near_field = (offsets == 0) | (offsets == -1)
+    n_fft = 1 << (len(offsets) + n_samples - 2).bit_length()
+    weights_spectrum = np.fft.rfft(weights, n_fft)
+    grid_index = base - first + (n_samples - 1)
+
+    q = np.arange(_FAR_FIELD_NODES)
+    nodes = (1 - np.cos(np.pi * q / (_FAR_FIELD_NODES - 1))) / 2
+    node_weights = (-1.0) ** q
+    node_weights[[0, -1]] /= 2
+    numerator = np.zeros(len(position))
+    denominator = np.zeros(len(position))
+    on_node = np.zeros(len(position), dtype=bool)
+    node_value = np.zeros(len(position))
+    for node, node_weight in zip(nodes, node_weights):
+        with np.errstate(divide="ignore"):
+            kernel = 1 / (offsets + node)
+        kernel[near_field] = 0
+        grid = np.fft.irfft(np.fft.rfft(kernel, n_fft) * weights_spectrum, n_fft)
+        values = grid[grid_index]
+        hit = phi == node
+        with np.errstate(divide="ignore"):
+            ratio = node_weight / (phi - node)
+        ratio[hit] = 0
+        numerator += ratio * values
+        denominator += ratio
+        # Points on a node take the convolution there.
+        node_value[hit] = values[hit]
+        on_node |= hit
+    with np.errstate(invalid="ignore"):
+        total = np.where(on_node, node_value, numerator / denominator)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for step in (0, 1):
+            n = base + step
+            inside = (n >= 0) & (n < n_samples)
+            total[inside] += weights[n[inside]] / (position[inside] - n[inside])
+    return total
+
+
+def _kernel_window(x, half_width, window):
+    if window == "hann":
+        return 0.5 * (1 + np.cos(np.pi * x / half_width))
+    if window == "lanczos":
+        return np.sinc(x / half_width)
+    if window == "boxcar":
+        return np.ones_like(x)
+    raise ValueError(f"Unknown window: {window}")
+
+
+def whittaker_shannon(
+    amplitude,
+    sampling_time,
+    current_time,
+    taps=None,
+    window="hann",
+    memory_budget=DEFAULT_MEMORY_BUDGET,
+):
+    '''
+    Whittaker-Shannon reconstruction of uniformly spaced samples. The full
+    sum over more than a few dozen samples interpolates its far field from
+    FFT convolutions, in O((n + M) log n); shorter sums and the truncated
+    mode are evaluated block by block over the output points so that no
+    temporary grows past the memory budget.
+    Args:
+        amplitude (np.ndarray): Sample values.
+        sampling_time (np.ndarray): Uniformly spaced sample instants.
+        current_time (np.ndarray): Instants at which to evaluate the signal.
+        taps (int): If given, use a windowed sinc kernel of this many taps
+            around each output point (O(taps * M)) instead of the full sum
+            over every sample.
+        window (str): Kernel window for the truncated mode: "hann",
+            "lanczos" or "boxcar".
+        memory_budget (int): Bytes allowed for per-block temporaries of
+            the blockwise evaluation.
+    Returns:
+        np.ndarray: The reconstructed signal at current_time, in the
+            precision of `amplitude`.
+    '''
+    amplitude = np.asarray(amplitude)
+    sampling_time = np.asarray(sampling_time)
+    current_time = np.asarray(current_time)
+    T = _sampling_period(sampling_time)
+    dtype = compute_dtype(amplitude)
+    reconstructed = np.empty(len(current_time), dtype=dtype)
+
+    if taps is None:
+        # sinc(u - n) = (-1)**n * sin(pi * u) / (pi * (u - n)), so the sum becomes
+        # sum_n (-1)**n * amplitude[n] / (u - n), scaled per output point.
+        position = (current_time - sampling_time[0]) / T
+        nearest = np.rint(position)
+        fraction = position - nearest
+        scale = np.sin(np.pi * fraction) / np.pi
+        scale[nearest % 2 == 1] *= -1
+        on_sample = np.abs(fraction) < _ON_SAMPLE_TOLERANCE
+        in_range = on_sample & (nearest >= 0) & (nearest < len(amplitude))
+        span = np.ptp(position) if len(position) else 0
+
+        if len(amplitude) > _DIRECT_SUM_SAMPLES and span <= len(position):
+            # O((n + M) log) instead of O(n * M), computed in float64.
+            signed_amplitude = amplitude.astype(np.float64, copy=True)
+            signed_amplitude[1::2] *= -1
+            with np.errstate(invalid="ignore"):
+                reconstructed[:] = _cauchy_sum(signed_amplitude, position) * scale
+        else:
+            # One reciprocal matrix product per block, with no sine evaluated
+            # inside the (n_samples x block) matrix.
+            scale = scale.astype(dtype, copy=False)
+            signed_amplitude = amplitude.astype(dtype, copy=True)
+            signed_amplitude[1::2] *= -1
+            sample_index = np.arange(len(amplitude), dtype=dtype)[:, np.newaxis]
+            single = dtype != np.float64
+            if single:
+                # position - n rounded to single precision loses the fraction
+                # that matters next to a sample; (nearest - n) is exact, so the
+                # fraction is added to it instead.
+                nearest_row = nearest.astype(dtype)[np.newaxis, :]
+                fraction = fraction.astype(dtype)
+
+            block = _block_size(len(sampling_time), dtype.itemsize, memory_budget)
+            for start in range(0, len(current_time), block):
+                stop = start + block
+                if single:
+                    offsets = np.subtract(nearest_row[:, start:stop], sample_index)
+                    offsets += fraction[start:stop]
+                else:
+                    offsets = position[np.newaxis, start:stop] - sample_index
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    np.reciprocal(offsets, out=offsets)
+                    block_values = signed_amplitude @ offsets
+                    block_values *= scale[start:stop]
+                reconstructed[start:stop] = block_values
+        # Output points that coincide with a sample take its value exactly.
+        reconstructed[on_sample] = 0
+        reconstructed[in_range] = amplitude[nearest[in_range].astype(np.intp)]
+        return reconstructed
+
+    taps = int(taps)
+    if taps < 1:
+        raise ValueError("taps must be a positive integer")
+    half_width = taps / 2
+    tap_offsets = np.arange(taps)
+    block = _block_size(taps, dtype.itemsize, memory_budget)
+    for start in range(0, len(current_time), block):
+        stop = start + block
+        position = (current_time[start:stop] - sampling_time[0]) / T
+        # The taps samples within half_width of each point: for odd taps they
+        # centre on the nearest sample, for even taps they straddle the point.
+        first = np.ceil(position - half_width).astype(np.intp)
+        indices = first[:, np.newaxis] + tap_offsets
+        distance = (position[:, np.newaxis] - indices).astype(dtype, copy=False)
+        kernel = np.sinc(distance) * _kernel_window(distance, half_width, window)
+        kernel[np.abs(distance) >= half_width] = 0
+        valid = (indices >= 0) & (indices < len(amplitude))
+        kernel[~valid] = 0
+        np.clip(indices, 0, len(amplitude) - 1, out=indices)
+        reconstructed[start:stop] = np.einsum("ij,ij->i", kernel, amplitude[indices])
+    return reconstructed
+
+
+def fft_reconstruction(amplitude, sampling_time, current_time, oversample=4):
+    '''
+    Band-limited reconstruction by zero-padding the spectrum of uniformly
+    spaced samples. The samples are treated as one period of a periodic
+    signal, so the cost is O(M log M) in the number of output points.
+    Args:
+        amplitude (np.ndarray): Sample values.
+        sampling_time (np.ndarray): Uniformly spaced sample instants.
+        current_time (np.ndarray): Instants at which to evaluate the signal.
+        oversample (int): Density of the zero-padded grid relative to the
+            output spacing; the output is linearly interpolated from it.
+    Returns:
+        np.ndarray: The reconstructed signal at current_time, in the
+            precision of `amplitude` (the FFTs run in complex64 for float32).
+    '''
+    amplitude = np.asarray(amplitude)
+    dtype = compute_dtype(amplitude)
+    sampling_time = np.asarray(sampling_time)
+    current_time = np.asarray(current_time)
+    T = _sampling_period(sampling_time)
+    n = len(amplitude)
+    period = n * T
+
+    output_step = period / max(1, len(current_time))
+    if len(current_time) > 1:
+        output_step = np.min(np.abs(np.diff(current_time))) or output_step
+    upsample = max(1, int(np.ceil(T / output_step)) * int(oversample))
+    padded_length = n * upsample
+
+    spectrum = np.fft.rfft(amplitude.astype(dtype, copy=False))
+    if n % 2 == 0:
+        # Split the Nyquist bin between the positive and negative halves.
+        spectrum[-1] *= 0.5
+    fine = np.fft.irfft(spectrum, n=padded_length)
+    fine *= upsample
+    fine_time = sampling_time[0] + np.arange(padded_length) * (period / padded_length)
+    return np.interp(current_time, fine_time, fine, period=period).astype(dtype, copy=False)
+
+
+def linear_interpolation(amplitude, sampling_time, current_time):
+    '''
+    Piecewise linear interpolation, extended linearly past both ends, in
+    the precision of `amplitude`.
+    '''
+    amplitude = np.asarray(amplitude)
+    sampling_time = np.asarray(sampling_time)
+    current_time = np.asarray(current_time)
+    # np.interp only computes in float64.
+    reconstructed = np.interp(current_time, sampling_time, amplitude).astype(
+        compute_dtype(amplitude), copy=False
+    )
+    for outside, (i, j) in (
+        (current_time < sampling_time[0], (0, 1)),
+        (current_time > sampling_time[-1], (-2, -1)),
+    ):
+        slope = (amplitude[j] - amplitude[i]) / (sampling_time[j] - sampling_time[i])
+        reconstructed[outside] = amplitude[i] + slope * (current_time[outside] - sampling_time[i])
+    return reconstructed
+
+
+def cubic_interpolation(amplitude, sampling_time, current_time):
+    from scipy.interpolate import CubicSpline
+
+    cubic_interpolator = CubicSpline(sampling_time, amplitude)
+    return cubic_interpolator(current_time).astype(compute_dtype(amplitude), copy=False)
+
+
+METHODS = {
+    "Whittaker-Shannon": whittaker_shannon,
+    "Linear": linear_interpolation,
+    "Cubic": cubic_interpolation,
+    "FFT": fft_reconstruction,
+    "Least Squares": least_squares_reconstruction,
+    "Polyphase": polyphase_reconstruction,
+}
+
+
+def reconstruct(method, amplitude, sampling_time, current_time):
+    '''
+    Reconstruct a signal with one of the methods named in METHODS.
+    '''
+    try:
+        reconstruct_fn = METHODS[method]
+    except KeyError:
+        raise ValueError(f"Unknown reconstruction method: {method}") from None
+    return reconstruct_fn(amplitude, sampling_time, current_time)
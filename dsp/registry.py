@@ -0,0 +1,211 @@
+from itertools import count
+
+import numpy as np
+
+from dsp.cache import content_hash
+from dsp.precision import real_dtype
+
+
+class SignalEntry:
+    '''
+    One signal held by a SignalRegistry. `composite` is set for mixed
+    signals and `recording` (with the `window` shown) for uploaded ones.
+    Entries added with a `loader` hold no arrays until they are first
+    looked up in the registry.
+    '''
+
+    __slots__ = (
+        "id",
+        "name",
+        "data",
+        "duration",
+        "fs",
+        "composite",
+        "recording",
+        "window",
+        "noisy",
+        "loader",
+        "_hash",
+    )
+
+    def __init__(self, signal_id, name, data, duration, fs, composite, recording, loader=None):
+        self.id = signal_id
+        self.name = name
+        self.data = data
+        self.duration = duration
+        self.fs = fs
+        self.composite = composite
+        self.recording = recording
+        self.window = None
+        self.noisy = None
+        self.loader = loader
+        self._hash = None
+
+    @property
+    def signal_hash(self):
+        if self._hash is None:
+            self._hash = content_hash(self.data)
+        return self._hash
+
+    @property
+    def hashed(self):
+        return self._hash is not None
+
+    @property
+    def nbytes(self):
+        '''
+        Bytes of memory held by the entry. Data still backed by a
+        memory-mapped file, or not loaded yet, is not counted.
+        '''
+        if self.loader is not None:
+            return 0
+        total = 0
+        for array in (self.data, self.noisy):
+            if array is not None and not isinstance(array, np.memmap):
+                total += array.nbytes
+        if self.composite is not None:
+            total += self.composite.components.nbytes
+            if self.composite.data is not self.data and not isinstance(
+                self.composite.data, np.memmap
+            ):
+                total += self.composite.data.nbytes
+        return total
+
+
+class SignalRegistry:
+    '''
+    Signals of a session under stable integer IDs. IDs are never reused,
+    so list widgets and caches can refer to a signal without depending on
+    its display name.
+
+    Signal data is stored as `dtype`, by default the precision set in
+    dsp.precision; float32 halves the memory of long signals at the cost
+    of precision.
+
+    Iterating yields entries as they are, including ones not loaded yet;
+    `registry[id]` and `registry.get(id)` load an entry first.
+    '''
+
+    def __init__(self, dtype=None):
+        self.dtype = real_dtype() if dtype is None else np.dtype(dtype)
+        self.entries = {}
+        self._ids = count(1)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, signal_id):
+        return signal_id in self.entries
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    def __getitem__(self, signal_id):
+        return self._load(self.entries[signal_id])
+
+    def get(self, signal_id):
+        entry = self.entries.get(signal_id)
+        return entry if entry is None else self._load(entry)
+
+    def add(self, name, data, duration, fs=None, composite=None, recording=None, loader=None):
+        '''
+        Register a signal.
+        Args:
+            name (str): Name shown in the UI; does not need to be unique.
+            data (np.ndarray): Signal samples.
+            duration (float): Duration of the signal in seconds.
+            fs (float): Sampling frequency of `data`.
+            composite (CompositeSignal): Components of a mixed signal.
+            recording (Recording): Source of an uploaded signal.
+            loader (callable): Called without arguments on first access to
+                provide the entry's arrays, as a dict of SignalEntry fields
+                (`data` and optionally `composite`, `recording`, `window`).
+                `data` is ignored when a loader is given.
+        Returns:
+            int: ID of the new entry.
+        '''
+        signal_id = next(self._ids)
+        if loader is not None:
+            data = None
+        else:
+            data = self._store(data)
+        self.entries[signal_id] = SignalEntry(
+            signal_id, name, data, duration, fs, composite, recording, loader
+        )
+        return signal_id
+
+    def remove(self, signal_id):
+        return self.entries.pop(signal_id, None)
+
+    def set_data(self, signal_id, data, duration=None):
+        '''
+        Replace the samples of a signal, dropping its noisy variant.
+        Returns:
+            str: Content hash of the previous data, or None if it was never
+                hashed, so callers can invalidate what they cached for it.
+        '''
+        entry = self.entries[signal_id]
+        old_hash = entry._hash
+        entry.data = self._store(data)
+        entry.noisy = None
+        entry._hash = None
+        if duration is not None:
+            entry.duration = duration
+        return old_hash
+
+    def set_dtype(self, dtype):
+        '''
+        Store every loaded signal as `dtype` from now on. Mixed signals are
+        synthesized again in the new precision rather than cast, and noisy
+        variants are dropped.
+        Returns:
+            list: Content hashes of the previous data of the converted
+                signals that were hashed, to invalidate what was cached.
+        '''
+        dtype = np.dtype(dtype)
+        old_hashes = []
+        if dtype == self.dtype:
+            return old_hashes
+        self.dtype = dtype
+        for entry in self.entries.values():
+            if entry.loader is not None:
+                continue
+            if entry.composite is not None:
+                entry.composite.resynthesize(dtype)
+                data = entry.composite.data
+            else:
+                data = entry.data
+            old_hash = self.set_data(entry.id, data)
+            if old_hash is not None:
+                old_hashes.append(old_hash)
+        return old_hashes
+
+    def signal_hash(self, signal_id):
+        return self[signal_id].signal_hash
+
+    def memory_report(self):
+        '''
+        Returns:
+            list: (id, name, nbytes) for every signal, in insertion order.
+        '''
+        return [(entry.id, entry.name, entry.nbytes) for entry in self]
+
+    @property
+    def nbytes(self):
+        return sum(entry.nbytes for entry in self)
+
+    def _load(self, entry):
+        if entry.loader is not None:
+            fields = entry.loader()
+            entry.loader = None
+            for field, value in fields.items():
+                setattr(entry, field, value)
+            entry.data = self._store(entry.data)
+        return entry
+
+    def _store(self, data):
+        # Memory maps are kept as such so they are not counted as held.
+        data = np.asanyarray(data)
+        if data.dtype != self.dtype:
+            data = np.asarray(data).astype(self.dtype)
+        return data
@@ -0,0 +1,236 @@
+'''
+Rational resampling with polyphase FIR filters.
+
+Resampling by up/down conceptually inserts up - 1 zeros between samples,
+low-pass filters and keeps every down-th point. The polyphase form skips
+the zeros and the discarded points: every output is the dot product of
+one branch h[phase::up] of the filter with the latest inputs. The filter
+is a Kaiser-windowed sinc like scipy.signal.resample_poly uses, and the
+output is aligned the same way.
+'''
+
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Half-length of the default filter in units of the larger rate factor,
+# and the Kaiser window shape (as in scipy.signal.resample_poly).
+FILTER_HALF_LENGTH = 10
+KAISER_BETA = 5.0
+
+# Relative error allowed when approximating a resampling ratio by up/down.
+# Simpler ratios have smaller factors and so shorter filters.
+RATIO_TOLERANCE = 1e-4
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Upper bound on the elements of the (outputs x taps) block gathered at once.
+_BLOCK_ELEMENTS = 1 << 20
+
+
+def rational_ratio(ratio, tolerance=RATIO_TOLERANCE):
+    '''
+    Simplest up/down within a relative `tolerance` of `ratio`.
+    Returns:
+        tuple: (up, down)
+    '''
+    if not ratio > 0:
+        raise ValueError("The resampling ratio must be positive")
+    exact = Fraction(ratio)
+    max_denominator = 1
+    while True:
+        fraction = exact.limit_denominator(max_denominator)
+        if fraction and abs(fraction - exact) <= tolerance * exact:
+            return fraction.numerator, fraction.denominator
+        max_denominator *= 2
+
+
+@lru_cache(maxsize=32)
+def design_filter(up, down, taps=None, anti_alias=True):
+    '''
+    Low-pass FIR filter for resampling by up/down, with a gain of `up` to
+    make up for the inserted zeros. Designs are cached; the returned array
+    is read-only.
+    Args:
+        up (int): Upsampling factor.
+        down (int): Downsampling factor.
+        taps (int): Filter length; defaults to 20 * max(up, down) + 1.
+        anti_alias (bool): Cut off at the lower of the two Nyquist
+            frequencies. Without it only the images of upsampling are
+            removed and decimation aliases, like picking points does.
+    '''
+    max_rate = max(up, down) if anti_alias else up
+    if max_rate == 1:
+        h = np.ones(1)
+    else:
+        if taps is None:
+            taps = 2 * FILTER_HALF_LENGTH * max_rate + 1
+        # scipy.signal.firwin(taps, 1 / max_rate, window=("kaiser", beta)),
+        # without importing scipy.signal: a windowed sinc scaled to unit DC gain.
+        cutoff = 1 / max_rate
+        h = cutoff * np.sinc(cutoff * (np.arange(taps) - (taps - 1) / 2))
+        h *= np.kaiser(taps, KAISER_BETA)
+        h *= up / h.sum()
+    h.setflags(write=False)
+    return h
+
+
+class StreamingResampler:
+    '''
+    Polyphase resampler fed one chunk at a time. The outputs of all chunks
+    followed by `flush()` equal resample_poly over the whole signal; only
+    the last few inputs are kept between chunks.
+    '''
+
+    def __init__(self, up, down, taps=None, anti_alias=True):
+        divisor = gcd(up, down)
+        self.up = up // divisor
+        self.down = down // divisor
+        h = design_filter(self.up, self.down, taps, anti_alias)
+        # The output is delayed by half the filter, so output m is centred
+        # on input m * down / up.
+        self.half_length = (len(h) - 1) // 2
+        self.branch_length = -(-len(h) // self.up)
+        padded = np.zeros(self.branch_length * self.up)
+        padded[: len(h)] = h
+        # Row `phase` holds h[phase::up] newest-input last, matching the
+        # order of a sliding window over the inputs.
+        self.branches = padded.reshape(self.branch_length, self.up).T[:, ::-1].copy()
+        self.reset()
+
+    def reset(self):
+        # Inputs before the first one are zeros, as in resample_poly.
+        self.history = np.zeros(self.branch_length - 1)
+        self.received = 0
+        self.emitted = 0
+
+    @property
+    def output_length(self):
+        '''
+        Number of outputs the inputs received so far resample to.
+        '''
+        return -(-self.received * self.up // self.down)
+
+    def process(self, chunk):
+        '''
+        Returns:
+            np.ndarray: The outputs that depend only on inputs received so
+                far; the rest follow with later chunks or `flush()`.
+        '''
+        chunk = np.asarray(chunk, dtype=float)
+        first_index = self.received
+        self.received += len(chunk)
+        last_input = self.received * self.up - 1 - self.half_length
+        ready = last_input // self.down + 1 if last_input >= 0 else 0
+        return self._emit(chunk, first_index, min(ready, self.output_length))
+
+    def flush(self):
+        '''
+        End the stream; call reset() before feeding another one.
+        Returns:
+            np.ndarray: The remaining outputs, computed with zeros past the
+                last input.
+        '''
+        total = self.output_length
+        if self.emitted >= total:
+            return np.empty(0)
+        last_needed = ((total - 1) * self.down + self.half_length) // self.up
+        padding = np.zeros(max(0, last_needed - self.received + 1))
+        return self._emit(padding, self.received, total)
+
+    def _emit(self, new_inputs, first_index, stop):
+        # Compute outputs emitted ... stop - 1 from the kept history and the
+        # new inputs, which start at input index `first_index`.
+        buffer = np.concatenate((self.history, new_inputs))
+        origin = first_index - len(self.history)
+        if stop <= self.emitted:
+            outputs = np.empty(0)
+        else:
+            windows = sliding_window_view(buffer, self.branch_length)
+            outputs = np.empty(stop - self.emitted)
+            block = max(1, _BLOCK_ELEMENTS // self.branch_length)
+            for start in range(self.emitted, stop, block):
+                m = np.arange(start, min(start + block, stop))
+                position = m * self.down + self.half_length
+                newest = position // self.up
+                rows = windows[newest - origin - (self.branch_length - 1)]
+                outputs[start - self.emitted:m[-1] + 1 - self.emitted] = np.einsum(
+                    "ij,ij->i", rows, self.branches[position % self.up]
+                )
+            self.emitted = stop
+        keep = self.branch_length - 1
+        self.history = buffer[len(buffer) - keep:] if keep else buffer[:0]
+        return outputs
+
+
+def resample_poly(x, up, down, taps=None, anti_alias=True, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    Resample `x` by up/down with a polyphase FIR filter, processing it in
+    chunks so long signals need no filter-sized temporaries.
+    Returns:
+        np.ndarray: ceil(len(x) * up / down) samples.
+    '''
+    # Chunks are converted to float64 one at a time by process().
+    x = np.asarray(x)
+    resampler = StreamingResampler(up, down, taps, anti_alias)
+    parts = [resampler.process(x[start:start + chunk_size]) for start in range(0, len(x), chunk_size)]
+    parts.append(resampler.flush())
+    return np.concatenate(parts)
+
+
+def _spacing(t):
+    if len(t) < 2:
+        raise ValueError("At least two samples are needed for resampling")
+    return (t[-1] - t[0]) / (len(t) - 1)
+
+
+def sample_polyphase(
+    signal_t, signal_data, sampling_frequency, duration, anti_alias=True, taps=None
+):
+    '''
+    Sample a densely sampled signal by resampling it to the sampling rate
+    (to within RATIO_TOLERANCE), rather than by picking points. With
+    anti_alias, content above the new Nyquist frequency is filtered out
+    before decimating.
+    Args:
+        signal_t (np.ndarray): Uniform time axis of the signal.
+        signal_data (np.ndarray): Signal values.
+        sampling_frequency (float): Sampling rate in Hz.
+        duration (float): Length of the sampled span in seconds.
+        anti_alias (bool): Low-pass filter before decimating.
+        taps (int): Filter length; see design_filter.
+    Returns:
+        tuple: (sampling_amplitudes, sampling_times)
+    '''
+    period = _spacing(signal_t)
+    up, down = rational_ratio(sampling_frequency * period)
+    amplitudes = resample_poly(signal_data, up, down, taps, anti_alias)
+    times = signal_t[0] + np.arange(len(amplitudes)) * (period * down / up)
+    keep = times < signal_t[0] + duration
+    return amplitudes[keep], times[keep]
+
+
+def polyphase_reconstruction(amplitude, sampling_time, current_time, taps=None):
+    '''
+    Reconstruction of uniformly spaced samples by polyphase interpolation
+    up to the output spacing; the output is linearly interpolated from the
+    resampled points, which sit on a grid of nearly the same spacing.
+    Args:
+        amplitude (np.ndarray): Sample values.
+        sampling_time (np.ndarray): Uniformly spaced sample instants.
+        current_time (np.ndarray): Uniformly spaced output instants.
+        taps (int): Interpolation filter length; see design_filter.
+    Returns:
+        np.ndarray: The reconstructed signal at current_time.
+    '''
+    sampling_time = np.asarray(sampling_time)
+    current_time = np.asarray(current_time)
+    period = _spacing(sampling_time)
+    output_step = _spacing(current_time) if len(current_time) > 1 else period
+    up, down = rational_ratio(period / output_step)
+    resampled = resample_poly(amplitude, up, down, taps)
+    resampled_time = sampling_time[0] + np.arange(len(resampled)) * (period * down / up)
+    return np.interp(current_time, resampled_time, resampled)
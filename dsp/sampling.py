@@ -0,0 +1,68 @@
+import numpy as np
+
+from dsp.precision import compute_dtype
+
+
+def _interpolate(sampling_times, signal_t, signal_data):
+    # np.interp always returns float64; keep the precision of the signal.
+    values = np.interp(sampling_times, signal_t, signal_data)
+    return values.astype(compute_dtype(signal_data), copy=False)
+
+
+def sample_uniform(signal_t, signal_data, sampling_frequency, duration):
+    '''
+    Pick samples off a densely sampled signal on a uniform grid.
+    Args:
+        signal_t (np.ndarray): Time axis of the signal.
+        signal_data (np.ndarray): Signal values.
+        sampling_frequency (float): Sampling rate in Hz.
+        duration (float): Length of the sampled span in seconds.
+    Returns:
+        tuple: (sampling_amplitudes, sampling_times)
+    '''
+    sampling_times = np.arange(0, duration, 1 / sampling_frequency)
+    sampling_amplitudes = _interpolate(sampling_times, signal_t, signal_data)
+    return sampling_amplitudes, sampling_times
+
+
+def sample_jittered(signal_t, signal_data, sampling_frequency, duration, jitter=0.1, rng=None):
+    '''
+    Uniform sampling with a jittered clock: every instant of the uniform
+    grid is displaced by Gaussian noise.
+    Args:
+        signal_t (np.ndarray): Time axis of the signal.
+        signal_data (np.ndarray): Signal values.
+        sampling_frequency (float): Nominal sampling rate in Hz.
+        duration (float): Length of the sampled span in seconds.
+        jitter (float): Standard deviation of the displacement, as a
+            fraction of the sampling period.
+        rng (np.random.Generator | int): Random generator or seed.
+    Returns:
+        tuple: (sampling_amplitudes, sampling_times), sorted by time.
+    '''
+    rng = np.random.default_rng(rng)
+    nominal = np.arange(0, duration, 1 / sampling_frequency)
+    offsets = rng.normal(0, jitter / sampling_frequency, len(nominal))
+    sampling_times = np.sort(np.clip(nominal + offsets, 0, duration))
+    sampling_amplitudes = _interpolate(sampling_times, signal_t, signal_data)
+    return sampling_amplitudes, sampling_times
+
+
+def sample_random(signal_t, signal_data, sampling_frequency, duration, rng=None):
+    '''
+    Sampling at independent, uniformly distributed instants with an
+    average rate of `sampling_frequency`.
+    Args:
+        signal_t (np.ndarray): Time axis of the signal.
+        signal_data (np.ndarray): Signal values.
+        sampling_frequency (float): Average sampling rate in Hz.
+        duration (float): Length of the sampled span in seconds.
+        rng (np.random.Generator | int): Random generator or seed.
+    Returns:
+        tuple: (sampling_amplitudes, sampling_times), sorted by time.
+    '''
+    rng = np.random.default_rng(rng)
+    count = len(np.arange(0, duration, 1 / sampling_frequency))
+    sampling_times = np.sort(rng.uniform(0, duration, count))
+    sampling_amplitudes = _interpolate(sampling_times, signal_t, signal_data)
+    return sampling_amplitudes, sampling_times
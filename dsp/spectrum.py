@@ -0,0 +1,241 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from dsp.precision import compute_dtype
+
+WINDOWS = {
+    "boxcar": np.ones,
+    "hann": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+}
+
+
+@lru_cache(maxsize=64)
+def frequency_axis(n, dt):
+    '''
+    Read-only rfft frequency axis for `n` points spaced `dt` apart.
+    '''
+    frequencies = np.fft.rfftfreq(n, d=dt)
+    frequencies.flags.writeable = False
+    return frequencies
+
+
+@lru_cache(maxsize=64)
+def window_array(name, n, dtype=np.float64):
+    try:
+        window = WINDOWS[name](n).astype(dtype, copy=False)
+    except KeyError:
+        raise ValueError(f"Unknown window: {name}") from None
+    window.flags.writeable = False
+    return window
+
+
+class SpectrumEngine:
+    '''
+    Single-sided magnitude spectra from real FFTs.
+
+    Frequency axes and windows are cached per size, the windowed input is
+    written into a per-thread scratch buffer that is reused across calls,
+    and spectra requested with a `key` are memoized so a signal's spectrum
+    is computed once however many consumers ask for it.
+    '''
+
+    def __init__(self, max_cached=32):
+        self.max_cached = max_cached
+        self.cached = OrderedDict()
+        self.lock = threading.Lock()
+        self.scratch = threading.local()
+
+    def _windowed(self, signal, window):
+        if window == "boxcar":
+            return signal
+        buffers = getattr(self.scratch, "buffers", None)
+        if buffers is None:
+            buffers = self.scratch.buffers = {}
+        key = (len(signal), compute_dtype(signal))
+        buffer = buffers.get(key)
+        if buffer is None:
+            buffer = buffers[key] = np.empty(key[0], dtype=key[1])
+        return np.multiply(signal, window_array(window, *key), out=buffer)
+
+    def spectrum(self, signal, dt, window="boxcar", segment=None, key=None):
+        '''
+        Args:
+            signal (np.ndarray): Real signal.
+            dt (float): Sample spacing in seconds.
+            window (str): One of WINDOWS.
+            segment (int): If given, Welch-average the spectra of segments of
+                this length with 50% overlap.
+            key (hashable): Memoize the result under this key.
+        Returns:
+            tuple: (frequencies, magnitudes), scaled so a sinusoid of
+                amplitude A shows a peak of height A.
+        '''
+        if key is not None:
+            cache_key = (key, dt, window, segment)
+            result = self._recall(cache_key)
+            if result is not None:
+                return result
+
+        signal = np.asarray(signal)
+        if segment is not None and segment < len(signal):
+            result = self._welch(signal, dt, window, int(segment))
+        else:
+            n = len(signal)
+            magnitude = np.abs(np.fft.rfft(self._windowed(signal, window)))
+            magnitude *= 2 / window_array(window, n).sum()
+            result = (frequency_axis(n, dt), magnitude)
+
+        if key is not None:
+            self._remember(cache_key, result)
+        return result
+
+    def _recall(self, cache_key):
+        with self.lock:
+            if cache_key in self.cached:
+                self.cached.move_to_end(cache_key)
+                return self.cached[cache_key]
+        return None
+
+    def _remember(self, cache_key, value):
+        with self.lock:
+            self.cached[cache_key] = value
+            while len(self.cached) > self.max_cached:
+                self.cached.popitem(last=False)
+
+    def _welch(self, signal, dt, window, segment):
+        step = max(1, segment // 2)
+        segments = np.lib.stride_tricks.sliding_window_view(signal, segment)[::step]
+        taper = window_array(window, segment, compute_dtype(signal))
+        power = np.square(np.abs(np.fft.rfft(segments * taper, axis=-1))).mean(axis=0)
+        magnitude = np.sqrt(power, out=power)
+        magnitude *= 2 / taper.sum()
+        return frequency_axis(segment, dt), magnitude
+
+    def occupied_bandwidth(self, signal, fs, fraction=0.99, key=None):
+        '''
+        occupied_bandwidth read from the signal's Welch power spectrum, which
+        is memoized under `key` alongside the magnitude spectra, so every
+        fraction is answered from one pass over the signal.
+        '''
+        if key is None:
+            return occupied_bandwidth(signal, fs, fraction)
+        cache_key = (key, "power", fs)
+        power = self._recall(cache_key)
+        if power is None:
+            power = welch_power(signal, fs)
+            self._remember(cache_key, power)
+        return _bandwidth_from_power(*power, fraction)
+
+    def forget(self, key):
+        with self.lock:
+            for cache_key in [k for k in self.cached if k[0] == key]:
+                del self.cached[cache_key]
+
+
+class BandwidthEstimator:
+    '''
+    Occupied bandwidth from a running Welch PSD: the frequency below which
+    `fraction` of the signal power (DC excluded) lies. Chunks of a long
+    recording can be fed one at a time; only one segment of history is
+    kept between calls.
+    '''
+
+    def __init__(self, fs, segment=1024, fraction=0.99, window="hann"):
+        self.fs = fs
+        self.segment = int(segment)
+        self.fraction = fraction
+        self.window = window
+        self.power = np.zeros(self.segment // 2 + 1)
+        self.segments = 0
+        self.tail = np.empty(0)
+
+    def update(self, chunk):
+        data = np.concatenate((self.tail, np.asarray(chunk, dtype=float)))
+        step = max(1, self.segment // 2)
+        if len(data) < self.segment:
+            self.tail = data
+            return
+        segments = np.lib.stride_tricks.sliding_window_view(data, self.segment)[::step]
+        segments = segments - segments.mean(axis=1, keepdims=True)
+        taper = window_array(self.window, self.segment)
+        self.power += np.square(np.abs(np.fft.rfft(segments * taper, axis=-1))).sum(axis=0)
+        self.segments += len(segments)
+        self.tail = data[len(segments) * step:]
+
+    def power_spectrum(self):
+        '''
+        Returns:
+            tuple: (frequencies, power) summed over the segments so far.
+        '''
+        return frequency_axis(self.segment, 1 / self.fs), self.power
+
+    def bandwidth(self):
+        '''
+        Returns:
+            float: Occupied bandwidth in Hz, or 0 before any full segment.
+        '''
+        return _bandwidth_from_power(*self.power_spectrum(), self.fraction)
+
+
+def _bandwidth_from_power(frequencies, power, fraction):
+    cumulative = np.cumsum(power[1:])
+    if not len(cumulative) or cumulative[-1] <= 0:
+        return 0.0
+    target = fraction * cumulative[-1]
+    index = int(np.searchsorted(cumulative, target))
+    # Interpolate linearly inside the bin where the target is crossed;
+    # cumulative starts at bin 1, so that is bin index + 1.
+    below = cumulative[index - 1] if index > 0 else 0.0
+    share = (target - below) / (cumulative[index] - below)
+    bin_width = frequencies[1] - frequencies[0]
+    return float(frequencies[index + 1] + (share - 0.5) * bin_width)
+
+
+def welch_power(signal, fs, segment=1024, chunk=1 << 20):
+    '''
+    Welch power spectrum of a whole signal as BandwidthEstimator builds it,
+    processed `chunk` samples at a time so memory-mapped recordings are
+    never loaded in full.
+    Returns:
+        tuple: (frequencies, power)
+    '''
+    segment = min(int(segment), len(signal))
+    estimator = BandwidthEstimator(fs, segment=segment)
+    for start in range(0, len(signal), chunk):
+        estimator.update(signal[start:start + chunk])
+    frequencies, power = estimator.power_spectrum()
+    power.flags.writeable = False
+    return frequencies, power
+
+
+def occupied_bandwidth(signal, fs, fraction=0.99, segment=1024, chunk=1 << 20):
+    '''
+    Occupied bandwidth of a whole signal; see welch_power.
+    '''
+    return _bandwidth_from_power(*welch_power(signal, fs, segment, chunk), fraction)
+
+
+default_engine = SpectrumEngine()
+
+
+def magnitude_spectrum(signal, dt, window="boxcar", segment=None):
+    '''
+    Single-sided magnitude spectrum from the shared engine.
+    Returns:
+        tuple: (frequencies, magnitudes)
+    '''
+    return default_engine.spectrum(signal, dt, window=window, segment=segment)
+
+
+def dominant_frequency(signal, fs, key=None):
+    '''
+    Frequency of the strongest FFT bin. Pass `key` to share the spectrum
+    with other consumers of the same signal.
+    '''
+    frequencies, magnitude = default_engine.spectrum(signal, 1 / fs, key=key)
+    return frequencies[np.argmax(magnitude)]
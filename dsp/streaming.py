@@ -0,0 +1,349 @@
+'''
+Continuous sampling and reconstruction of a live sample stream.
+
+Sources deliver (t, values) chunks as they arrive; StreamingReconstructor
+samples them at a chosen rate and reconstructs them with a windowed sinc,
+overlap-save style, so the work per chunk is independent of how long the
+stream has been running. A recording can be replayed over UDP with
+
+    python -m dsp.streaming Data/signal.csv --port 5005
+'''
+
+import argparse
+import socket
+import time
+from collections import deque
+
+import numpy as np
+
+from dsp.io import Recording
+from dsp.reconstruction import whittaker_shannon
+
+DEFAULT_PORT = 5005
+
+# Largest UDP payload accepted by SocketSource.
+_DATAGRAM_BYTES = 65507
+
+
+class RingBuffer:
+    '''
+    Fixed-capacity buffer keeping the most recent samples of a stream.
+    Every value is written twice, `capacity` apart, so the latest samples
+    are always available as one contiguous view without copying.
+    '''
+
+    def __init__(self, capacity, dtype=np.float64):
+        self.capacity = int(capacity)
+        if self.capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+        self.buffer = np.zeros(2 * self.capacity, dtype=dtype)
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def extend(self, values):
+        values = np.asarray(values)
+        self.count += len(values)
+        skipped = max(0, len(values) - self.capacity)
+        values = values[skipped:]
+        self.head = (self.head + skipped) % self.capacity
+        first = min(len(values), self.capacity - self.head)
+        for offset in (0, self.capacity):
+            start = offset + self.head
+            self.buffer[start:start + first] = values[:first]
+            self.buffer[offset:offset + len(values) - first] = values[first:]
+        self.head = (self.head + len(values)) % self.capacity
+
+    def latest(self, n=None):
+        '''
+        The last `n` values (all held values by default), oldest first. The
+        view is overwritten by later writes; copy it to keep it.
+        '''
+        n = len(self) if n is None else min(int(n), len(self))
+        end = self.head + self.capacity
+        return self.buffer[end - n:end]
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+
+class StreamOutput:
+    '''
+    Result of feeding one chunk to a StreamingReconstructor.
+
+    Attributes:
+        sample_times, samples: Samples taken from the chunk.
+        t, original, reconstructed: Stream points whose reconstruction
+            became final with this chunk, and their input values.
+        latency: Seconds between the arrival of the oldest of these points
+            and the end of processing, or None if none were emitted.
+    '''
+
+    __slots__ = ("sample_times", "samples", "t", "original", "reconstructed", "latency")
+
+    def __init__(self, sample_times, samples, t, original, reconstructed, latency):
+        self.sample_times = sample_times
+        self.samples = samples
+        self.t = t
+        self.original = original
+        self.reconstructed = reconstructed
+        self.latency = latency
+
+
+class StreamingReconstructor:
+    '''
+    Samples a stream at `sampling_frequency` and reconstructs it at the
+    stream's own time points with a `taps`-long windowed sinc.
+
+    Each chunk of new samples is processed together with the last `taps`
+    samples of the previous one, and only points whose whole kernel is
+    covered are emitted (overlap-save), so the cost per chunk depends only
+    on its length. Output trails input by taps / 2 sampling periods.
+    '''
+
+    def __init__(self, sampling_frequency, taps=32, window="hann", clock=time.perf_counter):
+        taps = int(taps)
+        if taps < 2 or taps % 2:
+            raise ValueError("taps must be an even integer of at least 2")
+        self.sampling_frequency = float(sampling_frequency)
+        self.taps = taps
+        self.window = window
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.next_sample = 0
+        self.last_input = None
+        self.history = np.empty(0)
+        self.history_start = 0
+        self.pending_t = np.empty(0)
+        self.pending_x = np.empty(0)
+        self.pending_arrival = np.empty(0)
+
+    @property
+    def delay(self):
+        '''
+        Stream time between a point arriving and its reconstruction being
+        final.
+        '''
+        return self.taps / 2 / self.sampling_frequency
+
+    def process(self, t, values, arrival=None):
+        '''
+        Feed a chunk of the stream.
+        Args:
+            t (np.ndarray): Increasing stream times of the chunk, in seconds.
+            values (np.ndarray): Stream values at t.
+            arrival (float): Clock time at which the chunk arrived; defaults
+                to now.
+        Returns:
+            StreamOutput: Samples taken and points reconstructed.
+        '''
+        if arrival is None:
+            arrival = self.clock()
+        t = np.asarray(t, dtype=float)
+        values = np.asarray(values, dtype=float)
+        period = 1 / self.sampling_frequency
+
+        # Sample instants k * period reached by this chunk, interpolated
+        # across the boundary with the previous chunk.
+        last_sample = int(np.floor(t[-1] * self.sampling_frequency)) if len(t) else -1
+        indices = np.arange(self.next_sample, last_sample + 1)
+        if self.last_input is not None:
+            known_t = np.concatenate(([self.last_input[0]], t))
+            known_x = np.concatenate(([self.last_input[1]], values))
+        else:
+            known_t, known_x = t, values
+            indices = indices[indices * period >= t[0]] if len(t) else indices
+        sample_times = indices * period
+        samples = np.interp(sample_times, known_t, known_x) if len(known_t) else sample_times
+        if len(t):
+            self.last_input = (t[-1], values[-1])
+        if len(indices):
+            if not len(self.history):
+                self.history_start = indices[0]
+            self.next_sample = indices[-1] + 1
+
+        self.pending_t = np.concatenate((self.pending_t, t))
+        self.pending_x = np.concatenate((self.pending_x, values))
+        self.pending_arrival = np.concatenate(
+            (self.pending_arrival, np.full(len(t), arrival))
+        )
+
+        segment = np.concatenate((self.history, samples))
+        segment_start = self.history_start
+        settled = (segment_start + len(segment) - 1 - self.taps // 2) * period
+        ready = np.searchsorted(self.pending_t, settled, side="right")
+        if len(segment) >= 2 and ready:
+            out_t = self.pending_t[:ready]
+            segment_times = (segment_start + np.arange(len(segment))) * period
+            reconstructed = whittaker_shannon(
+                segment, segment_times, out_t, taps=self.taps, window=self.window
+            )
+            original = self.pending_x[:ready]
+            latency = self.clock() - self.pending_arrival[0]
+            self.pending_t = self.pending_t[ready:]
+            self.pending_x = self.pending_x[ready:]
+            self.pending_arrival = self.pending_arrival[ready:]
+        else:
+            out_t = original = reconstructed = np.empty(0)
+            latency = None
+
+        keep = min(len(segment), self.taps)
+        self.history = segment[len(segment) - keep:]
+        self.history_start = segment_start + len(segment) - keep
+        return StreamOutput(sample_times, samples, out_t, original, reconstructed, latency)
+
+
+class StreamStats:
+    '''
+    Rolling throughput and latency of a stream, over the last `span`
+    seconds of clock time.
+    '''
+
+    def __init__(self, span=1.0, clock=time.perf_counter):
+        self.span = span
+        self.clock = clock
+        self.events = deque()
+        self.latencies = deque()
+
+    def record(self, n_samples, latency=None):
+        now = self.clock()
+        self.events.append((now, n_samples))
+        if latency is not None:
+            self.latencies.append((now, latency))
+        for events in (self.events, self.latencies):
+            while events and events[0][0] < now - self.span:
+                events.popleft()
+
+    @property
+    def throughput(self):
+        '''
+        Samples per second over the span.
+        '''
+        if not self.events:
+            return 0.0
+        elapsed = max(self.clock() - self.events[0][0], 1e-3)
+        return sum(n for _, n in self.events) / max(elapsed, self.span)
+
+    @property
+    def latency(self):
+        '''
+        Median end-to-end latency in seconds over the span.
+        '''
+        if not self.latencies:
+            return None
+        return float(np.median([latency for _, latency in self.latencies]))
+
+
+class CsvReplaySource:
+    '''
+    Replays a recording in real time, standing in for an acquisition
+    device. Each read returns the samples that would have arrived since the
+    previous one.
+    '''
+
+    def __init__(self, path, speed=1.0, loop=True, max_chunk=None, clock=time.perf_counter):
+        '''
+        Args:
+            path (str): Recording accepted by dsp.io.Recording.
+            speed (float): Replay speed relative to real time.
+            loop (bool): Start over at the end instead of stopping.
+            max_chunk (int): Most samples returned by one read; one second
+                of the recording by default.
+        '''
+        self.recording = Recording(path)
+        self.fs = self.recording.fs
+        self.speed = speed
+        self.loop = loop
+        self.max_chunk = max_chunk or max(1, int(self.fs))
+        self.clock = clock
+        self.started = None
+        self.position = 0
+
+    def read(self):
+        '''
+        Returns:
+            tuple: (t, values) with t counted from the start of the replay.
+        '''
+        if self.started is None:
+            self.started = self.clock()
+        due = int((self.clock() - self.started) * self.fs * self.speed)
+        if not self.loop:
+            due = min(due, len(self.recording))
+        stop = min(due, self.position + self.max_chunk)
+        indices = np.arange(self.position, stop)
+        self.position = stop
+        values = np.asarray(self.recording.data[indices % len(self.recording)])
+        return indices / self.fs, values
+
+    def close(self):
+        pass
+
+
+class SocketSource:
+    '''
+    Samples received as UDP datagrams of consecutive little-endian float32
+    values at a known rate. Times are counted from the first sample.
+    '''
+
+    def __init__(self, port=DEFAULT_PORT, sample_rate=1000, host="127.0.0.1"):
+        self.fs = float(sample_rate)
+        self.position = 0
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.setblocking(False)
+
+    def read(self):
+        '''
+        Returns:
+            tuple: (t, values) for every datagram waiting on the socket.
+        '''
+        chunks = []
+        while True:
+            try:
+                payload = self.socket.recv(_DATAGRAM_BYTES)
+            except BlockingIOError:
+                break
+            chunks.append(np.frombuffer(payload[: len(payload) // 4 * 4], dtype="<f4"))
+        values = np.concatenate(chunks).astype(float) if chunks else np.empty(0)
+        t = (self.position + np.arange(len(values))) / self.fs
+        self.position += len(values)
+        return t, values
+
+    def close(self):
+        self.socket.close()
+
+
+def send_recording(path, port=DEFAULT_PORT, host="127.0.0.1", speed=1.0, chunk=256, loop=False):
+    '''
+    Stream a recording to a SocketSource in real time.
+    '''
+    source = CsvReplaySource(path, speed=speed, loop=loop, max_chunk=chunk)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+        while loop or source.position < len(source.recording):
+            _, values = source.read()
+            if len(values):
+                sender.sendto(values.astype("<f4").tobytes(), (host, port))
+            time.sleep(chunk / source.fs / speed / 4)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recording over UDP.")
+    parser.add_argument("path", help="CSV or text recording to replay")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed")
+    parser.add_argument("--chunk", type=int, default=256, help="samples per datagram")
+    parser.add_argument("--loop", action="store_true", help="repeat the recording")
+    args = parser.parse_args(argv)
+    fs = Recording(args.path).fs
+    print(f"Streaming {args.path} at {fs:g} Hz to {args.host}:{args.port}")
+    send_recording(args.path, args.port, args.host, args.speed, args.chunk, args.loop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+'''
+Sweep sampling frequency and reconstruction method over a directory of
+signal files and write the reconstruction error of every combination.
+
+    python -m dsp.sweep Data --fs 50 100 200 400 --output errors.csv
+    python -m dsp.sweep Data --factors 1 2 4 --output errors.csv
+
+--factors samples each file at multiples of its occupied bandwidth (99%
+of the power), which is what the GUI uses as f_max for uploaded signals.
+'''
+
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from dsp.io import load_signal_csv
+from dsp.metrics import mean_absolute_error, root_mean_square_error
+from dsp.reconstruction import METHODS, reconstruct
+from dsp.sampling import sample_uniform
+from dsp.spectrum import occupied_bandwidth
+
+COLUMNS = ["file", "method", "sampling_frequency", "n_samples", "mae", "rmse", "f_max"]
+
+
+def sweep_signal(t, signal, sampling_frequencies, methods):
+    '''
+    Reconstruct one signal at every (sampling frequency, method) pair.
+    Returns:
+        list: Rows of (method, sampling_frequency, n_samples, mae, rmse).
+            Combinations with too few samples to reconstruct report NaN.
+    '''
+    duration = t[-1] - t[0]
+    rows = []
+    for sampling_frequency in sampling_frequencies:
+        amplitudes, times = sample_uniform(t, signal, sampling_frequency, duration)
+        for method in methods:
+            if len(times) < 2:
+                mae = rmse = np.nan
+            else:
+                reconstructed = reconstruct(method, amplitudes, times, t)
+                mae = mean_absolute_error(signal, reconstructed)
+                rmse = root_mean_square_error(signal, reconstructed)
+            rows.append((method, sampling_frequency, len(times), mae, rmse))
+    return rows
+
+
+def _sweep_file(path, sampling_frequencies, methods, max_rows, duration, factors):
+    try:
+        t, signal = load_signal_csv(path, max_rows=max_rows, duration=duration)
+        if len(t) < 2:
+            raise ValueError("at least two rows are needed")
+        if not np.all(np.diff(t) > 0):
+            raise ValueError("the time column does not increase")
+    except (OSError, ValueError) as e:
+        print(f"Failed to load signal {path}: {e}", file=sys.stderr)
+        return []
+    f_max = occupied_bandwidth(signal, (len(t) - 1) / (t[-1] - t[0]))
+    frequencies = list(sampling_frequencies) + [factor * f_max for factor in factors]
+    name = os.path.basename(path)
+    return [
+        (name, *row, f_max) for row in sweep_signal(t, signal, frequencies, methods)
+    ]
+
+
+def _sweep_file_args(args):
+    return _sweep_file(*args)
+
+
+def run_sweep(
+    paths,
+    sampling_frequencies,
+    methods,
+    workers=None,
+    max_rows=None,
+    duration=1,
+    factors=(),
+):
+    '''
+    Sweep every file in `paths` across a process pool, at the absolute
+    `sampling_frequencies` plus `factors` times each file's bandwidth.
+    Returns:
+        list: Rows matching COLUMNS.
+    '''
+    tasks = [
+        (str(path), sampling_frequencies, methods, max_rows, duration, factors)
+        for path in paths
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        results = map(_sweep_file_args, tasks)
+        return [row for rows in results for row in rows]
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_sweep_file_args, tasks, chunksize=chunksize)
+        return [row for rows in results for row in rows]
+
+
+def write_table(rows, output):
+    output = Path(output)
+    if output.suffix == ".parquet":
+        try:
+            import pandas as pd
+        except ImportError:
+            raise SystemExit("Writing Parquet requires pandas and pyarrow") from None
+        pd.DataFrame(rows, columns=COLUMNS).to_parquet(output, index=False)
+        return
+    with open(output, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("directory", help="Directory of .csv/.txt signal files")
+    parser.add_argument(
+        "--fs", type=float, nargs="+", default=[], help="Sampling frequencies in Hz"
+    )
+    parser.add_argument(
+        "--factors",
+        type=float,
+        nargs="+",
+        default=[],
+        help="Sampling frequencies as multiples of each file's bandwidth",
+    )
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        default=list(METHODS),
+        choices=list(METHODS),
+        help="Reconstruction methods (default: all)",
+    )
+    parser.add_argument(
+        "--output", default="errors.csv", help="Output table, .csv or .parquet"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--max-rows", type=int, default=None, help="Rows read per file")
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=1,
+        help="Span in seconds assigned to single-column files",
+    )
+    args = parser.parse_args(argv)
+    if not args.fs and not args.factors:
+        parser.error("Give sampling frequencies with --fs and/or --factors")
+
+    directory = Path(args.directory)
+    paths = sorted(p for p in directory.iterdir() if p.suffix in (".csv", ".txt"))
+    if not paths:
+        parser.error(f"No .csv or .txt files in {directory}")
+
+    rows = run_sweep(
+        paths,
+        args.fs,
+        args.methods,
+        args.workers,
+        args.max_rows,
+        args.duration,
+        args.factors,
+    )
+    write_table(rows, args.output)
+    print(f"Wrote {len(rows)} rows for {len(paths)} files to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
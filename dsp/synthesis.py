@@ -0,0 +1,150 @@
+from functools import lru_cache
+
+import numpy as np
+
+from dsp.precision import complex_dtype, real_dtype
+from dsp.reconstruction import DEFAULT_MEMORY_BUDGET
+
+# Relative tolerance when deciding that a frequency lands exactly on an FFT bin.
+_ON_GRID_TOLERANCE = 1e-9
+
+
+@lru_cache(maxsize=16)
+def time_base(duration, fs):
+    '''
+    Time vector shared by synthesized signals: `fs` points spread over
+    `duration` seconds, endpoint excluded. Cached and read-only, so every
+    caller reuses the same array.
+    '''
+    t = np.linspace(0, duration, int(fs), endpoint=False)
+    t.flags.writeable = False
+    return t
+
+
+def generate_wave(frequency, amplitude, phase, duration, fs, dtype=None):
+    '''
+    Generate a single sinusoid.
+    Args:
+        frequency (float): Frequency in Hz.
+        amplitude (float): Peak amplitude.
+        phase (float): Phase in radians.
+        duration (float): Length of the signal in seconds.
+        fs (int): Number of samples in the signal.
+        dtype: Floating dtype of the result; defaults to the precision set
+            in dsp.precision.
+    '''
+    dtype = real_dtype() if dtype is None else np.dtype(dtype)
+    if dtype != np.float64:
+        # A single-precision phase 2*pi*f*t loses accuracy as t grows; the
+        # blocked product evaluates the phases in float64 instead.
+        return _synthesize_blocks(
+            np.array([frequency], dtype=float),
+            np.array([amplitude], dtype=float),
+            np.array([phase], dtype=float),
+            duration,
+            int(fs),
+            DEFAULT_MEMORY_BUDGET,
+            dtype,
+        )
+    t = time_base(duration, fs)
+    return amplitude * np.sin(2 * np.pi * frequency * t + phase)
+
+
+def _fft_bins(frequencies, duration, n):
+    bins = np.asarray(frequencies, dtype=float) * duration
+    rounded = np.rint(bins)
+    on_grid = np.abs(bins - rounded) <= _ON_GRID_TOLERANCE * np.maximum(1, np.abs(bins))
+    if not np.all(on_grid) or np.any(rounded < 0) or np.any(rounded > n // 2):
+        return None
+    return rounded.astype(np.intp)
+
+
+def _synthesize_fft(bins, amplitudes, phases, n, dtype):
+    # A*sin(2*pi*k*m/n + phase) is the real part of A*exp(i(phase - pi/2))
+    # at bin k; DC and Nyquist bins carry the real value A*sin(phase) directly.
+    spectrum = np.zeros(n // 2 + 1, dtype=complex_dtype(dtype))
+    interior = (bins > 0) & ((bins < n / 2))
+    np.add.at(
+        spectrum,
+        bins[interior],
+        n / 2 * amplitudes[interior] * np.exp(1j * (phases[interior] - np.pi / 2)),
+    )
+    edge = ~interior
+    np.add.at(spectrum, bins[edge], n * amplitudes[edge] * np.sin(phases[edge]))
+    return np.fft.irfft(spectrum, n)
+
+
+def _synthesize_blocks(frequencies, amplitudes, phases, duration, n, memory_budget, dtype):
+    # Split the time axis into rows of `width` samples, t = (row * width + j) * dt.
+    # Each tone is then Im(A * exp(i(phase + w * row * width * dt)) * exp(i w j dt)),
+    # so one (rows x tones) by (tones x width) complex product yields the mix
+    # with only O(tones * (rows + width)) transcendental evaluations. The
+    # factors are evaluated in float64 and only the product runs in `dtype`.
+    dt = duration / n
+    width = int(np.ceil(np.sqrt(n)))
+    rows = int(np.ceil(n / width))
+    omega = 2 * np.pi * frequencies
+    row_starts = np.arange(rows) * (width * dt)
+    offsets = np.arange(width) * dt
+
+    product_dtype = complex_dtype(dtype)
+    itemsize = product_dtype.itemsize
+    row_block = max(1, int(memory_budget // (width * itemsize)))
+    tone_block = max(1, int(memory_budget // ((width + min(rows, row_block)) * itemsize)))
+    mixed_signal = np.zeros(rows * width, dtype=dtype)
+    out = mixed_signal.reshape(rows, width)
+    for tone_start in range(0, len(omega), tone_block):
+        tones = slice(tone_start, tone_start + tone_block)
+        within_row = np.exp(1j * np.multiply.outer(omega[tones], offsets)).astype(product_dtype)
+        for row_start in range(0, rows, row_block):
+            row_slice = slice(row_start, row_start + row_block)
+            weights = amplitudes[tones] * np.exp(
+                1j * (phases[tones] + np.multiply.outer(row_starts[row_slice], omega[tones]))
+            )
+            out[row_slice] += (weights.astype(product_dtype) @ within_row).imag
+    return mixed_signal[:n]
+
+
+def synthesize(
+    frequencies, amplitudes, phases, duration, fs, memory_budget=DEFAULT_MEMORY_BUDGET, dtype=None
+):
+    '''
+    Sum of sinusoids given as parallel arrays. When every frequency falls on
+    an FFT bin of the output, the tones are placed in the spectrum and the
+    mix is built with a single inverse FFT; otherwise it is built from
+    blocked complex matrix products whose temporaries stay within
+    `memory_budget` bytes.
+    Args:
+        frequencies (array_like): Frequencies in Hz.
+        amplitudes (array_like): Peak amplitudes.
+        phases (array_like): Phases in radians.
+        duration (float): Length of the signal in seconds.
+        fs (int): Number of samples in the signal.
+        dtype: Floating dtype of the result; defaults to the precision set
+            in dsp.precision.
+    '''
+    dtype = real_dtype() if dtype is None else np.dtype(dtype)
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=float))
+    amplitudes = np.atleast_1d(np.asarray(amplitudes, dtype=float))
+    phases = np.atleast_1d(np.asarray(phases, dtype=float))
+    n = int(fs)
+    if len(frequencies) == 0:
+        return np.zeros(n, dtype=dtype)
+
+    bins = _fft_bins(frequencies, duration, n)
+    if bins is not None:
+        return _synthesize_fft(bins, amplitudes, phases, n, dtype)
+
+    return _synthesize_blocks(
+        frequencies, amplitudes, phases, duration, n, memory_budget, dtype
+    )
+
+
+def mix(components, duration, fs, dtype=None):
+    '''
+    Sum of sinusoids described by (frequency, amplitude, phase) tuples.
+    '''
+    components = np.asarray(components, dtype=float).reshape(-1, 3)
+    return synthesize(
+        components[:, 0], components[:, 1], components[:, 2], duration, fs, dtype=dtype
+    )
@@ -0,0 +1,135 @@
+import numpy as np
+
+from dsp.composite import CompositeSignal
+from dsp.metrics import snr_db
+from dsp.noise import add_noise
+from dsp.pipeline import run_reconstruction
+from dsp.precision import using_precision
+from dsp.reconstruction import METHODS, fft_reconstruction, whittaker_shannon
+from dsp.sampling import sample_uniform
+
+
+def fft_matches_sinc(
+    frequencies=(3, 7, 11),
+    amplitudes=(1.0, 0.5, 0.25),
+    sampling_frequency=40,
+    duration=1,
+    output_points=2000,
+    tolerance=1e-3,
+    repeats=101,
+):
+    '''
+    Check the FFT reconstruction against the direct sinc sum on a periodic
+    signal. The sinc sum only reproduces a periodic signal when the samples
+    are repeated on both sides, so the reference sums over `repeats` copies
+    of the sample period (its truncation error falls off as 1/repeats) and
+    is compared over the central one.
+    Returns:
+        tuple: (passed, max_abs_error)
+    '''
+    t = np.linspace(0, duration, output_points, endpoint=False)
+    sampling_time = np.arange(0, duration, 1 / sampling_frequency)
+
+    def signal(time):
+        return sum(
+            a * np.sin(2 * np.pi * f * time) for f, a in zip(frequencies, amplitudes)
+        )
+
+    samples = signal(sampling_time)
+    reconstructed = fft_reconstruction(samples, sampling_time, t)
+
+    copies = np.arange(repeats) - repeats // 2
+    extended_time = (sampling_time[np.newaxis, :] + duration * copies[:, np.newaxis]).ravel()
+    extended_samples = np.tile(samples, repeats)
+    reference = whittaker_shannon(extended_samples, extended_time, t)
+
+    error = np.max(np.abs(reconstructed - reference))
+    return error <= tolerance, error
+
+
+def _pipeline_in(precision, components, duration, points, method, factor, snr, seed):
+    with using_precision(precision):
+        data = CompositeSignal(components, duration, points).data
+        noisy = add_noise(data, snr, rng=np.random.default_rng(seed))
+    t = np.linspace(0, duration, points)
+    f_max = max(frequency for frequency, _, _ in components)
+    amplitudes, sampling_times = sample_uniform(t, data, factor * f_max, duration)
+    result = run_reconstruction(method, amplitudes, sampling_times, t, data, factor * f_max)
+    return result, snr_db(data.astype(float), noisy.astype(float))
+
+
+def precision_report(
+    components=((10, 5, 0), (15, 5, 0), (20, 10, 1.57)),
+    duration=10,
+    points=100_000,
+    factors=(1, 2, 4),
+    methods=None,
+    snr=30,
+    seed=0,
+    tolerance=1e-3,
+):
+    '''
+    Run synthesis, noise, sampling, reconstruction and the spectrum once in
+    float64 and once in float32 on the same signal, and measure how far the
+    float32 results are from the float64 ones.
+    Args:
+        methods (list): Reconstruction methods, all of METHODS by default.
+        snr (float): SNR in dB of the noise added in both precisions. The
+            noise draws differ between precisions, so only the achieved SNR
+            is compared.
+        tolerance (float): Largest relative MAE deviation that passes.
+    Returns:
+        list: One dict per (method, factor) with the MAE in both precisions,
+            its relative deviation, the largest deviation of the
+            reconstruction and of the spectrum, the achieved SNR in both
+            precisions, and whether the MAE deviation is within tolerance.
+    '''
+    rows = []
+    for method in methods or METHODS:
+        for factor in factors:
+            arguments = (components, duration, points, method, factor, snr, seed)
+            double, double_snr = _pipeline_in("float64", *arguments)
+            single, single_snr = _pipeline_in("float32", *arguments)
+            deviation = abs(single.error - double.error) / max(double.error, np.finfo(float).tiny)
+            rows.append(
+                {
+                    "method": method,
+                    "factor": factor,
+                    "dtype": str(single.reconstructed.dtype),
+                    "mae_float64": float(double.error),
+                    "mae_float32": float(single.error),
+                    "relative_deviation": float(deviation),
+                    "reconstruction_deviation": float(
+                        np.max(np.abs(single.reconstructed - double.reconstructed))
+                    ),
+                    "spectrum_deviation": float(
+                        np.max(np.abs(single.magnitude - double.magnitude))
+                    ),
+                    "snr_float64": float(double_snr),
+                    "snr_float32": float(single_snr),
+                    "passed": bool(deviation <= tolerance),
+                }
+            )
+    return rows
+
+
+def print_precision_report(rows):
+    print(
+        f"{'method':<18} {'factor':>6} {'MAE float64':>12} {'MAE float32':>12} "
+        f"{'rel. dev.':>10} {'max |dy|':>10} {'max |dX|':>10} {'SNR 64/32 dB':>14}"
+    )
+    for row in rows:
+        print(
+            f"{row['method']:<18} {row['factor']:>6} {row['mae_float64']:>12.6g} "
+            f"{row['mae_float32']:>12.6g} {row['relative_deviation']:>10.2e} "
+            f"{row['reconstruction_deviation']:>10.2e} {row['spectrum_deviation']:>10.2e} "
+            f"{row['snr_float64']:>8.2f}/{row['snr_float32']:.2f}"
+            f"{'' if row['passed'] else '  FAILED'}"
+        )
+
+
+if __name__ == "__main__":
+    passed, error = fft_matches_sinc()
+    print(f"FFT vs sinc reconstruction: max error {error:.3e} ({'ok' if passed else 'FAILED'})")
+    print("\nfloat32 against float64:")
+    print_precision_report(precision_report())
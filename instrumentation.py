@@ -0,0 +1,331 @@
+'''
+Timing instrumentation for the GUI: slots, compute stages and redraws are
+wrapped so that, while profiling is enabled, every call is timed, calls of
+the same slot repeated within one pass of the event loop are counted as
+redundant, and a timeline can be saved in the Chrome trace format
+(chrome://tracing, Perfetto). When profiling is disabled a wrapped call
+costs one attribute check.
+
+Profiling is toggled with Ctrl+Shift+P or enabled at startup by setting
+SAMPLING_STUDIO_PROFILE=1; Ctrl+Shift+T saves the timeline, and
+SAMPLING_STUDIO_TRACE=<path> saves it when the window closes.
+'''
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+import numpy as np
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QLabel
+
+PROFILE_ENV = "SAMPLING_STUDIO_PROFILE"
+TRACE_ENV = "SAMPLING_STUDIO_TRACE"
+
+
+def _positional_count(fn):
+    '''
+    Number of positional arguments `fn` accepts, or None if unlimited.
+    '''
+    try:
+        parameters = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    count = 0
+    for parameter in parameters:
+        if parameter.kind == parameter.VAR_POSITIONAL:
+            return None
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+            count += 1
+    return count
+
+
+class Profiler:
+    '''
+    Collects timed spans. Keeps the last `max_events` spans for the trace
+    and the last `history` durations of every stage for the statistics.
+    '''
+
+    def __init__(self, history=200, max_events=200_000, enabled=False):
+        self.enabled = enabled
+        self.history = history
+        self.events = deque(maxlen=max_events)
+        self.redundant_events = deque(maxlen=max_events)
+        self.durations = defaultdict(lambda: deque(maxlen=self.history))
+        self.categories = {}
+        self.calls = Counter()
+        self.redundant = Counter()
+        self.thread_names = {}
+        self.current_pass = set()
+        self.slot_depth = 0
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def reset(self):
+        with self.lock:
+            self.events.clear()
+            self.redundant_events.clear()
+            self.durations.clear()
+            self.calls.clear()
+            self.redundant.clear()
+            self.current_pass.clear()
+
+    def record(self, name, category, start, end):
+        thread = threading.get_ident()
+        with self.lock:
+            self.events.append((name, category, start, end - start, thread))
+            self.durations[name].append(end - start)
+            self.categories[name] = category
+            self.calls[name] += 1
+            if thread not in self.thread_names:
+                self.thread_names[thread] = threading.current_thread().name
+
+    def note_slot_call(self, name):
+        '''
+        Count a slot call as redundant if the same slot was already invoked
+        from the (GUI thread) event loop in its current pass.
+        '''
+        if not self.current_pass:
+            QTimer.singleShot(0, self.current_pass.clear)
+        if name in self.current_pass:
+            self.redundant[name] += 1
+            self.redundant_events.append((name, time.perf_counter()))
+        else:
+            self.current_pass.add(name)
+
+    def span(self, name, category="stage"):
+        return _Span(self, name, category)
+
+    def wrap(self, fn, name, category="stage", slot=False):
+        '''
+        Time calls of `fn` under `name` while the profiler is enabled.
+        Slots drop the extra arguments Qt signals pass beyond what `fn`
+        accepts, as a direct connection to `fn` would.
+        '''
+        accepted = _positional_count(fn) if slot else None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if accepted is not None:
+                args = args[:accepted]
+            if not self.enabled:
+                return fn(*args, **kwargs)
+            if slot:
+                # Only calls made by the event loop itself can be redundant;
+                # a slot calling helpers is one invocation.
+                if self.slot_depth == 0:
+                    self.note_slot_call(name)
+                self.slot_depth += 1
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, category, start, time.perf_counter())
+                if slot:
+                    self.slot_depth -= 1
+
+        wrapper.instrumented = True
+        return wrapper
+
+    def stats(self):
+        '''
+        Returns:
+            list: One dict per stage (name, category, calls, redundant, mean,
+                p95 and max in seconds over the recent calls), slowest total
+                first.
+        '''
+        with self.lock:
+            rows = []
+            for name, durations in self.durations.items():
+                recent = np.fromiter(durations, dtype=float)
+                rows.append(
+                    {
+                        "name": name,
+                        "category": self.categories[name],
+                        "calls": self.calls[name],
+                        "redundant": self.redundant[name],
+                        "mean": float(recent.mean()),
+                        "p95": float(np.percentile(recent, 95)),
+                        "max": float(recent.max()),
+                        "total": float(recent.sum()),
+                    }
+                )
+        rows.sort(key=lambda row: row["total"], reverse=True)
+        return rows
+
+    def chrome_trace(self):
+        '''
+        The recorded spans as a Chrome trace ("X" complete events, times in
+        microseconds), with redundant slot calls as instant events.
+        '''
+        pid = os.getpid()
+        with self.lock:
+            events = [
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self.origin) * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": pid,
+                    "tid": thread,
+                }
+                for name, category, start, duration, thread in self.events
+            ]
+            events += [
+                {
+                    "name": f"redundant {name}",
+                    "cat": "redundant",
+                    "ph": "i",
+                    "s": "t",
+                    "ts": (timestamp - self.origin) * 1e6,
+                    "pid": pid,
+                    "tid": threading.main_thread().ident,
+                }
+                for name, timestamp in self.redundant_events
+            ]
+            events += [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": thread,
+                    "args": {"name": thread_name},
+                }
+                for thread, thread_name in self.thread_names.items()
+            ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump_chrome_trace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+
+class _Span:
+    def __init__(self, profiler, name, category):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.profiler.enabled:
+            self.profiler.record(self.name, self.category, self.start, time.perf_counter())
+        return False
+
+
+profiler = Profiler(enabled=os.environ.get(PROFILE_ENV, "") not in ("", "0"))
+
+
+def instrument_slots(obj, prefix=None, exclude=("initUI",)):
+    '''
+    Replace the methods defined by the class of `obj` with timed wrappers
+    on the instance. Must run before the methods are connected to
+    signals, since connections made earlier keep the original methods.
+    Qt event handlers (`...Event`) are called by Qt through the class and
+    are left alone.
+    '''
+    prefix = prefix or type(obj).__name__
+    for name, member in vars(type(obj)).items():
+        if (
+            not inspect.isfunction(member)
+            or name.startswith("_")
+            or name.endswith("Event")
+            or name in exclude
+        ):
+            continue
+        bound = getattr(obj, name)
+        setattr(obj, name, profiler.wrap(bound, f"{prefix}.{name}", "slot", slot=True))
+
+
+def instrument_function(owner, name, category="compute"):
+    '''
+    Time a module-level function or class method in place.
+    '''
+    fn = getattr(owner, name)
+    if getattr(fn, "instrumented", False):
+        return
+    label = f"{getattr(owner, '__name__', owner)}.{name}"
+    setattr(owner, name, profiler.wrap(fn, label, category))
+
+
+def instrument_pipeline():
+    '''
+    Wrap the compute stages of a reconstruction. Safe to call more than once.
+    '''
+    import dsp.pipeline
+    import workers
+
+    instrument_function(workers, "sample_and_reconstruct", "worker")
+    instrument_function(dsp.pipeline, "reconstruct", "compute")
+    instrument_function(dsp.pipeline, "magnitude_spectrum", "compute")
+
+
+def instrument_drawing():
+    '''
+    Wrap the redraw paths. Imports pyqtgraph, so it runs when the plots
+    are built. Safe to call more than once.
+    '''
+    import pyqtgraph
+
+    import plotting
+
+    instrument_function(plotting.LodCurve, "set_data", "draw")
+    instrument_function(plotting.LodCurve, "refresh", "draw")
+    instrument_function(plotting.SampleMarkers, "set_data", "draw")
+    instrument_function(pyqtgraph.GraphicsView, "paintEvent", "paint")
+
+
+class LatencyHud(QLabel):
+    '''
+    Overlay in the top-right corner of `parent` listing the slowest stages
+    over their recent calls.
+    '''
+
+    def __init__(self, parent, interval_ms=500, rows=12):
+        super().__init__(parent)
+        self.rows = rows
+        self.setObjectName("latency_hud")
+        self.setFont(QFont("monospace", 8))
+        self.setStyleSheet(
+            "QLabel#latency_hud {background: rgba(0, 0, 0, 170); color: #e0e0e0;"
+            " padding: 6px; border-radius: 4px;}"
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def set_active(self, active):
+        if active:
+            self.refresh()
+            self.show()
+            self.timer.start()
+        else:
+            self.timer.stop()
+            self.hide()
+
+    def refresh(self):
+        lines = [f"{'stage':<44} {'calls':>6} {'dup':>4} {'mean':>7} {'p95':>7} {'max':>7}"]
+        for row in profiler.stats()[: self.rows]:
+            lines.append(
+                f"{row['name'][-44:]:<44} {row['calls']:>6} {row['redundant']:>4} "
+                f"{row['mean'] * 1e3:>7.2f} {row['p95'] * 1e3:>7.2f} {row['max'] * 1e3:>7.2f}"
+            )
+        if len(lines) == 1:
+            lines.append("waiting for events...")
+        lines.append("times in ms; Ctrl+Shift+T saves a trace")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.move(self.parent().width() - self.width() - 10, 10)
+        self.raise_()
@@ -1,12 +1,16 @@
+import time
+
+# Taken before the other imports so the startup report includes them.
+PROCESS_START = time.perf_counter()
+
+import os
 import sys
+from functools import lru_cache, partial
+from itertools import count
 import numpy as np
-from PyQt6.QtGui import QIcon
+from PyQt6.QtGui import QIcon, QKeySequence, QShortcut
 from PyQt6 import QtWidgets
-from PyQt6.QtCore import Qt, pyqtSignal
-from scipy.interpolate import interp1d
-from pyqtgraph import ScatterPlotItem
-from pyqtgraph import PlotWidget
-from scipy.interpolate import CubicSpline
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtWidgets import (
     QApplication,
     QWidget,
@@ -21,17 +25,54 @@ from PyQt6.QtWidgets import (
     QFrame,
     QSlider,
     QRadioButton,
+    QDoubleSpinBox,
+    QSpinBox,
+    QCheckBox,
 )
 from PyQt6 import QtCore
-import matplotlib.pyplot as plt
+import dsp
+import instrumentation
+from workers import BackgroundTask, ReconstructionScheduler
+
+
+# Span of an uploaded recording shown when it is first loaded.
+DEFAULT_WINDOW_SECONDS = 10
+
+PROJECT_FILTER = "Project (*.npz)"
+COMPRESSED_PROJECT_FILTER = "Compressed project (*.npz)"
+
+# Prints the time spent in each startup phase and exits.
+STARTUP_REPORT_FLAG = "--startup-report"
+
+STYLESHEETS = {"dark": "./Styles/darkMode.qss", "light": "./Styles/lightMode.qss"}
+
+# Spectrum options: (window, Welch segments per signal or None for a single FFT).
+SPECTRUM_WINDOWS = {
+    "Rectangular": ("boxcar", None),
+    "Hann": ("hann", None),
+    "Hamming": ("hamming", None),
+    "Blackman": ("blackman", None),
+    "Welch (Hann)": ("hann", 8),
+}
+
+
+@lru_cache(maxsize=None)
+def load_stylesheet(mode):
+    with open(STYLESHEETS[mode], "r") as f:
+        return f.read()
+
+
+def component_description(frequency, amplitude, phase):
+    return f"Freq: {frequency} Hz, Amp: {amplitude}, Phase: {phase} rad"
 
 
 class SignalListItemWidget(QFrame):
-    delete_signal = pyqtSignal(str)
+    delete_signal = pyqtSignal(int)
 
-    def __init__(self, description, parent=None):
+    def __init__(self, description, signal_id, parent=None):
         super().__init__(parent)
         self.description = description
+        self.signal_id = signal_id
         self.initUI()
 
     def initUI(self):
@@ -63,10 +104,12 @@ class SignalListItemWidget(QFrame):
         layout.setContentsMargins(0, 0, 0, 0)
 
     def handle_delete(self):
-        self.delete_signal.emit(self.description)
+        self.delete_signal.emit(self.signal_id)
 
 
 class SignalMixerApp(QWidget):
+    default_signals_ready = pyqtSignal()
+
     def __init__(self):
         super().__init__()
 
@@ -76,20 +119,48 @@ class SignalMixerApp(QWidget):
 
         self.isNoNoise = False
         self.signal = None
-        self.signals = []
-        self.result_signals = {}
+        # Pending components by ID, and the signals of the result list.
+        self.signals = {}
+        self.component_ids = count(1)
+        self.registry = dsp.SignalRegistry()
         self.current_displayed_signal = None
-        self.mixed_signal_components = {}
-        self.noisy_signals = {}
         self.fs = 10000
         self.updated_fs = 44100  # to be updated, and used in freq graph
         self.f_max = None
         self.current_mode = "dark"
         self.duration = 1
         self.error_values  = []
+        self.noise_key = None
+        self.stream_window = None
+        self.comparison_window = None
+        self.sampling_seed = 0
+        self.first_paint_done = False
+        self.startup_times = {}
+
+        # Wrap the slots before initUI connects them to signals.
+        instrumentation.instrument_pipeline()
+        instrumentation.instrument_slots(self)
+
+        self.reconstruction_cache = dsp.ReconstructionCache()
+        self.reconstruction_scheduler = ReconstructionScheduler(
+            self.build_reconstruction_job, cache=self.reconstruction_cache, parent=self
+        )
+        self.reconstruction_scheduler.result_ready.connect(self.plot_reconstructed_signal)
+        self.reconstruction_scheduler.error.connect(
+            lambda message: print(f"Reconstruction failed: {message}")
+        )
 
+        # Styling the application before the widgets exist spares Qt from
+        # polishing every widget a second time.
+        self.apply_theme("light")
         self.initUI()
 
+        self.latency_hud = instrumentation.LatencyHud(self)
+        self.latency_hud.set_active(instrumentation.profiler.enabled)
+        QShortcut(QKeySequence("Ctrl+Shift+P"), self, self.toggle_profiling)
+        QShortcut(QKeySequence("Ctrl+Shift+T"), self, self.save_trace)
+        self.startup_times["window"] = time.perf_counter()
+
     def initUI(self):
         layout = QHBoxLayout()
         mixer_frame = QFrame()
@@ -151,6 +222,10 @@ class SignalMixerApp(QWidget):
         self.mix_button.setObjectName("mix_button")
         self.mix_button.setMinimumHeight(35)
         self.mix_button.clicked.connect(self.mix_signals)
+        add_to_mix_button = QPushButton("Add to Mix")
+        add_to_mix_button.setObjectName("add_to_mix_button")
+        add_to_mix_button.setMinimumHeight(35)
+        add_to_mix_button.clicked.connect(self.add_component_to_mix)
 
         upload_layout = QHBoxLayout()
         upload_button = QPushButton("Upload Signal")
@@ -166,13 +241,24 @@ class SignalMixerApp(QWidget):
 
         self.error_plot_button = QPushButton("Error Plot")
         self.error_plot_button.clicked.connect(self.display_error_plot)
+        self.stream_button = QPushButton("Stream")
+        self.stream_button.clicked.connect(self.open_stream_window)
+        self.compare_button = QPushButton("Compare Selected")
+        self.compare_button.clicked.connect(self.compare_selected)
+        self.save_project_button = QPushButton("Save Project")
+        self.save_project_button.clicked.connect(self.save_project)
+        self.load_project_button = QPushButton("Load Project")
+        self.load_project_button.clicked.connect(self.load_project)
 
 
 
         add_mix_control_layout.addWidget(add_button)
         add_mix_control_layout.addWidget(self.mix_button)
+        add_mix_control_layout.addWidget(add_to_mix_button)
 
         upload_layout.addWidget(upload_button)
+        upload_layout.addWidget(self.save_project_button)
+        upload_layout.addWidget(self.load_project_button)
         upload_layout.addSpacerItem(
             QtWidgets.QSpacerItem(
                 1000,
@@ -183,6 +269,8 @@ class SignalMixerApp(QWidget):
         )
 
         upload_layout.addWidget(self.error_plot_button)
+        upload_layout.addWidget(self.stream_button)
+        upload_layout.addWidget(self.compare_button)
         upload_layout.addWidget(self.mode_button)
 
         mixer_layout.addLayout(upload_layout)
@@ -216,6 +304,7 @@ class SignalMixerApp(QWidget):
         result_components_layout.setAlignment(Qt.AlignmentFlag.AlignRight)
 
         self.result_list = QListWidget()
+        self.result_list.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
         result_list_V = QVBoxLayout()
         result_list_V.setAlignment(Qt.AlignmentFlag.AlignTop)
         mixed_label = QLabel("Mixed Signals:")
@@ -235,14 +324,73 @@ class SignalMixerApp(QWidget):
 
         mixer_layout.addLayout(result_components_layout)
 
+        window_layout = QHBoxLayout()
+        window_layout.addWidget(QLabel("Recording Window Start (s):"))
+        self.window_start_input = QDoubleSpinBox()
+        self.window_start_input.setDecimals(3)
+        self.window_start_input.setSingleStep(0.1)
+        window_layout.addWidget(self.window_start_input)
+        window_layout.addWidget(QLabel("Length (s):"))
+        self.window_length_input = QDoubleSpinBox()
+        self.window_length_input.setDecimals(3)
+        self.window_length_input.setSingleStep(0.1)
+        self.window_length_input.setMinimum(0.001)
+        window_layout.addWidget(self.window_length_input)
+        self.window_start_input.editingFinished.connect(self.update_recording_window)
+        self.window_length_input.editingFinished.connect(self.update_recording_window)
+        self.set_window_controls(None)
+        mixer_layout.addLayout(window_layout)
+
         self.comboBox = QtWidgets.QComboBox()
         self.comboBox.setObjectName("comboBox")
-        self.comboBox.addItems(["Whittaker-Shannon", "Linear", "Cubic"])
+        self.comboBox.addItems(list(dsp.METHODS))
 
         self.comboBox.currentIndexChanged.connect(self.reconstruct_signal)
 
         mixer_layout.addWidget(self.comboBox)
 
+        sampling_mode_layout = QHBoxLayout()
+        sampling_mode_layout.addWidget(QLabel("Sampling:"))
+        self.sampling_mode_combo = QtWidgets.QComboBox()
+        self.sampling_mode_combo.addItems(["Uniform", "Jittered", "Random", "Polyphase"])
+        self.sampling_mode_combo.currentIndexChanged.connect(self.reconstruct_signal)
+        sampling_mode_layout.addWidget(self.sampling_mode_combo)
+        sampling_mode_layout.addWidget(QLabel("Jitter (% of period):"))
+        self.jitter_input = QDoubleSpinBox()
+        self.jitter_input.setRange(0, 100)
+        self.jitter_input.setValue(10)
+        self.jitter_input.valueChanged.connect(self.reconstruct_signal)
+        sampling_mode_layout.addWidget(self.jitter_input)
+        self.anti_alias_check = QCheckBox("Anti-alias")
+        self.anti_alias_check.setToolTip(
+            "Polyphase sampling: low-pass filter below the new Nyquist frequency first"
+        )
+        self.anti_alias_check.setChecked(True)
+        self.anti_alias_check.toggled.connect(self.reconstruct_signal)
+        sampling_mode_layout.addWidget(self.anti_alias_check)
+        mixer_layout.addLayout(sampling_mode_layout)
+
+        spectrum_layout = QHBoxLayout()
+        spectrum_layout.addWidget(QLabel("Spectrum Window:"))
+        self.window_combo = QtWidgets.QComboBox()
+        self.window_combo.addItems(list(SPECTRUM_WINDOWS))
+        self.window_combo.currentIndexChanged.connect(self.reconstruct_signal)
+        spectrum_layout.addWidget(self.window_combo)
+        mixer_layout.addLayout(spectrum_layout)
+
+        precision_layout = QHBoxLayout()
+        precision_layout.addWidget(QLabel("Precision:"))
+        self.precision_combo = QtWidgets.QComboBox()
+        self.precision_combo.addItems(list(dsp.PRECISIONS))
+        self.precision_combo.setCurrentText(dsp.get_precision())
+        self.precision_combo.setToolTip(
+            "float32 halves the memory of the signals and runs synthesis, noise,\n"
+            "reconstruction and spectra in single precision"
+        )
+        self.precision_combo.currentTextChanged.connect(self.set_precision)
+        precision_layout.addWidget(self.precision_combo)
+        mixer_layout.addLayout(precision_layout)
+
         # plot_reconstructed_layout = QVBoxLayout()
 
         slider_layout = QVBoxLayout()
@@ -261,7 +409,6 @@ class SignalMixerApp(QWidget):
         self.sampling_slider.setValue(1)
         self.sampling_slider.setTickInterval(1)
         self.sampling_slider.setTickPosition(QSlider.TickPosition.TicksBelow)
-        self.sampling_slider.valueChanged.connect(self.plot_sampling_markers)
         self.sampling_slider.valueChanged.connect(self.reconstruct_signal)
         sampling_layout.addWidget(sampling_label_start)
         sampling_layout.addWidget(self.sampling_slider)
@@ -283,7 +430,6 @@ class SignalMixerApp(QWidget):
         self.sampling_slider_actual.setEnabled(False)
         self.sampling_slider_actual.setTickInterval(1)
         self.sampling_slider_actual.setTickPosition(QSlider.TickPosition.TicksBelow)
-        self.sampling_slider_actual.valueChanged.connect(self.plot_sampling_markers)
         self.sampling_slider_actual.valueChanged.connect(self.reconstruct_signal)
         sampling_layout_2.addWidget(sampling_label_start_2)
         sampling_layout_2.addWidget(self.sampling_slider_actual)
@@ -303,8 +449,27 @@ class SignalMixerApp(QWidget):
         slider_layout.addLayout(snr_layout)
         self.snr_slider.valueChanged.connect(self.update_snr_value)
         self.snr_slider.valueChanged.connect(self.add_noise)
-        self.snr_slider.valueChanged.connect(self.plot_sampling_markers)
-        self.snr_slider.valueChanged.connect(self.reconstruct_signal)
+
+        noise_model_layout = QHBoxLayout()
+        noise_model_layout.addWidget(QLabel("Noise:"))
+        self.noise_model_combo = QtWidgets.QComboBox()
+        for model in dsp.NOISE_MODELS:
+            self.noise_model_combo.addItem(model.capitalize(), model)
+        self.noise_model_combo.currentIndexChanged.connect(self.update_noise)
+        noise_model_layout.addWidget(self.noise_model_combo)
+        noise_model_layout.addWidget(QLabel("Seed:"))
+        self.noise_seed_input = QSpinBox()
+        self.noise_seed_input.setRange(0, 2**31 - 1)
+        self.noise_seed_input.valueChanged.connect(self.update_noise)
+        noise_model_layout.addWidget(self.noise_seed_input)
+        slider_layout.addLayout(noise_model_layout)
+
+        self.cache_label = QLabel()
+        self.cache_label.setObjectName("cache_label")
+        slider_layout.addWidget(self.cache_label)
+        self.memory_label = QLabel()
+        self.memory_label.setObjectName("memory_label")
+        slider_layout.addWidget(self.memory_label)
 
         mixer_layout.addLayout(slider_layout)
 
@@ -313,47 +478,166 @@ class SignalMixerApp(QWidget):
         grid_layout = QVBoxLayout()
         grid_frame.setLayout(grid_layout)
 
+        # The plots are built once the first frame is painted, so neither
+        # pyqtgraph nor its widgets hold up the window appearing.
+        self.error_plot_widget = None
+        self.plot_grid_layout = grid_layout
+
+        layout.addWidget(grid_frame)
+
+        self.result_list.itemSelectionChanged.connect(self.display_selected_result)
+
+        mixer_layout.addSpacerItem(
+            QtWidgets.QSpacerItem(
+                0,
+                0,
+                QtWidgets.QSizePolicy.Policy.Minimum,
+                QtWidgets.QSizePolicy.Policy.Expanding,
+            )
+        )
+
+
+        self.setLayout(layout)
+
+    def create_plots(self):
+        '''
+        Build the signal, reconstruction, difference and spectrum plots.
+        The error plot is built the first time an error curve is shown.
+        '''
+        from pyqtgraph import PlotWidget
+
+        from plotting import LodCurve, SampleMarkers
+
+        instrumentation.instrument_drawing()
         self.main_plot_widget = PlotWidget()
         self.main_plot_widget.setTitle("Signal Waveform")
         self.main_plot_widget.setLabel("left", "Amplitude")
         self.main_plot_widget.setLabel("bottom", "Time [s]")
-        grid_layout.addWidget(self.main_plot_widget)
+        self.plot_grid_layout.addWidget(self.main_plot_widget)
 
         self.reconstruct_plot_widget = PlotWidget()
         self.reconstruct_plot_widget.setTitle("Reconstructed Signal")
         self.reconstruct_plot_widget.setLabel("left", "Amplitude")
         self.reconstruct_plot_widget.setLabel("bottom", "Time [s]")
 
-        grid_layout.addWidget(self.reconstruct_plot_widget)
+        self.plot_grid_layout.addWidget(self.reconstruct_plot_widget)
 
         self.difference_plot_widget = PlotWidget()
         self.difference_plot_widget.setTitle("Difference Signal")
         self.difference_plot_widget.setLabel("left", "Amplitude")
         self.difference_plot_widget.setLabel("bottom", "Time [s]")
 
-        grid_layout.addWidget(self.difference_plot_widget)
+        self.plot_grid_layout.addWidget(self.difference_plot_widget)
 
         self.freq_plot_widget = PlotWidget()
         self.freq_plot_widget.setTitle("Frequency Domain")
         self.freq_plot_widget.setLabel("left", "Magnitude")
         self.freq_plot_widget.setLabel("bottom", "Frequency [Hz]")
-        grid_layout.addWidget(self.freq_plot_widget)
+        self.plot_grid_layout.addWidget(self.freq_plot_widget)
 
-        layout.addWidget(grid_frame)
+        self.reconstruct_plot_widget.setYLink(self.difference_plot_widget)
+        self.main_curve = LodCurve(self.main_plot_widget, pen="b")
+        self.sample_markers = SampleMarkers(
+            self.main_plot_widget, symbol="o", pen=None, brush="r", size=6
+        )
+        self.reconstruct_curve = LodCurve(
+            self.reconstruct_plot_widget, pen="r", name="Reconstructed Signal"
+        )
+        self.difference_curve = LodCurve(
+            self.difference_plot_widget, pen="g", name="Difference Signal"
+        )
+        self.freq_curve = self.freq_plot_widget.plot(
+            [], [], pen="y", name="Periodic Frequency Signal"
+        )
+        self.freq_image_curves = [
+            self.freq_plot_widget.plot([], [], pen="r", name="Periodic Frequency Signal")
+            for _ in range(2)
+        ]
 
-        self.result_list.itemSelectionChanged.connect(self.display_selected_result)
+    def error_curve_frequencies(self):
+        '''
+        Sampling-frequency grid for the error curve, spanning the range of
+        whichever sampling slider is active.
+        '''
+        if self.radio1.isChecked():
+            return np.linspace(0.5, self.sampling_slider.maximum(), 71) * self.f_max
+        return np.linspace(1, self.sampling_slider_actual.maximum(), 80)
 
-        mixer_layout.addSpacerItem(
-            QtWidgets.QSpacerItem(
-                0,
-                0,
-                QtWidgets.QSizePolicy.Policy.Minimum,
-                QtWidgets.QSizePolicy.Policy.Expanding,
+    def display_error_plot(self):
+        '''
+        Compute the error for a whole grid of sampling frequencies in the
+        background and show it in the error plot.
+        '''
+        if self.current_displayed_signal is None or self.f_max is None:
+            print("No signal selected to compute the error curve for!")
+            return
+
+        self.error_curve_task = BackgroundTask(
+            dsp.error_curve,
+            self.current_signal_t,
+            self.current_signal_data,
+            self.error_curve_frequencies(),
+            self.comboBox.currentText(),
+            reference=self.current_reference(),
+            duration=self.duration,
+            sampler=self.current_sampler(),
+        )
+        self.error_curve_task.signals.finished.connect(self.plot_error_curve)
+        self.error_curve_task.signals.failed.connect(
+            lambda message: print(f"Error curve failed: {message}")
+        )
+        self.error_plot_button.setEnabled(False)
+        self.error_curve_task.start()
+
+    def create_error_plot(self):
+        from pyqtgraph import PlotWidget, ViewBox
+
+        self.error_plot_widget = PlotWidget()
+        self.error_plot_widget.setTitle("Error Metric vs. Sampling Frequency")
+        self.error_plot_widget.setLabel("left", "Error")
+        self.error_plot_widget.setLabel("bottom", "Sampling Frequency [Hz]")
+        self.error_plot_widget.setLabel("right", "SNR [dB]")
+        self.error_plot_widget.addLegend()
+        self.mae_curve = self.error_plot_widget.plot(
+            [], [], pen="b", symbol="o", symbolSize=4, name="MAE"
+        )
+        self.rmse_curve = self.error_plot_widget.plot(
+            [], [], pen="y", symbol="o", symbolSize=4, name="RMSE"
+        )
+        # SNR lives on its own view box so it gets the right-hand axis.
+        error_plot_item = self.error_plot_widget.getPlotItem()
+        self.snr_view_box = ViewBox()
+        error_plot_item.scene().addItem(self.snr_view_box)
+        error_plot_item.getAxis("right").linkToView(self.snr_view_box)
+        self.snr_view_box.setXLink(error_plot_item)
+        error_plot_item.getViewBox().sigResized.connect(
+            lambda: self.snr_view_box.setGeometry(
+                error_plot_item.getViewBox().sceneBoundingRect()
             )
         )
+        self.snr_curve = self.error_plot_widget.plot([], [], pen="g", name="SNR [dB]")
+        error_plot_item.removeItem(self.snr_curve)
+        self.snr_view_box.addItem(self.snr_curve)
+        self.plot_grid_layout.addWidget(self.error_plot_widget)
+
+    def plot_error_curve(self, curve):
+        self.error_plot_button.setEnabled(True)
+        if self.error_plot_widget is None:
+            self.create_error_plot()
+        self.mae_curve.setData(curve["sampling_frequency"], curve["mae"])
+        self.rmse_curve.setData(curve["sampling_frequency"], curve["rmse"])
+        finite = np.isfinite(curve["snr_db"])
+        self.snr_curve.setData(
+            curve["sampling_frequency"][finite], curve["snr_db"][finite]
+        )
+        self.snr_view_box.enableAutoRange()
+        self.error_plot_widget.show()
 
-
-        defult_signals ={
+    def add_default_signals(self):
+        '''
+        Mix the default signals.
+        '''
+        defult_signals = {
             "signal 1" :{
                 "frequencies":[10, 15, 20],
                 "amplitudes":[5, 5, 10],
@@ -373,26 +657,8 @@ class SignalMixerApp(QWidget):
 
         for signal in defult_signals.values():
             self.add_default_signal(signal["frequencies"], signal["amplitudes"], signal["phases"])
-
-        self.setLayout(layout)
-        self.switch_mode()
-
-    def display_error_plot(self):
-        if not self.error_values:
-            print("No error values to plot!")
-            return
-
-        sampling_freqs, errors = zip(*self.error_values)
-        sampling_freqs = np.array(sampling_freqs)
-
-        plt.figure(figsize=(8, 5))
-        plt.plot(sampling_freqs, errors, marker="o", linestyle="-", color="b", label="Error Metric")
-        plt.xlabel("Sampling Frequency (Hz)")
-        plt.ylabel("Error Metric (Absolute Mean Difference)")
-        plt.title("Error Metric vs. Sampling Frequency")
-        plt.grid(True)
-        plt.legend()
-        plt.show()
+        self.startup_times["default_signals"] = time.perf_counter()
+        self.default_signals_ready.emit()
 
     def add_default_signal(self, frequencies, amplitudes, phases):
         '''
@@ -402,41 +668,27 @@ class SignalMixerApp(QWidget):
             amplitudes (list): List of signal amplitudes.
             phases (list): List of signal phases.
         '''
-        duration = self.duration
-
-        for frequency, amplitude, phase in zip(frequencies, amplitudes, phases):
-            wave = self.generate_wave(frequency, amplitude, phase, duration)
-
-            signal_description = f"Freq: {frequency} Hz, Amp: {amplitude}, Phase: {phase} rad"
-            self.signals.append((frequency, amplitude, phase))
-            self.plot_waveform(wave, signal_description)
-
-            list_item_widget = SignalListItemWidget(signal_description)
-            list_item_widget.delete_signal.connect(
-                lambda desc=signal_description: self.delete_signal(
-                    self.signal_list, desc, self.signals
-                )
-            )
-            list_item = QListWidgetItem(self.signal_list)
-            list_item.setSizeHint(list_item_widget.sizeHint())
-            self.signal_list.setItemWidget(list_item, list_item_widget)
+        # The components are mixed right away, so only the mix gets synthesized
+        # and plotted.
+        for component in zip(frequencies, amplitudes, phases):
+            self.add_pending_component(*component)
 
         if self.signal_list.count() > 0:
             self.signal_list.setCurrentRow(0)
 
         self.mix_button.click()
 
+    def apply_theme(self, mode):
+        QApplication.instance().setStyleSheet(load_stylesheet(mode))
+        self.current_mode = mode
+
     def switch_mode(self):
         if self.current_mode == "light":
-            with open("./Styles/darkMode.qss", "r") as f:
-                app.setStyleSheet(f.read())
-            self.current_mode = "dark"
+            self.apply_theme("dark")
             self.mode_button.setIcon(QIcon("./Icons/light-mode.png"))
         else:
-            with open("./Styles/lightMode.qss", "r") as f:
-                app.setStyleSheet(f.read())
+            self.apply_theme("light")
             self.mode_button.setIcon(QIcon("./Icons/dark-mode.png"))
-            self.current_mode = "light"
 
     def activate_slider(self):
 
@@ -445,7 +697,7 @@ class SignalMixerApp(QWidget):
         if self.radio1.isChecked():
             self.sampling_slider.setEnabled(True)
             self.sampling_slider_actual.setEnabled(False)
-            self.plot_sampling_markers()
+            self.reconstruct_signal()
         else:
             if self.f_max is None:
                 self.sampling_slider_actual.setRange(1, 400)
@@ -454,172 +706,188 @@ class SignalMixerApp(QWidget):
 
             self.sampling_slider_actual.setEnabled(True)
             self.sampling_slider.setEnabled(False)
-            self.plot_sampling_markers()
+            self.reconstruct_signal()
 
-    def get_sampling_markers(self):
-        sampling_interval = None
+    def current_sampling_frequency(self):
         if self.radio1.isChecked():
             factor = self.sampling_slider.value()
-            sampling_interval = 1 / (factor * self.f_max)
-            # print("1", sampling_interval)
+            return factor * self.f_max
+        if self.f_max is None:
+            self.sampling_slider_actual.setRange(1, 400)
         else:
-            if self.f_max is None:
-                self.sampling_slider_actual.setRange(1, 400)
-            else:
-                self.sampling_slider_actual.setRange(1, int(8 * self.f_max / 1.05))
-            factor = self.sampling_slider_actual.value()
-            self.sampling_label_end_2.setText(f"{self.sampling_slider_actual.value()}")
-            sampling_interval = 1 / factor
-            # print("2", sampling_interval)
+            self.sampling_slider_actual.setRange(1, int(8 * self.f_max / 1.05))
+        self.sampling_label_end_2.setText(f"{self.sampling_slider_actual.value()}")
+        return self.sampling_slider_actual.value()
 
-        sampling_times = np.arange(0, self.duration, sampling_interval)
-        sampling_amplitudes = np.interp(
-            sampling_times, self.current_signal_t, self.current_signal_data
-        )
-        # print("fmax", self.f_max)
-        return sampling_amplitudes, sampling_times
+    def current_sampler(self):
+        '''
+        Sampler for the selected sampling mode. Random modes use a fixed seed,
+        so a setting always gives the same sampling instants.
+        '''
+        mode = self.sampling_mode_combo.currentText()
+        if mode == "Jittered":
+            return partial(
+                dsp.sample_jittered,
+                jitter=self.jitter_input.value() / 100,
+                rng=self.sampling_seed,
+            )
+        if mode == "Random":
+            return partial(dsp.sample_random, rng=self.sampling_seed)
+        if mode == "Polyphase":
+            return partial(dsp.sample_polyphase, anti_alias=self.anti_alias_check.isChecked())
+        return dsp.sample_uniform
+
+    def sampling_key(self):
+        mode = self.sampling_mode_combo.currentText()
+        if mode == "Jittered":
+            return mode, self.jitter_input.value(), self.sampling_seed
+        if mode == "Random":
+            return mode, self.sampling_seed
+        if mode == "Polyphase":
+            return mode, self.anti_alias_check.isChecked()
+        return mode
 
     def reconstruct_signal(self):
-        sampling_amplitudes, sampling_times = self.get_sampling_markers()
-
-        method = self.comboBox.currentText()
-        if method == "Whittaker-Shannon":
-            reconstructed_signal = self.whittaker_shannon_reconstruction(
-                sampling_amplitudes, sampling_times, self.current_signal_t
-            )
-        elif method == "Linear":
-            reconstructed_signal = self.linear_interpolation(
-                sampling_amplitudes, sampling_times, self.current_signal_t
-            )
-        elif method == "Cubic":
-            reconstructed_signal = self.cubic_interpolation(
-                sampling_amplitudes, sampling_times, self.current_signal_t
-            )
+        '''
+        Schedule a reconstruction of the displayed signal. Requests are
+        debounced and run on a worker thread; see build_reconstruction_job.
+        '''
+        self.reconstruction_scheduler.request()
 
-        if self.f_max is None:
-            raise AttributeError("Please select a signal first")
+    def build_reconstruction_job(self):
+        '''
+        Describe sampling the displayed signal at the current slider setting
+        and reconstructing it. Both run on the worker thread, and the markers
+        are drawn from the samples in the result.
+        '''
+        if self.current_displayed_signal is None or not hasattr(self, "current_signal_t"):
+            return None
+        if not self.f_max:
+            print("Please select a signal with a non-zero bandwidth first")
+            return None
 
-        self.plot_reconstructed_signal(reconstructed_signal)
+        sampling_frequency = self.current_sampling_frequency()
+        reference = self.current_reference()
 
-    def plot_reconstructed_signal(self, reconstructed_signal):
-        self.reconstruct_plot_widget.clear()
-        self.difference_plot_widget.clear()
-        self.freq_plot_widget.clear()
+        method = self.comboBox.currentText()
+        window, segments = SPECTRUM_WINDOWS[self.window_combo.currentText()]
+        segment = len(self.current_signal_t) // segments if segments else None
+        cache_key = None
+        if self.current_displayed_signal in self.registry:
+            cache_key = (
+                self.registry.signal_hash(self.current_displayed_signal),
+                self.noise_key,
+                method,
+                float(sampling_frequency),
+                window,
+                segment,
+                self.sampling_key(),
+            )
 
-        self.reconstruct_plot_widget.setYLink(self.difference_plot_widget)
-        self.reconstruct_plot_widget.plot(
-            self.current_signal_t,
-            reconstructed_signal,
-            pen="r",
-            name="Reconstructed Signal",
+        return cache_key, dict(
+            sampler=self.current_sampler(),
+            signal=self.current_signal_data,
+            duration=self.duration,
+            method=method,
+            t=self.current_signal_t,
+            reference=reference,
+            sampling_frequency=sampling_frequency,
+            window=window,
+            segment=segment,
         )
 
-        if self.signal is not None and self.signal.any():
-            difference_signal = self.signal - reconstructed_signal
-        else:
-            difference_signal = self.current_signal_data - reconstructed_signal
-
-        error_metric = np.mean(np.abs(difference_signal))
-        if hasattr(self, "updated_fs"):
-            self.error_values.append((self.updated_fs, error_metric))
-
-        self.difference_plot_widget.plot(
-            self.current_signal_t, difference_signal, pen="g", name="Difference Signal"
+    def current_reference(self):
+        '''
+        Signal the reconstruction is compared against: the clean signal when
+        noise has been added, the displayed signal otherwise.
+        '''
+        if (
+            self.signal is not None
+            and len(self.signal) == len(self.current_signal_data)
+            and self.signal.any()
+        ):
+            return self.signal
+        return self.current_signal_data
+
+    def update_cache_label(self):
+        stats = self.reconstruction_cache.stats()
+        self.cache_label.setText(
+            f"Cache: {stats['hits']} hits / {stats['misses']} misses, "
+            f"{stats['entries']} entries ({stats['bytes'] / 1e6:.1f} MB)"
         )
 
-        if self.radio1.isChecked():
-            self.updated_fs = self.sampling_slider.value() * self.f_max
-        elif self.radio2.isChecked():
-            if self.f_max is None:
-                self.sampling_slider_actual.setRange(1, 400)
-            else:
-                self.sampling_slider_actual.setRange(1, int(8 * self.f_max / 1.05))
-            self.updated_fs = self.sampling_slider_actual.value()
-
-        N = len(reconstructed_signal)
-        fft_values = np.fft.fft(reconstructed_signal)
-        fft_magnitude = np.abs(fft_values[:N // 2]) * 2 / N
-        freq_data = np.fft.fftfreq(N, d=(self.current_signal_t[1] - self.current_signal_t[0]))[:N // 2]
-        symmetric_freq_data = np.concatenate((-freq_data[::-1], freq_data))
-        symmetric_fft_magnitude = np.concatenate((fft_magnitude[::-1], fft_magnitude))
-
-        mask = (symmetric_freq_data >= -1 * self.f_max) & (symmetric_freq_data <= 1 * self.f_max)
-        final_freq_data = symmetric_freq_data[mask]
-        final_fft_magnitude = symmetric_fft_magnitude[mask]
-
-        self.freq_plot_widget.plot(final_freq_data, final_fft_magnitude, pen='y', name="Periodic Frequency Signal")
-        self.freq_plot_widget.plot(final_freq_data + 1 * self.updated_fs, final_fft_magnitude, pen='r', name="Periodic Frequency Signal")
-        self.freq_plot_widget.plot(final_freq_data - 1 * self.updated_fs, final_fft_magnitude, pen='r', name="Periodic Frequency Signal")
-        max_freq_magnitude = max(final_fft_magnitude)
-        self.freq_plot_widget.setYRange(0, max_freq_magnitude)
-
-        self.reconstruct_plot_widget.setTitle("Reconstructed Signal")
-        self.reconstruct_plot_widget.setLabel("left", "Amplitude")
-        self.reconstruct_plot_widget.setLabel("bottom", "Time [s]")
-
-        self.difference_plot_widget.setTitle("Difference Signal")
-        self.difference_plot_widget.setLabel("left", "Amplitude")
-        self.difference_plot_widget.setLabel("bottom", "Time [s]")
-
-        self.freq_plot_widget.setTitle("Frequency Domain")
-        self.freq_plot_widget.setLabel("left", "Magnitude")
-        self.freq_plot_widget.setLabel("bottom", "Frequency [Hz]")
-
-    def whittaker_shannon_reconstruction(self, amplitude, sampling_time, current_time):
-        T = sampling_time[1] - sampling_time[0]
-        sinc_matrix = np.tile(current_time, (len(sampling_time), 1)) - np.tile(sampling_time[:, np.newaxis],
-                                                                               (1, len(current_time)))
-        return np.sum(amplitude[:, np.newaxis] * np.sinc((sinc_matrix / T)), axis=0)
-
-    def linear_interpolation(self, amplitude, sampling_time, current_time):
-        linear_interpolator = interp1d(sampling_time, amplitude, kind='linear', fill_value="extrapolate")
-        return linear_interpolator(current_time)
-
-    def cubic_interpolation(self, amplitude, sampling_time, current_time):
-        cubic_interpolator = CubicSpline(sampling_time, amplitude)
-        return cubic_interpolator(current_time)
+    def update_memory_label(self):
+        '''
+        Show the memory held by the signals, in total and per signal as a
+        tooltip on each row of the result list.
+        '''
+        for i in range(self.result_list.count()):
+            item_widget = self.result_list.itemWidget(self.result_list.item(i))
+            # Look entries up without loading the ones not opened yet.
+            entry = self.registry.entries.get(item_widget.signal_id) if item_widget else None
+            if entry is not None and entry.loader is not None:
+                item_widget.setToolTip("Not loaded")
+            elif entry is not None:
+                item_widget.setToolTip(
+                    f"{len(entry.data)} samples, {entry.nbytes / 1e6:.1f} MB"
+                )
+        self.memory_label.setText(
+            f"Signals: {len(self.registry)} using {self.registry.nbytes / 1e6:.1f} MB"
+        )
 
-    def plot_waveform_with_markers(self, signal, description=None):
-        self.main_plot_widget.clear()
+    def plot_reconstructed_signal(self, result):
+        reconstructed_signal = result.reconstructed
+        difference_signal = result.difference
+        self.update_cache_label()
+
+        if result.sampling_times is not None:
+            self.plot_sampling_markers(result.sampling_amplitudes, result.sampling_times)
+        self.reconstruct_curve.set_data(self.current_signal_t, reconstructed_signal)
+
+        self.updated_fs = result.sampling_frequency
+        self.error_values.append((self.updated_fs, result.error))
+
+        self.difference_curve.set_data(self.current_signal_t, difference_signal)
+
+        # Mirror only the band up to f_max into a two-sided spectrum.
+        band = np.searchsorted(result.frequencies, self.f_max, side="right")
+        freq_data = result.frequencies[:band]
+        fft_magnitude = result.magnitude[:band]
+        final_freq_data = np.concatenate((-freq_data[:0:-1], freq_data))
+        final_fft_magnitude = np.concatenate((fft_magnitude[:0:-1], fft_magnitude))
+
+        self.freq_curve.setData(final_freq_data, final_fft_magnitude)
+        self.freq_image_curves[0].setData(final_freq_data + 1 * self.updated_fs, final_fft_magnitude)
+        self.freq_image_curves[1].setData(final_freq_data - 1 * self.updated_fs, final_fft_magnitude)
+        if len(final_fft_magnitude):
+            self.freq_plot_widget.setYRange(0, float(np.max(final_fft_magnitude)))
+
+    def clear_result_plots(self):
+        self.reconstruct_curve.clear()
+        self.difference_curve.clear()
+        self.freq_curve.setData([], [])
+        for curve in self.freq_image_curves:
+            curve.setData([], [])
+
+    def clear_main_plot(self):
+        self.main_curve.clear()
+        self.sample_markers.clear()
+
+    def plot_waveform_with_markers(self, signal, signal_id=None):
         current_time = np.linspace(0, self.duration, len(signal))
+        self.clear_main_plot()
+        self.main_curve.set_data(current_time, signal)
 
-        self.main_plot_widget.plot(current_time, signal, pen='b')
-
-        self.main_plot_widget.setTitle("Signal Waveform")
-        self.main_plot_widget.setLabel("left", "Amplitude")
-        self.main_plot_widget.setLabel("bottom", "Time [s]")
-
-        self.current_displayed_signal = description
+        self.current_displayed_signal = signal_id
         self.current_signal_t = current_time
         self.current_signal_data = signal
 
-    def plot_sampling_markers(self):
-
-        sampling_amplitudes, sampling_times = self.get_sampling_markers()
-
-        if not hasattr(self, "marker_items"):
-            self.marker_items = {}
-
-        signal_key = self.current_displayed_signal
-
-        if signal_key in self.marker_items:
-            self.main_plot_widget.removeItem(self.marker_items[signal_key])
-
-        marker_item = ScatterPlotItem(symbol="o", pen=None, brush="r", size=6)
-        self.marker_items[signal_key] = marker_item
-        self.main_plot_widget.addItem(marker_item)
-
-        spots = [
-            {"pos": (time, amp)}
-            for time, amp in zip(sampling_times, sampling_amplitudes)
-        ]
-        marker_item.setData(spots)
+    def plot_sampling_markers(self, sampling_amplitudes, sampling_times):
+        self.sample_markers.set_data(sampling_times, sampling_amplitudes)
 
     def display_selected_signal(self):
 
-        self.difference_plot_widget.clear()
-        self.reconstruct_plot_widget.clear()
-        self.freq_plot_widget.clear()
+        self.clear_result_plots()
 
         selected_signal_items = self.signal_list.selectedItems()
         if selected_signal_items:
@@ -630,261 +898,545 @@ class SignalMixerApp(QWidget):
 
             item = selected_signal_items[0]
             item_widget = self.signal_list.itemWidget(item)
-            if item_widget:
-                signal_description = item_widget.description
-                for signal in self.signals:
-                    if (
-                            signal_description
-                            == f"Freq: {signal[0]} Hz, Amp: {signal[1]}, Phase: {signal[2]} rad"
-                    ):
-                        wave = self.generate_wave(signal[0], signal[1], signal[2], 1)
-                        self.plot_waveform(wave, signal_description)
-                        break
+            if item_widget and item_widget.signal_id in self.signals:
+                frequency, amplitude, phase = self.signals[item_widget.signal_id]
+                wave = self.generate_wave(frequency, amplitude, phase, 1)
+                self.plot_waveform(wave)
+
+    def selected_result_item(self):
+        '''
+        The result row to display when several are selected: the current
+        (last clicked) row if it is selected, else the first selected one.
+        '''
+        current = self.result_list.currentItem()
+        if current is not None and current.isSelected():
+            return current
+        selected_items = self.result_list.selectedItems()
+        return selected_items[0] if selected_items else None
 
     def display_selected_result(self):
-        selected_result_items = self.result_list.selectedItems()
-        if selected_result_items:
+        item = self.selected_result_item()
+        if item is not None:
             # Clear selection in the signal list
             self.signal_list.blockSignals(True)
             self.signal_list.clearSelection()
             self.signal_list.blockSignals(False)
 
-            item = selected_result_items[0]
             item_widget = self.result_list.itemWidget(item)
             if item_widget:
-                mixed_signal_description = item_widget.description
-                mixed_signal = self.result_signals.get(mixed_signal_description, None)
-                if mixed_signal is not None:
-                    # Check if the signal is a mixed signal or an uploaded signal
-                    if mixed_signal_description in self.mixed_signal_components:
-                        # get the frequency array values from the component description
-                        component_frequencies = [
-                            float(comp.split(" ")[1])
-                            for comp in self.mixed_signal_components[
-                                mixed_signal_description
-                            ]
-                        ]
-                        self.f_max = max(component_frequencies)*1.05
-                    else:
-                        fft_result = np.fft.fft(mixed_signal)
-                        freqs = np.fft.fftfreq(len(mixed_signal), 1 / self.fs)
-                        magnitude = np.abs(fft_result)
-
-                        positive_freqs = freqs[freqs >= 0]
-                        positive_magnitude = magnitude[freqs >= 0]
-                        max_freq_idx = np.argmax(positive_magnitude)
-                        self.f_max = positive_freqs[max_freq_idx]
-
-                    self.plot_waveform_with_markers(
-                        mixed_signal, mixed_signal_description
-                    )
-                    self.plot_sampling_markers()
+                entry = self.registry.get(item_widget.signal_id)
+                if entry is not None:
+                    # A newly selected signal is shown clean until noise is added.
+                    self.signal = None
+                    self.noise_key = None
+                    self.duration = entry.duration
+                    self.set_window_controls(entry)
+                    self.f_max = self.signal_f_max(entry)
+
+                    self.plot_waveform_with_markers(entry.data, entry.id)
                     self.reconstruct_signal()
+                    self.show_components(entry)
+                    self.update_memory_label()
+
+    def signal_f_max(self, entry):
+        # Check if the signal is a mixed signal or an uploaded signal
+        if entry.composite is not None:
+            return entry.composite.f_max * 1.05
+        return dsp.spectrum.default_engine.occupied_bandwidth(
+            entry.data, entry.fs, key=entry.signal_hash
+        )
 
-                    self.components_list.clear()
-                    components = self.mixed_signal_components.get(
-                        mixed_signal_description, []
-                    )
-                    if components:
-                        self.components_list.addItems(components)
-                    else:
-                        self.components_list.addItem("No components found")
+    def show_components(self, entry):
+        self.components_list.clear()
+        composite = entry.composite
+        if composite is None or not len(composite):
+            self.components_list.addItem("No components found")
+            return
+        for index, component in enumerate(composite.components):
+            self.add_list_item(
+                self.components_list,
+                component_description(*component),
+                index,
+                lambda index, signal_id=entry.id: self.delete_component(signal_id, index),
+            )
+
+    def update_composite(self, signal_id):
+        '''
+        Publish the edited sum of a composite signal, dropping everything
+        cached for its previous contents.
+        '''
+        entry = self.registry[signal_id]
+        signal_hash = self.registry.set_data(signal_id, entry.composite.data)
+        if signal_hash is not None:
+            self.reconstruction_cache.invalidate(signal_hash)
+            dsp.spectrum.default_engine.forget(signal_hash)
+        if self.current_displayed_signal == signal_id:
+            self.display_selected_result()
+
+    def add_component_to_mix(self):
+        '''
+        Add the component in the input fields to the selected mixed signal.
+        '''
+        entry = self.registry.get(self.current_displayed_signal)
+        if entry is None or entry.composite is None:
+            print("Select a mixed signal to add the component to!")
+            return
+        component = self.read_component_inputs()
+        if component is None:
+            return
+        entry.composite.add(*component)
+        self.update_composite(entry.id)
 
     def mix_signals(self):
-        mixed_signal = np.zeros(int(self.fs))
-        components = []
         self.duration = 10
-        max_frequency = 0
-        for frequency, amplitude, phase in self.signals:
-            wave = self.generate_wave(frequency, amplitude, phase, self.duration)
-            mixed_signal += wave
-            components.append(
-                f"Freq: {frequency} Hz, Amp: {amplitude}, Phase: {phase} rad"
-            )
-            max_frequency = max(max_frequency, frequency)
-
-        mixed_signal_description = f"Signal{len(self.result_list) + 1}"
-        self.result_signals[mixed_signal_description] = mixed_signal
-        self.mixed_signal_components[mixed_signal_description] = components
+        composite = dsp.CompositeSignal(self.signals.values(), self.duration, self.fs)
+
+        signal_id = self.registry.add(
+            f"Signal{len(self.result_list) + 1}",
+            composite.data,
+            self.duration,
+            self.fs,
+            composite=composite,
+        )
+        entry = self.registry[signal_id]
 
-        self.f_max = max_frequency
-        list_item_widget = SignalListItemWidget(mixed_signal_description)
-        list_item_widget.delete_signal.connect(
-            lambda desc=mixed_signal_description: self.delete_signal(
-                self.result_list, desc, self.result_signals
-            )
+        self.f_max = composite.f_max
+        list_item = self.add_list_item(
+            self.result_list, entry.name, signal_id, self.delete_result
         )
-        list_item = QListWidgetItem(self.result_list)
-        list_item.setSizeHint(list_item_widget.sizeHint())
-        self.result_list.setItemWidget(list_item, list_item_widget)
 
-        self.plot_waveform(mixed_signal, mixed_signal_description)
+        self.plot_waveform(entry.data, signal_id)
 
         self.signals.clear()
         self.signal_list.clear()
 
-        list_item.setSelected(True)
+        self.result_list.setCurrentItem(
+            list_item, QtCore.QItemSelectionModel.SelectionFlag.ClearAndSelect
+        )
         self.reconstruct_signal()
 
-
-
     def generate_wave(self, frequency, amplitude, phase, duration):
-        t = np.linspace(0, duration, int(self.fs), endpoint=False)
-        wave = amplitude * np.sin(2 * np.pi * frequency * t + phase)
-        # print(
-        #     f"Generated wave: freq={frequency}, amp={amplitude}, phase={phase}, duration={duration}"
-        # )
-        return wave
+        return dsp.generate_wave(frequency, amplitude, phase, duration, self.fs)
 
-    def add_signal(self):
+    def read_component_inputs(self):
+        '''
+        Parse the frequency, amplitude and phase fields and clear them.
+        Returns None if the input is not valid.
+        '''
         try:
             frequency = float(self.freq_input.text())
             amplitude = float(self.amp_input.text())
             phase = float(self.phase_input.text()) if self.phase_input.text() else 0.0
         except ValueError:
             # print("Please enter valid numbers.")
-            return
-
-        self.signals.append((frequency, amplitude, phase))
-
-        signal_description = (
-            f"Freq: {frequency} Hz, Amp: {amplitude}, Phase: {phase} rad"
-        )
-        list_item_widget = SignalListItemWidget(signal_description)
-        list_item_widget.delete_signal.connect(
-            lambda desc=signal_description: self.delete_signal(
-                self.signal_list, desc, self.signals
-            )
-        )
-
-        list_item = QListWidgetItem(self.signal_list)
-        list_item.setSizeHint(list_item_widget.sizeHint())
-        self.signal_list.setItemWidget(list_item, list_item_widget)
-        list_item.setSelected(True)
+            return None
 
         self.freq_input.clear()
         self.amp_input.clear()
         self.phase_input.clear()
+        return frequency, amplitude, phase
+
+    def add_signal(self):
+        component = self.read_component_inputs()
+        if component is None:
+            return
+        list_item = self.add_pending_component(*component)
+        list_item.setSelected(True)
 
         # Plot the newly added signal
-        wave = self.generate_wave(frequency, amplitude, phase, 1)
-        self.plot_waveform(wave, signal_description)
+        wave = self.generate_wave(*component, 1)
+        self.plot_waveform(wave)
+
+    def add_pending_component(self, frequency, amplitude, phase):
+        component_id = next(self.component_ids)
+        self.signals[component_id] = (frequency, amplitude, phase)
+        return self.add_list_item(
+            self.signal_list,
+            component_description(frequency, amplitude, phase),
+            component_id,
+            self.delete_pending_component,
+        )
+
+    def add_list_item(self, list_widget, description, item_id, on_delete):
+        '''
+        Append a row with a delete button to `list_widget`.
+        Args:
+            list_widget (QListWidget): List to add the row to.
+            description (str): Text shown in the row.
+            item_id (int): ID passed to `on_delete` when the row is deleted.
+            on_delete (callable): Called with the ID of the deleted row.
+        Returns:
+            QListWidgetItem: The new row.
+        '''
+        list_item_widget = SignalListItemWidget(description, item_id)
+        list_item_widget.delete_signal.connect(on_delete)
+        list_item = QListWidgetItem(list_widget)
+        list_item.setSizeHint(list_item_widget.sizeHint())
+        list_widget.setItemWidget(list_item, list_item_widget)
+        return list_item
 
-    def delete_signal(self, list_widget, description, data_structure):
+    def remove_list_item(self, list_widget, item_id):
         for i in range(list_widget.count()):
-            item = list_widget.item(i)
-            item_widget = list_widget.itemWidget(item)
-            if item_widget and item_widget.description == description:
+            item_widget = list_widget.itemWidget(list_widget.item(i))
+            if item_widget and item_widget.signal_id == item_id:
                 list_widget.takeItem(i)
-                break
+                return
 
-        if data_structure is self.signals:
-            for signal in self.signals:
-                signal_description = (
-                    f"Freq: {signal[0]} Hz, Amp: {signal[1]}, Phase: {signal[2]} rad"
-                )
-                if signal_description == description:
-                    self.signals.remove(signal)
-                    break
-        else:
-            if description in data_structure:
-                del data_structure[description]
-
-        if self.current_displayed_signal == description:
-            if data_structure:
-                first_signal_description = next(iter(data_structure))
-                self.plot_waveform(
-                    data_structure[first_signal_description], first_signal_description
-                )
+    def delete_pending_component(self, component_id):
+        self.remove_list_item(self.signal_list, component_id)
+        self.signals.pop(component_id, None)
+
+    def delete_component(self, signal_id, index):
+        entry = self.registry.get(signal_id)
+        if entry is None:
+            return
+        entry.composite.remove(index)
+        self.update_composite(signal_id)
+        if self.current_displayed_signal != signal_id:
+            self.show_components(entry)
+
+    def delete_result(self, signal_id):
+        self.remove_list_item(self.result_list, signal_id)
+        entry = self.registry.remove(signal_id)
+        if entry is None:
+            return
+        if entry.hashed:
+            self.reconstruction_cache.invalidate(entry.signal_hash)
+            dsp.spectrum.default_engine.forget(entry.signal_hash)
+
+        if self.current_displayed_signal == signal_id:
+            first_id = next(iter(self.registry.entries), None)
+            if first_id is not None:
+                first_entry = self.registry[first_id]
+                self.plot_waveform(first_entry.data, first_entry.id)
             else:
-                self.main_plot_widget.clear()
-                self.reconstruct_plot_widget.clear()
-                self.difference_plot_widget.clear()
-                self.freq_plot_widget.clear()
+                self.clear_main_plot()
+                self.clear_result_plots()
                 self.current_displayed_signal = None
 
-        components = self.mixed_signal_components.get(description, [])
-        if components:
+        if entry.composite is not None:
             self.components_list.clear()
+        self.update_memory_label()
 
     def upload_signal(self):
         file_dialog = QFileDialog()
         file_path, _ = file_dialog.getOpenFileName(
             self, "Open Signal File", "", "Text Files (*.txt *.csv)"
         )
-        self.duration = 1
         if file_path:
             try:
-
-                signal_data = np.loadtxt(file_path, delimiter=",")
-
-                if signal_data.shape[1] > 1:
-                    signal = signal_data[:1000, 1]
-                else:
-                    signal = signal_data[:1000, 0]
-
-                signal_description = f"Uploaded Signal ({file_path.split('/')[-1]})"
-                list_item_widget = SignalListItemWidget(signal_description)
-                list_item_widget.delete_signal.connect(
-                    lambda desc=signal_description: self.delete_signal(
-                        self.result_list, desc, self.result_signals
-                    )
+                recording = dsp.Recording(file_path)
+
+                signal_id = self.registry.add(
+                    f"Uploaded Signal ({file_path.split('/')[-1]})",
+                    np.empty(0),
+                    0,
+                    recording.fs,
+                    recording=recording,
+                )
+                self.add_list_item(
+                    self.result_list,
+                    self.registry[signal_id].name,
+                    signal_id,
+                    self.delete_result,
                 )
 
-                list_item = QListWidgetItem(self.result_list)
-                list_item.setSizeHint(list_item_widget.sizeHint())
-                self.result_list.setItemWidget(list_item, list_item_widget)
-
-                self.result_signals[signal_description] = signal
-
-                self.plot_waveform(signal, signal_description)
+                self.load_recording_window(
+                    signal_id, 0, min(DEFAULT_WINDOW_SECONDS, recording.duration)
+                )
+                self.plot_waveform(self.registry[signal_id].data, signal_id)
+                self.update_memory_label()
 
             except Exception as e:
                 print(f"Failed to load signal: {e}")
 
-    def plot_waveform(self, signal, description=None):
-        self.main_plot_widget.clear()
-        t = np.linspace(0, self.duration, len(signal))
-        self.main_plot_widget.plot(t, signal, pen="b")
-        self.main_plot_widget.setTitle("Signal Waveform")
-        self.main_plot_widget.setLabel("left", "Amplitude")
-        self.main_plot_widget.setLabel("bottom", "Time [s]")
+    def save_project(self):
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Save Project", "", f"{PROJECT_FILTER};;{COMPRESSED_PROJECT_FILTER}"
+        )
+        if not file_path:
+            return
+        if not file_path.endswith(".npz"):
+            file_path += ".npz"
+        state = {
+            "pending_components": [list(component) for component in self.signals.values()],
+            "error_values": [
+                [float(fs), float(error)] for fs, error in self.error_values
+            ],
+            "noise_model": self.noise_model_combo.currentData(),
+            "noise_seed": self.noise_seed_input.value(),
+        }
+        try:
+            dsp.save_project(
+                file_path,
+                self.registry,
+                state,
+                compress=selected_filter == COMPRESSED_PROJECT_FILTER,
+            )
+        except Exception as e:
+            print(f"Failed to save project: {e}")
+
+    def load_project(self):
+        '''
+        Replace the session with a saved project. Signals are listed from
+        the project's manifest and their arrays are read when selected.
+        '''
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Load Project", "", f"{PROJECT_FILTER};;{COMPRESSED_PROJECT_FILTER}"
+        )
+        if not file_path:
+            return
+        previous_ids = list(self.registry.entries)
+        try:
+            signal_ids, state = dsp.load_project(file_path, self.registry)
+        except Exception as e:
+            print(f"Failed to load project: {e}")
+            return
+
+        self.current_displayed_signal = None
+        self.clear_main_plot()
+        self.clear_result_plots()
+        for signal_id in previous_ids:
+            self.delete_result(signal_id)
+        for component_id in list(self.signals):
+            self.delete_pending_component(component_id)
+
+        for signal_id in signal_ids:
+            name = self.registry.entries[signal_id].name
+            self.add_list_item(self.result_list, name, signal_id, self.delete_result)
+        for component in state.get("pending_components", []):
+            self.add_pending_component(*component)
+        self.error_values = [tuple(value) for value in state.get("error_values", [])]
+        for widget in (self.noise_model_combo, self.noise_seed_input):
+            widget.blockSignals(True)
+        model_index = self.noise_model_combo.findData(state.get("noise_model", "white"))
+        self.noise_model_combo.setCurrentIndex(max(0, model_index))
+        self.noise_seed_input.setValue(state.get("noise_seed", 0))
+        for widget in (self.noise_model_combo, self.noise_seed_input):
+            widget.blockSignals(False)
+
+        if self.result_list.count():
+            self.result_list.setCurrentRow(0)
+        self.update_memory_label()
+
+    def load_recording_window(self, signal_id, start, length):
+        '''
+        Read a segment of an uploaded recording and make it the signal shown
+        for `signal_id`.
+        '''
+        entry = self.registry[signal_id]
+        t, signal = entry.recording.window(start, length)
+        self.registry.set_data(
+            signal_id, signal, t[-1] if len(t) > 1 else 1 / entry.recording.fs
+        )
+        entry.window = (start, length)
+
+    def set_window_controls(self, entry):
+        recording = entry.recording if entry is not None else None
+        for spin_box in (self.window_start_input, self.window_length_input):
+            spin_box.blockSignals(True)
+            spin_box.setEnabled(recording is not None)
+        if recording is not None:
+            start, length = entry.window or (0, recording.duration)
+            self.window_start_input.setMaximum(recording.duration)
+            self.window_length_input.setMaximum(recording.duration)
+            self.window_start_input.setValue(start)
+            self.window_length_input.setValue(length)
+        for spin_box in (self.window_start_input, self.window_length_input):
+            spin_box.blockSignals(False)
+
+    def update_recording_window(self):
+        entry = self.registry.get(self.current_displayed_signal)
+        if entry is None or entry.recording is None:
+            return
+        window = (self.window_start_input.value(), self.window_length_input.value())
+        if window == entry.window:
+            return
+        self.load_recording_window(entry.id, *window)
+        self.display_selected_result()
 
-        self.current_displayed_signal = description
+    def plot_waveform(self, signal, signal_id=None):
+        # The displayed ID keys the reconstruction cache, so it always changes
+        # together with the arrays that get sampled.
+        entry = self.registry.get(signal_id) if signal_id is not None else None
+        if entry is not None:
+            self.duration = entry.duration
+        self.plot_waveform_with_markers(signal, signal_id)
 
     def add_noise(self):
         '''
-        Add noise to the selected signal based on the SNR value.
+        Add noise to the selected signal based on the SNR value, noise model
+        and seed. The noise is reproducible, so reconstructions of a noisy
+        signal stay cached under (model, seed, SNR).
         '''
         snr_value = self.snr_slider.value()
-        selected_items = self.result_list.selectedItems()
-        if selected_items:
-            item = selected_items[0]
+        model = self.noise_model_combo.currentData()
+        seed = self.noise_seed_input.value()
+        item = self.selected_result_item()
+        if item is not None:
             item_widget = self.result_list.itemWidget(item)
             if item_widget:
-                mixed_signal_description = item_widget.description
-                mixed_signal = self.result_signals.get(mixed_signal_description, None)
-
-                if mixed_signal is not None:
-                    self.signal = mixed_signal
-                    signal_description = mixed_signal_description
-
-                if snr_value > 0:
-                    signal_power = np.mean(np.square(self.signal))
-                    noise_power = signal_power / (10 ** (snr_value / 10))
-                    noise = np.sqrt(noise_power) * np.random.normal(size=len(self.signal))
-                    noisy_signal = self.signal + noise
-                else:
-                    noisy_signal = self.signal
-                self.noisy_signals[signal_description] = noisy_signal
-                self.plot_waveform_with_markers(noisy_signal, signal_description)
-                self.reconstruct_signal() 
+                entry = self.registry.get(item_widget.signal_id)
+                if entry is None:
+                    return
+                self.signal = entry.data
+
+                self.noise_key = (model, seed, snr_value)
+                noisy_signal = dsp.noise.default_bank.add(self.signal, snr_value, model, seed)
+                entry.noisy = noisy_signal
+                self.plot_waveform_with_markers(noisy_signal, entry.id)
+                self.reconstruct_signal()
+                self.update_memory_label()
+
+    def update_noise(self):
+        # A new model or seed only applies once noise has been added.
+        if self.noise_key is not None:
+            self.add_noise()
+
+    def open_stream_window(self):
+        if self.stream_window is None:
+            from stream_view import StreamWindow
+
+            self.stream_window = StreamWindow()
+        self.stream_window.show()
+        self.stream_window.raise_()
+
+    def compare_selected(self):
+        '''
+        Reconstruct every selected result signal with the current method and
+        sampling settings, side by side on a process pool. With the factor
+        slider each signal is sampled relative to its own bandwidth.
+        '''
+        entries = []
+        for item in self.result_list.selectedItems():
+            item_widget = self.result_list.itemWidget(item)
+            if item_widget and item_widget.signal_id in self.registry:
+                entries.append(self.registry[item_widget.signal_id])
+        if not entries:
+            print("Select one or more signals to compare")
+            return
+
+        method = self.comboBox.currentText()
+        window, segments = SPECTRUM_WINDOWS[self.window_combo.currentText()]
+        jobs = []
+        for entry in entries:
+            data = np.asarray(entry.data)
+            t = np.linspace(0, entry.duration, len(data))
+            # Sampling and bandwidth estimates run in the comparison workers;
+            # only a mixed signal's bandwidth is known without a pass over it.
+            if self.radio1.isChecked():
+                f_max = self.signal_f_max(entry) if entry.composite is not None else None
+                rate = dict(factor=self.sampling_slider.value(), f_max=f_max)
+            else:
+                rate = dict(sampling_frequency=self.sampling_slider_actual.value())
+            jobs.append(
+                dict(
+                    name=entry.name,
+                    t=t,
+                    reference=data,
+                    method=method,
+                    sampler=self.current_sampler(),
+                    duration=entry.duration,
+                    window=window,
+                    segment=len(t) // segments if segments else None,
+                    **rate,
+                )
+            )
+
+        if self.comparison_window is None:
+            from comparison_view import ComparisonWindow
+
+            self.comparison_window = ComparisonWindow()
+        self.comparison_window.compare(jobs)
+        self.comparison_window.show()
+        self.comparison_window.raise_()
+
+    def set_precision(self, name):
+        '''
+        Switch the precision signals are created, stored and processed in,
+        converting the signals already loaded.
+        '''
+        dsp.set_precision(name)
+        for signal_hash in self.registry.set_dtype(dsp.PRECISIONS[name]):
+            self.reconstruction_cache.invalidate(signal_hash)
+            dsp.spectrum.default_engine.forget(signal_hash)
+        self.error_values = []
+        if self.current_displayed_signal in self.registry:
+            self.display_selected_result()
+        self.update_memory_label()
 
     def update_snr_value(self, value):
         self.snr_value.setText("SNR Level : " + str(value))
 
+    def toggle_profiling(self):
+        profiler = instrumentation.profiler
+        profiler.enabled = not profiler.enabled
+        self.latency_hud.set_active(profiler.enabled)
+
+    def save_trace(self, path=None):
+        path = path or time.strftime("trace-%Y%m%d-%H%M%S.json")
+        instrumentation.profiler.dump_chrome_trace(path)
+        print(f"Saved timing trace to {path}")
 
-app = QApplication(sys.argv)
-window = SignalMixerApp()
-window.show()
-sys.exit(app.exec())
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            QTimer.singleShot(0, self.show_plots)
+
+    def show_plots(self):
+        '''
+        Build the plots and mix the default signals into them. Runs once the
+        first frame is painted, so the window appears before either.
+        '''
+        self.startup_times["first_frame"] = time.perf_counter()
+        self.create_plots()
+        self.startup_times["plots"] = time.perf_counter()
+        self.add_default_signals()
+
+    def closeEvent(self, event):
+        if os.environ.get(instrumentation.TRACE_ENV):
+            self.save_trace(os.environ[instrumentation.TRACE_ENV])
+        self.reconstruction_scheduler.shutdown()
+        if self.stream_window is not None:
+            self.stream_window.close()
+        if self.comparison_window is not None:
+            self.comparison_window.close()
+            self.comparison_window.shutdown()
+        super().closeEvent(event)
+
+
+def print_startup_report(window, imported):
+    '''
+    Print how long each startup phase took, followed by the slowest
+    imports of main.py measured in a fresh interpreter.
+    '''
+    from dsp.importtime import format_report, measure_import_time
+
+    times = window.startup_times
+    phases = [
+        ("Imports", PROCESS_START, imported),
+        ("Window construction", imported, times["window"]),
+        ("First frame", times["window"], times["first_frame"]),
+        ("Plots", times["first_frame"], times["plots"]),
+        ("Default signals", times["plots"], times["default_signals"]),
+    ]
+    for name, start, end in phases:
+        print(f"{name + ':':<22} {(end - start) * 1000:8.1f} ms")
+    print(f"{'Time to first frame:':<22} {(times['first_frame'] - PROCESS_START) * 1000:8.1f} ms")
+    print()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    print(format_report(*measure_import_time("main", cwd=directory)))
+
+
+if __name__ == "__main__":
+    imported = time.perf_counter()
+    app = QApplication(sys.argv)
+    window = SignalMixerApp()
+    window.show()
+    if STARTUP_REPORT_FLAG in sys.argv:
+        # Report once the default signals are in, then exit.
+        window.default_signals_ready.connect(
+            lambda: (print_startup_report(window, imported), app.quit())
+        )
+    sys.exit(app.exec())
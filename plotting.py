@@ -0,0 +1,71 @@
+from pyqtgraph import ScatterPlotItem, mkPen
+
+from dsp.lod import MinMaxPyramid
+
+
+class LodCurve:
+    '''
+    A persistent curve on a PlotWidget that draws long signals from a
+    min/max pyramid. Only about `points_per_pixel` points per horizontal
+    pixel of the current view are handed to pyqtgraph, and panning or
+    zooming refetches them from the pyramid.
+    '''
+
+    def __init__(self, plot_widget, points_per_pixel=2, **plot_kwargs):
+        self.plot_widget = plot_widget
+        self.points_per_pixel = points_per_pixel
+        self.item = plot_widget.plot([], [], **plot_kwargs)
+        self.pyramid = None
+
+        view_box = plot_widget.getViewBox()
+        view_box.sigXRangeChanged.connect(self.refresh)
+        view_box.sigResized.connect(self.refresh)
+
+    def set_data(self, t, y):
+        self.pyramid = MinMaxPyramid(t, y)
+        view_box = self.plot_widget.getViewBox()
+        if view_box.autoRangeEnabled()[0] and len(self.pyramid):
+            # Hand over the full extent so auto-ranging sees the whole signal.
+            self.refresh(x_range=(t[0], t[-1]))
+        else:
+            self.refresh()
+
+    def clear(self):
+        self.pyramid = None
+        self.item.setData([], [])
+
+    def refresh(self, *args, x_range=None):
+        if self.pyramid is None:
+            return
+        view_box = self.plot_widget.getViewBox()
+        if x_range is None:
+            x_range = view_box.viewRange()[0]
+        pixels = max(100, int(view_box.width()))
+        x, y = self.pyramid.query(x_range[0], x_range[1], pixels * self.points_per_pixel)
+        self.item.setData(x, y)
+
+
+class SampleMarkers:
+    '''
+    Sampling markers drawn from contiguous x/y arrays into one reused
+    ScatterPlotItem. Above `max_markers` samples the individual symbols are
+    unreadable anyway, so the samples are drawn as a decimated line instead.
+    '''
+
+    def __init__(self, plot_widget, max_markers=2000, **scatter_kwargs):
+        self.max_markers = max_markers
+        self.scatter = ScatterPlotItem(**scatter_kwargs)
+        plot_widget.addItem(self.scatter)
+        self.line = LodCurve(plot_widget, pen=mkPen(scatter_kwargs.get("brush", "r")))
+
+    def set_data(self, x, y):
+        if len(x) > self.max_markers:
+            self.scatter.clear()
+            self.line.set_data(x, y)
+        else:
+            self.line.clear()
+            self.scatter.setData(x=x, y=y)
+
+    def clear(self):
+        self.scatter.clear()
+        self.line.clear()
@@ -0,0 +1,198 @@
+import numpy as np
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import (
+    QComboBox,
+    QDoubleSpinBox,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+    QWidget,
+)
+from pyqtgraph import PlotWidget
+
+from dsp.streaming import (
+    DEFAULT_PORT,
+    CsvReplaySource,
+    RingBuffer,
+    SocketSource,
+    StreamingReconstructor,
+    StreamStats,
+)
+from plotting import LodCurve, SampleMarkers
+
+
+class StreamWindow(QWidget):
+    '''
+    Samples and reconstructs a live stream over a rolling window. The
+    source is polled on a timer; every poll is fed to a
+    StreamingReconstructor and appended to ring buffers that hold the
+    window being drawn.
+    '''
+
+    def __init__(self, poll_ms=30, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Stream")
+        self.setGeometry(150, 150, 1000, 600)
+        self.source = None
+        self.reconstructor = None
+        self.stats = StreamStats()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(poll_ms)
+        self.timer.timeout.connect(self.poll)
+
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+
+        self.source_combo = QComboBox()
+        self.source_combo.addItems(["Replay CSV", "UDP"])
+        self.port_input = QSpinBox()
+        self.port_input.setRange(1024, 65535)
+        self.port_input.setValue(DEFAULT_PORT)
+        self.rate_input = QDoubleSpinBox()
+        self.rate_input.setRange(1, 1_000_000)
+        self.rate_input.setValue(1000)
+        self.rate_input.setSuffix(" Hz in")
+        self.fs_input = QDoubleSpinBox()
+        self.fs_input.setRange(1, 100_000)
+        self.fs_input.setValue(100)
+        self.fs_input.setSuffix(" Hz fs")
+        self.fs_input.valueChanged.connect(self.restart_reconstruction)
+        self.window_input = QDoubleSpinBox()
+        self.window_input.setRange(0.1, 600)
+        self.window_input.setValue(5)
+        self.window_input.setSuffix(" s")
+        self.window_input.valueChanged.connect(self.allocate_buffers)
+        self.start_button = QPushButton("Start")
+        self.start_button.clicked.connect(self.toggle)
+
+        controls.addWidget(self.source_combo)
+        controls.addWidget(QLabel("Port:"))
+        controls.addWidget(self.port_input)
+        controls.addWidget(self.rate_input)
+        controls.addWidget(self.fs_input)
+        controls.addWidget(QLabel("Window:"))
+        controls.addWidget(self.window_input)
+        controls.addWidget(self.start_button)
+        layout.addLayout(controls)
+
+        self.status_label = QLabel("Stopped")
+        self.status_label.setObjectName("stream_status_label")
+        layout.addWidget(self.status_label)
+
+        self.stream_plot_widget = PlotWidget()
+        self.stream_plot_widget.setTitle("Stream")
+        self.stream_plot_widget.setLabel("left", "Amplitude")
+        self.stream_plot_widget.setLabel("bottom", "Time [s]")
+        self.stream_plot_widget.addLegend()
+        layout.addWidget(self.stream_plot_widget)
+        self.input_curve = LodCurve(self.stream_plot_widget, pen="y", name="Input")
+        self.reconstruct_curve = LodCurve(
+            self.stream_plot_widget, pen="r", name="Reconstructed"
+        )
+        self.sample_markers = SampleMarkers(
+            self.stream_plot_widget, size=6, brush="r", pen=None
+        )
+
+        self.difference_plot_widget = PlotWidget()
+        self.difference_plot_widget.setTitle("Difference Signal")
+        self.difference_plot_widget.setLabel("left", "Amplitude")
+        self.difference_plot_widget.setLabel("bottom", "Time [s]")
+        layout.addWidget(self.difference_plot_widget)
+        self.difference_curve = LodCurve(self.difference_plot_widget, pen="g")
+
+    def allocate_buffers(self):
+        '''
+        Size the ring buffers to hold one window of the stream.
+        '''
+        rate = self.source.fs if self.source is not None else self.rate_input.value()
+        span = self.window_input.value()
+        stream_points = max(2, int(np.ceil(span * rate)))
+        sample_points = max(2, int(np.ceil(span * self.fs_input.value())))
+        self.input_t = RingBuffer(stream_points)
+        self.input_x = RingBuffer(stream_points)
+        self.output_t = RingBuffer(stream_points)
+        self.output_x = RingBuffer(stream_points)
+        self.difference = RingBuffer(stream_points)
+        self.sample_t = RingBuffer(sample_points)
+        self.sample_x = RingBuffer(sample_points)
+
+    def restart_reconstruction(self):
+        self.reconstructor = StreamingReconstructor(self.fs_input.value())
+        if self.source is not None:
+            self.allocate_buffers()
+
+    def toggle(self):
+        if self.source is None:
+            self.start()
+        else:
+            self.stop()
+
+    def start(self):
+        try:
+            if self.source_combo.currentText() == "UDP":
+                self.source = SocketSource(self.port_input.value(), self.rate_input.value())
+            else:
+                file_path, _ = QFileDialog.getOpenFileName(
+                    self, "Open Signal File", "", "Text Files (*.txt *.csv)"
+                )
+                if not file_path:
+                    return
+                self.source = CsvReplaySource(file_path)
+        except Exception as e:
+            print(f"Failed to open stream: {e}")
+            self.source = None
+            return
+        self.stats = StreamStats()
+        self.restart_reconstruction()
+        self.start_button.setText("Stop")
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+        self.start_button.setText("Start")
+        self.status_label.setText("Stopped")
+
+    def poll(self):
+        t, values = self.source.read()
+        if not len(t):
+            return
+        output = self.reconstructor.process(t, values)
+        self.stats.record(len(t), output.latency)
+
+        self.input_t.extend(t)
+        self.input_x.extend(values)
+        self.sample_t.extend(output.sample_times)
+        self.sample_x.extend(output.samples)
+        self.output_t.extend(output.t)
+        self.output_x.extend(output.reconstructed)
+        self.difference.extend(output.original - output.reconstructed)
+        self.redraw()
+
+    def redraw(self):
+        self.input_curve.set_data(self.input_t.latest(), self.input_x.latest())
+        self.sample_markers.set_data(self.sample_t.latest(), self.sample_x.latest())
+        if len(self.output_t):
+            self.reconstruct_curve.set_data(self.output_t.latest(), self.output_x.latest())
+            self.difference_curve.set_data(self.output_t.latest(), self.difference.latest())
+
+        latency = self.stats.latency
+        latency_text = "-" if latency is None else f"{latency * 1e3:.0f} ms"
+        self.status_label.setText(
+            f"Throughput: {self.stats.throughput:,.0f} samples/s, "
+            f"latency: {latency_text}, "
+            f"reconstruction delay: {self.reconstructor.delay * 1e3:.0f} ms"
+        )
+
+    def closeEvent(self, event):
+        self.stop()
+        super().closeEvent(event)
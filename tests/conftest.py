@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+@pytest.fixture(scope="session")
+def app():
+    QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def process_until(app, condition, timeout=10):
+    end = time.time() + timeout
+    while time.time() < end:
+        app.processEvents()
+        if condition():
+            app.processEvents()
+            return
+        time.sleep(0.005)
+    raise AssertionError("timed out waiting for the GUI")
+
+
+@pytest.fixture
+def window(app, monkeypatch):
+    monkeypatch.chdir(REPO_ROOT)
+    import main
+
+    window = main.SignalMixerApp()
+    window.show()
+    process_until(app, lambda: window.result_list.count() >= 3)
+    settle(app, window)
+    yield window
+    window.close()
+
+
+def settle(app, window):
+    process_until(app, window.reconstruction_scheduler.is_idle)
@@ -0,0 +1,16 @@
+import numpy as np
+
+from dsp.cache import ReconstructionCache
+
+
+def test_a_shared_array_is_counted_once():
+    frequencies = np.zeros(1000)
+    cache = ReconstructionCache(max_bytes=3 * frequencies.nbytes)
+    for key in range(2):
+        cache.put(("signal", None, key), (np.ones(1000), frequencies))
+    assert cache.current_bytes == 3 * frequencies.nbytes
+    assert len(cache) == 2
+
+    cache.invalidate("signal")
+    assert cache.current_bytes == 0
+    assert not cache.arrays
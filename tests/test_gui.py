@@ -0,0 +1,70 @@
+import numpy as np
+
+from conftest import settle
+
+
+def upload(window, monkeypatch, path):
+    from PyQt6.QtWidgets import QFileDialog
+
+    monkeypatch.setattr(
+        QFileDialog, "getOpenFileName", lambda *args, **kwargs: (str(path), "")
+    )
+    window.upload_signal()
+
+
+def test_uploaded_signal_is_reconstructed_from_its_own_samples(app, window, monkeypatch, tmp_path):
+    t = np.arange(5645) / 1000
+    path = tmp_path / "upload.csv"
+    np.savetxt(path, np.column_stack((t, np.sin(2 * np.pi * 7 * t))), delimiter=",")
+
+    # With an absolute sampling frequency the cache key does not depend on
+    # the displayed signal's bandwidth.
+    window.radio2.setChecked(True)
+    window.sampling_slider_actual.setValue(40)
+    settle(app, window)
+
+    upload(window, monkeypatch, path)
+    assert len(window.current_signal_data) == 5645
+    # The first reconstruction of the upload has nothing cached under its ID;
+    # it must sample the upload, not the previously displayed signal.
+    results = []
+    window.reconstruction_scheduler.result_ready.connect(results.append)
+    misses = window.reconstruction_cache.stats()["misses"]
+    window.sampling_slider_actual.setValue(41)
+    window.sampling_slider_actual.setValue(40)
+    settle(app, window)
+    assert window.reconstruction_cache.stats()["misses"] > misses
+    assert results and len(results[-1].reconstructed) == 5645
+    # Selecting the upload afterwards reuses that reconstruction.
+    window.result_list.setCurrentRow(window.result_list.count() - 1)
+    settle(app, window)
+    entry = window.registry[window.current_displayed_signal]
+    assert entry.recording is not None
+    assert len(window.current_signal_data) == len(entry.data) == 5645
+    assert len(results[-1].reconstructed) == len(entry.data)
+
+
+def test_polyphase_sampling_runs_on_the_worker_thread(app, window, monkeypatch):
+    import threading
+
+    import dsp
+
+    sample_polyphase = dsp.sample_polyphase
+    threads = []
+
+    def recording_sampler(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return sample_polyphase(*args, **kwargs)
+
+    # Low rates need long filters, whose design must not hold up the GUI.
+    monkeypatch.setattr(dsp, "sample_polyphase", recording_sampler)
+    results = []
+    window.reconstruction_scheduler.result_ready.connect(results.append)
+    window.radio2.setChecked(True)
+    window.sampling_slider_actual.setValue(1)
+    window.sampling_mode_combo.setCurrentText("Polyphase")
+    settle(app, window)
+
+    assert threads and threading.main_thread() not in threads
+    assert results[-1].sampling_times is not None
+    assert len(window.sample_markers.scatter.data) == len(results[-1].sampling_times)
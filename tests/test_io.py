@@ -0,0 +1,12 @@
+import numpy as np
+import pytest
+
+from dsp.io import Recording
+
+
+@pytest.mark.parametrize("times", [[0.0, 0.0, 0.0], [0.0, -1.0, -2.0], [0.0, np.nan, np.nan]])
+def test_a_recording_needs_an_increasing_time_column(tmp_path, times):
+    path = tmp_path / "flat.csv"
+    np.savetxt(path, np.column_stack((times, np.ones(3))), delimiter=",")
+    with pytest.raises(ValueError):
+        Recording(str(path))
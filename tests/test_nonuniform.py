@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from dsp.nonuniform import least_squares_reconstruction
+from dsp.sampling import sample_jittered, sample_uniform
+
+
+@pytest.mark.parametrize(
+    "sampler",
+    [sample_uniform, lambda *args: sample_jittered(*args, jitter=0.1, rng=1)],
+    ids=["uniform", "jittered"],
+)
+@pytest.mark.parametrize("sampling_frequency", [10, 11, 15])
+def test_least_squares_keeps_a_tone_down_to_twice_its_frequency(sampler, sampling_frequency):
+    # At exactly twice the tone's frequency only its cosine is visible to
+    # uniform samples, so the tone is a cosine.
+    t = np.linspace(0, 10, 10000)
+    signal = np.cos(2 * np.pi * 5 * t)
+    amplitudes, sampling_times = sampler(t, signal, sampling_frequency, 10)
+
+    reconstructed = least_squares_reconstruction(amplitudes, sampling_times, t)
+    assert np.mean(np.abs(reconstructed - signal)) < 1e-3
@@ -0,0 +1,38 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from dsp.parallel import ParallelReconstructor
+from dsp.sampling import sample_uniform
+from dsp.spectrum import occupied_bandwidth
+
+
+@pytest.fixture(scope="module")
+def reconstructor():
+    reconstructor = ParallelReconstructor(workers=1)
+    yield reconstructor
+    reconstructor.shutdown(wait=True)
+
+
+def test_workers_sample_at_a_factor_of_the_bandwidth(reconstructor):
+    t = np.linspace(0, 2, 4001)
+    signal = np.sin(2 * np.pi * 5 * t)
+    known = reconstructor.submit(
+        t, signal, "Whittaker-Shannon", sample_uniform, 2, factor=4, f_max=5
+    ).result(timeout=60)
+    estimated = reconstructor.submit(
+        t, signal, "Whittaker-Shannon", partial(sample_uniform), 2, factor=4
+    ).result(timeout=60)
+
+    assert known.sampling_frequency == 20
+    assert len(known.sampling_times) == len(known.sampling_amplitudes) == 40
+    assert known.error < 0.05
+    assert estimated.sampling_frequency == pytest.approx(4 * occupied_bandwidth(signal, 2000))
+
+
+def test_a_signal_without_bandwidth_fails_its_job(reconstructor):
+    t = np.linspace(0, 1, 1000)
+    future = reconstructor.submit(t, np.zeros(1000), "Linear", sample_uniform, 1, factor=2)
+    with pytest.raises(ValueError):
+        future.result(timeout=60)
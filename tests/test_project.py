@@ -0,0 +1,63 @@
+import zipfile
+
+import numpy as np
+import pytest
+
+from dsp.io import Recording
+from dsp.project import load_project, save_project
+from dsp.registry import SignalRegistry
+
+
+@pytest.fixture
+def recording(tmp_path):
+    t = np.arange(2000) / 1000
+    path = tmp_path / "recording.csv"
+    np.savetxt(path, np.column_stack((t, np.sin(2 * np.pi * 7 * t))), delimiter=",")
+    return Recording(str(path))
+
+
+def reopen(tmp_path, registry):
+    path = tmp_path / "session.npz"
+    save_project(path, registry)
+    reopened = SignalRegistry()
+    ids, _ = load_project(path, reopened)
+    return [reopened[signal_id] for signal_id in ids]
+
+
+@pytest.mark.parametrize("window", [None, (0.5, 1.0)])
+def test_recordings_keep_their_source_and_window(tmp_path, recording, window, capsys):
+    registry = SignalRegistry()
+    signal_id = registry.add("upload", np.zeros(100), 1.0, recording.fs, recording=recording)
+    registry[signal_id].window = window
+
+    [entry] = reopen(tmp_path, registry)
+    assert entry.recording is not None
+    assert entry.recording.path == recording.path
+    assert entry.window == window
+    assert "unavailable" not in capsys.readouterr().err
+
+
+def test_a_missing_recording_keeps_the_saved_window(tmp_path, recording):
+    registry = SignalRegistry()
+    signal_id = registry.add("upload", np.arange(100.0), 1.0, recording.fs, recording=recording)
+    registry[signal_id].window = (0.0, 1.0)
+    path = tmp_path / "session.npz"
+    save_project(path, registry)
+    (tmp_path / "recording.csv").unlink()
+
+    reopened = SignalRegistry()
+    [signal_id], _ = load_project(path, reopened)
+    entry = reopened[signal_id]
+    assert entry.recording is None
+    np.testing.assert_array_equal(entry.data, np.arange(100.0))
+
+
+def test_noisy_variants_are_not_saved(tmp_path):
+    registry = SignalRegistry()
+    signal_id = registry.add("mixed", np.ones(100), 1.0)
+    registry[signal_id].noisy = np.zeros(100)
+
+    [entry] = reopen(tmp_path, registry)
+    assert entry.noisy is None
+    with zipfile.ZipFile(tmp_path / "session.npz") as archive:
+        assert not [name for name in archive.namelist() if "noisy" in name]
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from dsp.reconstruction import whittaker_shannon
+
+
+def truncated_sum(amplitude, sampling_time, current_time, taps):
+    # The boxcar-windowed sinc summed over every sample, keeping the samples
+    # within taps / 2 periods of each output point.
+    T = sampling_time[1] - sampling_time[0]
+    distance = (current_time[:, np.newaxis] - sampling_time[np.newaxis, :]) / T
+    kernel = np.sinc(distance)
+    kernel[np.abs(distance) >= taps / 2] = 0
+    return kernel @ amplitude
+
+
+@pytest.mark.parametrize("taps", [1, 3, 5, 31, 2, 8])
+def test_taps_use_the_samples_centred_on_each_point(taps):
+    sampling_time = np.arange(200) / 50
+    amplitude = np.sin(2 * np.pi * 3 * sampling_time)
+    # Off the half-sample points, where rounding decides whether the edge
+    # sample is inside taps / 2.
+    current_time = np.sort(np.random.default_rng(0).uniform(0.5, 3.5, 997))
+
+    reconstructed = whittaker_shannon(
+        amplitude, sampling_time, current_time, taps=taps, window="boxcar"
+    )
+    expected = truncated_sum(amplitude, sampling_time, current_time, taps)
+    np.testing.assert_allclose(reconstructed, expected, atol=1e-12)
+
+
+def test_odd_taps_approach_the_full_sum():
+    sampling_time = np.arange(400) / 50
+    amplitude = np.sin(2 * np.pi * 3 * sampling_time)
+    current_time = np.linspace(2, 6, 1001)
+
+    full = whittaker_shannon(amplitude, sampling_time, current_time)
+    for taps in (31, 63):
+        reconstructed = whittaker_shannon(amplitude, sampling_time, current_time, taps=taps)
+        assert np.max(np.abs(reconstructed - full)) < 1e-2
+
+
+@pytest.mark.parametrize("n_samples", [40, 401])
+def test_the_full_sum_matches_the_sinc_matrix(n_samples):
+    # 401 samples take the FFT far-field path, 40 the direct sum.
+    sampling_time = 0.3 + np.arange(n_samples) / 50
+    amplitude = np.random.default_rng(1).standard_normal(n_samples)
+    current_time = np.concatenate(
+        (np.linspace(0, sampling_time[-1] + 0.5, 2001), sampling_time[::7])
+    )
+
+    reconstructed = whittaker_shannon(amplitude, sampling_time, current_time)
+    distance = (current_time[:, np.newaxis] - sampling_time[np.newaxis, :]) * 50
+    np.testing.assert_allclose(reconstructed, np.sinc(distance) @ amplitude, atol=1e-9)
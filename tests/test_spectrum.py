@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from dsp.spectrum import SpectrumEngine, occupied_bandwidth
+
+
+def flat_band(fs, n, edge, seed=0):
+    # Equal power in every FFT bin from just above DC up to `edge` Hz.
+    frequencies = np.fft.rfftfreq(n, 1 / fs)
+    band = (frequencies > 0) & (frequencies <= edge)
+    spectrum = np.zeros(len(frequencies), dtype=complex)
+    spectrum[band] = np.exp(2j * np.pi * np.random.default_rng(seed).random(band.sum()))
+    return np.fft.irfft(spectrum, n)
+
+
+@pytest.mark.parametrize("frequency", [10, 100, 300])
+def test_half_the_power_of_a_tone_lies_below_its_frequency(frequency):
+    # 1 Hz bins: the tone sits on a bin centre and the Hann window spreads it
+    # symmetrically into the neighbouring bins.
+    fs = 1024
+    t = np.arange(fs * 16) / fs
+    signal = np.sin(2 * np.pi * frequency * t)
+    assert occupied_bandwidth(signal, fs, fraction=0.5) == pytest.approx(frequency)
+
+
+@pytest.mark.parametrize("fraction", [0.25, 0.5, 0.75])
+def test_bandwidth_of_a_flat_band(fraction):
+    # Bin k holds the power between k - 0.5 and k + 0.5 Hz, so `fraction` of
+    # a flat band from bin 1 to bin 200 lies below fraction * 200 + 0.5 Hz,
+    # up to leakage past the band edge.
+    fs = 1024
+    signal = flat_band(fs, fs * 64, edge=200)
+    expected = fraction * 200 + 0.5
+    assert occupied_bandwidth(signal, fs, fraction=fraction) == pytest.approx(expected, abs=0.5)
+
+
+def test_keyed_spectra_are_computed_once():
+    engine = SpectrumEngine()
+    t = np.arange(1024) / 1024
+    signal = np.sin(2 * np.pi * 50 * t)
+    first = engine.spectrum(signal, t[1], key="tone")
+    assert engine.spectrum(signal, t[1], key="tone") is first
+    engine.forget("tone")
+    assert engine.spectrum(signal, t[1], key="tone") is not first
+
+
+def test_keyed_bandwidths_share_one_power_spectrum(monkeypatch):
+    import dsp.spectrum
+
+    fs = 1024
+    signal = flat_band(fs, fs * 16, edge=200)
+    expected = {fraction: occupied_bandwidth(signal, fs, fraction) for fraction in (0.5, 0.99)}
+    engine = SpectrumEngine(max_cached=2)
+    passes = []
+    welch_power = dsp.spectrum.welch_power
+    monkeypatch.setattr(
+        dsp.spectrum, "welch_power", lambda *args: passes.append(args) or welch_power(*args)
+    )
+    for fraction, bandwidth in expected.items():
+        assert engine.occupied_bandwidth(signal, fs, fraction, key="band") == bandwidth
+    assert len(passes) == 1
+
+    for key in range(5):
+        engine.occupied_bandwidth(signal, fs, key=key)
+    assert len(engine.cached) == 2
@@ -0,0 +1,17 @@
+import numpy as np
+
+from dsp.sweep import run_sweep
+
+
+def test_bad_files_are_reported_and_skipped(tmp_path, capfd):
+    t = np.arange(500) / 100
+    np.savetxt(tmp_path / "good.csv", np.column_stack((t, np.sin(2 * np.pi * 3 * t))), delimiter=",")
+    np.savetxt(tmp_path / "one_row.csv", [[0.0, 1.0]], delimiter=",")
+    np.savetxt(tmp_path / "constant.csv", [[1.0, 1.0], [1.0, 2.0], [1.0, 3.0]], delimiter=",")
+    paths = sorted(tmp_path.iterdir())
+
+    rows = run_sweep(paths, [20], ["Linear"], workers=2, factors=[4])
+    assert {row[0] for row in rows} == {"good.csv"}
+    assert len(rows) == 2
+    err = capfd.readouterr().err
+    assert "one_row.csv" in err and "constant.csv" in err
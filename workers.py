@@ -0,0 +1,152 @@
+from PyQt6.QtCore import QObject, QRunnable, QThread, QThreadPool, QTimer, pyqtSignal
+
+from dsp.pipeline import sample_and_reconstruct
+
+
+class ReconstructionWorker(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+    def run(self, job_id, job):
+        try:
+            result = sample_and_reconstruct(**job)
+        except Exception as e:
+            self.failed.emit(job_id, str(e))
+            return
+        self.finished.emit(job_id, result)
+
+
+class ReconstructionScheduler(QObject):
+    '''
+    Runs reconstruction jobs on a worker thread, coalescing bursts of
+    requests so only the most recent one is computed.
+
+    Requests go through a short debounce timer; while the worker is busy,
+    newer jobs replace the pending one instead of queueing behind it, and
+    results of jobs superseded while they ran are dropped. Jobs whose key is
+    already in the cache are answered without touching the worker.
+    '''
+
+    result_ready = pyqtSignal(object)
+    error = pyqtSignal(str)
+    _start = pyqtSignal(int, object)
+
+    def __init__(self, job_factory, cache=None, debounce_ms=16, parent=None):
+        '''
+        Args:
+            job_factory (callable): Called on the GUI thread when the debounce
+                timer fires; returns (cache_key, kwargs) where kwargs are the
+                keyword arguments for dsp.pipeline.sample_and_reconstruct, or
+                None to skip.
+            cache (dsp.cache.ReconstructionCache): Results cache, optional.
+            debounce_ms (int): Quiet period before a request is dispatched.
+        '''
+        super().__init__(parent)
+        self.job_factory = job_factory
+        self.cache = cache
+        self.job_keys = {}
+        self.latest_job_id = 0
+        self.running_job_id = None
+        self.pending = None
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self.dispatch)
+
+        self.thread = QThread()
+        self.worker = ReconstructionWorker()
+        self.worker.moveToThread(self.thread)
+        self._start.connect(self.worker.run)
+        self.worker.finished.connect(self.handle_finished)
+        self.worker.failed.connect(self.handle_failed)
+        self.thread.start()
+
+    def request(self):
+        self.debounce_timer.start()
+
+    def dispatch(self):
+        request = self.job_factory()
+        if request is None:
+            return
+        key, job = request
+        self.latest_job_id += 1
+        if self.cache is not None and key is not None:
+            result = self.cache.get(key)
+            if result is not None:
+                self.pending = None
+                self.result_ready.emit(result)
+                return
+            self.job_keys[self.latest_job_id] = key
+        self.pending = (self.latest_job_id, job)
+        if self.running_job_id is None:
+            self.start_pending()
+
+    def start_pending(self):
+        job_id, job = self.pending
+        self.pending = None
+        for stale_id in [i for i in self.job_keys if i < job_id]:
+            del self.job_keys[stale_id]
+        self.running_job_id = job_id
+        self._start.emit(job_id, job)
+
+    def handle_finished(self, job_id, result):
+        self.running_job_id = None
+        key = self.job_keys.pop(job_id, None)
+        if key is not None:
+            self.cache.put(key, result)
+        if job_id == self.latest_job_id:
+            self.result_ready.emit(result)
+        if self.pending is not None:
+            self.start_pending()
+
+    def handle_failed(self, job_id, message):
+        self.running_job_id = None
+        self.job_keys.pop(job_id, None)
+        if job_id == self.latest_job_id:
+            self.error.emit(message)
+        if self.pending is not None:
+            self.start_pending()
+
+    def is_idle(self):
+        return (
+            self.running_job_id is None
+            and self.pending is None
+            and not self.debounce_timer.isActive()
+        )
+
+    def shutdown(self):
+        self.debounce_timer.stop()
+        self.pending = None
+        self.thread.quit()
+        self.thread.wait()
+
+
+class TaskSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class BackgroundTask(QRunnable):
+    '''
+    Runs fn(*args, **kwargs) on the global thread pool and reports the
+    result through `signals`, which are delivered on the GUI thread.
+    '''
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)